@@ -10,4 +10,8 @@ basicConfig(
 
 
 def handler(event: Any, context: Any) -> None:
-    compliance_alerter.main(event)
+    compliance_alerter.main(event, remaining_millis=context.get_remaining_time_in_millis)
+
+
+def replay_handler(event: Any, context: Any) -> None:
+    compliance_alerter.replay_outbox(remaining_millis=context.get_remaining_time_in_millis)
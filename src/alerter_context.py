@@ -0,0 +1,23 @@
+from logging import getLogger
+from typing import Callable, Optional
+
+from src.config.config import Config
+
+
+class AlerterContext:
+    def __init__(self, config_builder: Callable[[], Config]) -> None:
+        self._logger = getLogger(self.__class__.__name__)
+        self._config_builder = config_builder
+        self._config: Optional[Config] = None
+
+    def get_config(self) -> Config:
+        # the lazy aws clients renew their own credentials, so the config and its caches are kept for good
+        if self._config is None:
+            self._logger.info("building config and aws clients")
+            self._config = self._config_builder()
+        else:
+            self._logger.debug("reusing config and aws clients")
+        return self._config
+
+    def reset(self) -> None:
+        self._config = None
@@ -1,17 +1,42 @@
-from typing import Any, Dict, Tuple
+from typing import Any, Dict, List, Tuple
 
 from src.clients.aws_s3_client import AwsS3Client
+from src.clients.decompression import detect_encoding
 from src.data.audit import Audit
 from src.data.exceptions import UnsupportedEventException
 
 
 class AuditFetcher:
+    def __init__(self, stream: bool = False) -> None:
+        self._stream = stream
+
     def fetch_audit(self, s3: AwsS3Client, event: Dict[str, Any]) -> Audit:
-        bucket, key = self._read_event(event)
-        return Audit(type=key, report=s3.read_object(bucket, key))
+        return self._fetch(s3, *self._read_event(event))
+
+    def fetch_record_audit(self, s3: AwsS3Client, record: Dict[str, Any]) -> Audit:
+        return self._fetch(s3, *self._read_record(record))
+
+    @staticmethod
+    def read_records(event: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return list(event.get("Records") or [{}])
+
+    @staticmethod
+    def record_key(record: Dict[str, Any]) -> str:
+        return str(record.get("s3", {}).get("object", {}).get("key", "unknown"))
+
+    def _fetch(self, s3: AwsS3Client, bucket: str, key: str) -> Audit:
+        stream = self._stream or detect_encoding(key) is not None
+        report = s3.stream_object(bucket, key) if stream else s3.read_object(bucket, key)
+        return Audit(type=key, report=report)
 
     @staticmethod
     def _read_event(event: Dict[str, Any]) -> Tuple[str, str]:
         if not event.get("Records", [{}])[0].get("eventVersion", "").startswith("2."):
             raise UnsupportedEventException(f"expected event version >=2 and <3, got {event}")
-        return event["Records"][0]["s3"]["bucket"]["name"], event["Records"][0]["s3"]["object"]["key"]
+        return AuditFetcher._read_record(event["Records"][0])
+
+    @staticmethod
+    def _read_record(record: Dict[str, Any]) -> Tuple[str, str]:
+        if not record.get("eventVersion", "").startswith("2."):
+            raise UnsupportedEventException(f"expected event version >=2 and <3, got {record}")
+        return record["s3"]["bucket"]["name"], record["s3"]["object"]["key"]
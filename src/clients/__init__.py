@@ -1,4 +1,4 @@
-from typing import Callable
+from typing import Callable, Iterator
 
 from botocore.exceptions import BotoCoreError, ClientError
 
@@ -11,3 +11,10 @@ def boto_try(func: Callable[[], T], except_msg: str) -> T:
         return func()
     except (BotoCoreError, ClientError, TypeError, ValueError) as err:
         raise AwsClientException(f"{except_msg}: {err}") from None
+
+
+def boto_iter(func: Callable[[], Iterator[T]], except_msg: str) -> Iterator[T]:
+    try:
+        yield from func()
+    except (BotoCoreError, ClientError, TypeError, ValueError) as err:
+        raise AwsClientException(f"{except_msg}: {err}") from None
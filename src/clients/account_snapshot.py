@@ -0,0 +1,106 @@
+import json
+import os
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime
+from logging import getLogger
+from tempfile import NamedTemporaryFile
+from typing import Any, Dict, Optional
+
+from src.clients.aws_s3_client import AwsS3Client
+from src.data.account import Account
+from src.data.exceptions import ComplianceAlertingException
+
+SNAPSHOT_VERSION = 1
+
+
+@dataclass(frozen=True)
+class AccountSnapshotEntry:
+    account: Account
+    fetched_at: datetime
+
+
+class AccountSnapshotStore(ABC):
+    def __init__(self, location: str):
+        self._logger = getLogger(self.__class__.__name__)
+        self.location = location
+
+    def load(self) -> Dict[str, AccountSnapshotEntry]:
+        try:
+            snapshot = self._read()
+            if snapshot is None:
+                return {}
+            if snapshot.get("version") != SNAPSHOT_VERSION:
+                self._logger.info(f"ignoring account snapshot '{self.location}' with version {snapshot.get('version')}")
+                return {}
+            return {
+                account_id: AccountSnapshotEntry(
+                    account=Account(identifier=account_id, name=entry["name"], slack_handle=entry["slack_handle"]),
+                    fetched_at=datetime.fromisoformat(entry["fetched_at"]),
+                )
+                for account_id, entry in snapshot["accounts"].items()
+            }
+        except (ComplianceAlertingException, OSError, ValueError, KeyError, TypeError, AttributeError) as err:
+            self._logger.warning(f"unable to load account snapshot '{self.location}': {err}")
+            return {}
+
+    def save(self, entries: Dict[str, AccountSnapshotEntry]) -> None:
+        snapshot = {
+            "version": SNAPSHOT_VERSION,
+            "accounts": {
+                account_id: {
+                    "name": entry.account.name,
+                    "slack_handle": entry.account.slack_handle,
+                    "fetched_at": entry.fetched_at.isoformat(),
+                }
+                for account_id, entry in sorted(entries.items())
+            },
+        }
+        try:
+            self._write(snapshot)
+        except (ComplianceAlertingException, OSError) as err:
+            self._logger.warning(f"unable to save account snapshot '{self.location}': {err}")
+
+    @abstractmethod
+    def _read(self) -> Optional[Dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    def _write(self, snapshot: Dict[str, Any]) -> None:
+        pass
+
+
+class FileAccountSnapshotStore(AccountSnapshotStore):
+    def __init__(self, path: str):
+        super().__init__(path)
+        self._path = path
+
+    def _read(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path, "r") as snapshot_file:
+                return dict(json.load(snapshot_file))
+        except FileNotFoundError:
+            return None
+
+    def _write(self, snapshot: Dict[str, Any]) -> None:
+        directory = os.path.dirname(self._path) or "."
+        with NamedTemporaryFile("w", dir=directory, delete=False, suffix=".tmp") as snapshot_file:
+            json.dump(snapshot, snapshot_file)
+        # readers never see a partially written snapshot
+        os.replace(snapshot_file.name, self._path)
+
+
+class S3AccountSnapshotStore(AccountSnapshotStore):
+    def __init__(self, s3: AwsS3Client, bucket: str, key: str):
+        super().__init__(f"s3://{bucket}/{key}")
+        self._s3 = s3
+        self._bucket = bucket
+        self._key = key
+
+    def _read(self) -> Optional[Dict[str, Any]]:
+        if self._key not in self._s3.list_objects(self._bucket, self._key):
+            return None
+        return dict(self._s3.read_json_object(self._bucket, self._key))
+
+    def _write(self, snapshot: Dict[str, Any]) -> None:
+        self._s3.write_json_object(self._bucket, self._key, snapshot)
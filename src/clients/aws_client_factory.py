@@ -4,32 +4,84 @@ from botocore.client import BaseClient
 from botocore.exceptions import BotoCoreError, ClientError
 
 from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from threading import Lock
+from time import perf_counter
+from typing import Callable, Dict, List, Optional, Tuple
 
-from src.clients.aws_org_client import AwsOrgClient
+from src.clients.account_snapshot import AccountSnapshotStore
+from src.clients.aws_org_client import ACCOUNT_DIRECTORY_TTL, AwsOrgClient
 from src.clients.aws_s3_client import AwsS3Client
-from src.clients.aws_ssm_client import AwsSsmClient
+from src.clients.aws_ssm_client import PARAMETER_CACHE_TTL, AwsSsmClient
+from src.clients.lazy_client import LazyClient
 from src.data.exceptions import ClientFactoryException
 
+SESSION_DURATION = timedelta(seconds=900)
+CREDENTIALS_REFRESH_MARGIN = timedelta(minutes=5)
+NEVER_EXPIRES = datetime.max.replace(tzinfo=timezone.utc)
+
 
 @dataclass(frozen=True)
 class AwsCredentials:
     accessKeyId: str
     secretAccessKey: str
     sessionToken: str
+    expiration: datetime = NEVER_EXPIRES
 
 
 class AwsClientFactory:
+    def __init__(self, lazy: bool = False, clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc)) -> None:
+        self.sts_calls = 0
+        self.startup_costs: List[Tuple[str, float]] = []
+        self._lazy = lazy
+        self._clock = clock
+        self._credentials: Dict[Tuple[str, str], AwsCredentials] = {}
+        self._locks: Dict[Tuple[str, str], Lock] = {}
+        self._locks_lock = Lock()
+
     def get_s3_client(self, account: str, role: str) -> AwsS3Client:
-        return AwsS3Client(self._get_client("s3", account, role))
+        return AwsS3Client(self._get_client_or_proxy("s3", account, role))
+
+    def get_ssm_client(self, account: str, role: str, parameter_ttl: timedelta = PARAMETER_CACHE_TTL) -> AwsSsmClient:
+        return AwsSsmClient(self._get_client_or_proxy("ssm", account, role), parameter_ttl=parameter_ttl)
+
+    def get_org_client(
+        self,
+        account: str,
+        role: str,
+        directory_ttl: timedelta = ACCOUNT_DIRECTORY_TTL,
+        snapshot_store: Optional[AccountSnapshotStore] = None,
+    ) -> AwsOrgClient:
+        return AwsOrgClient(
+            self._get_client_or_proxy("organizations", account, role),
+            directory_ttl=directory_ttl,
+            snapshot_store=snapshot_store,
+        )
 
-    def get_ssm_client(self, account: str, role: str) -> AwsSsmClient:
-        return AwsSsmClient(self._get_client("ssm", account, role))
+    def _get_client_or_proxy(self, service_name: str, account: str, role: str) -> BaseClient:
+        if self._lazy:
+            built_with: List[Optional[AwsCredentials]] = [None]
 
-    def get_org_client(self, account: str, role: str) -> AwsOrgClient:
-        return AwsOrgClient(self._get_client("organizations", account, role))
+            def build() -> BaseClient:
+                client = self._get_timed_client(service_name, account, role)
+                built_with[0] = self._credentials.get((account, role))
+                return client
+
+            # rebuilt with fresh credentials when due, so that long-lived clients and their caches can be kept
+            return LazyClient(f"{service_name}:{role}", build, is_stale=lambda: self._is_expiring(built_with[0]))
+        return self._get_timed_client(service_name, account, role)
+
+    def _is_expiring(self, credentials: Optional[AwsCredentials]) -> bool:
+        return credentials is not None and credentials.expiration - CREDENTIALS_REFRESH_MARGIN <= self._clock()
+
+    def _get_timed_client(self, service_name: str, account: str, role: str) -> BaseClient:
+        start = perf_counter()
+        client = self._get_client(service_name, account, role)
+        self.startup_costs.append((f"{service_name}:{role}", perf_counter() - start))
+        return client
 
     def _get_client(self, service_name: str, account: str, role: str) -> BaseClient:
-        assumed_role = self._assume_role(account, role)
+        assumed_role = self._get_credentials(account, role)
         return boto3.client(
             service_name=service_name,
             aws_access_key_id=assumed_role.accessKeyId,
@@ -37,11 +89,22 @@ class AwsClientFactory:
             aws_session_token=assumed_role.sessionToken,
         )
 
-    @staticmethod
-    def _assume_role(account: str, role: str) -> AwsCredentials:
+    def _get_credentials(self, account: str, role: str) -> AwsCredentials:
+        key = (account, role)
+        with self._locks_lock:
+            lock = self._locks.setdefault(key, Lock())
+        # callers asking for the same role wait for a single sts call rather than making their own
+        with lock:
+            credentials = self._credentials.get(key)
+            if credentials is None or self._is_expiring(credentials):
+                self.sts_calls += 1
+                credentials = self._credentials[key] = self._assume_role(account, role)
+            return credentials
+
+    def _assume_role(self, account: str, role: str) -> AwsCredentials:
         try:
             credentials_dict = boto3.client(service_name="sts").assume_role(
-                DurationSeconds=900,
+                DurationSeconds=int(SESSION_DURATION.total_seconds()),
                 RoleArn=f"arn:aws:iam::{account}:role/{role}",
                 RoleSessionName=f"{role}",
             )
@@ -49,6 +112,7 @@ class AwsClientFactory:
                 accessKeyId=credentials_dict["Credentials"]["AccessKeyId"],
                 secretAccessKey=credentials_dict["Credentials"]["SecretAccessKey"],
                 sessionToken=credentials_dict["Credentials"]["SessionToken"],
+                expiration=credentials_dict["Credentials"].get("Expiration") or self._clock() + SESSION_DURATION,
             )
         except (BotoCoreError, ClientError) as error:
             raise ClientFactoryException(f"unable to assume role '{role}' in account '{account}': {error}") from None
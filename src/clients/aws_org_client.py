@@ -1,4 +1,6 @@
-from typing import Dict, Optional
+from datetime import datetime, timedelta, timezone
+from threading import Lock
+from typing import Callable, Dict, Optional
 
 from botocore.client import BaseClient
 
@@ -6,24 +8,91 @@ from logging import getLogger
 
 from botocore.paginate import PageIterator
 
+from src.clients.account_snapshot import AccountSnapshotEntry, AccountSnapshotStore
 from src.data.account import Account
 
+ACCOUNT_DIRECTORY_TTL = timedelta(minutes=30)
+
 
 class AwsOrgClient:
-    def __init__(self, boto_org: BaseClient):
+    def __init__(
+        self,
+        boto_org: BaseClient,
+        directory_ttl: timedelta = ACCOUNT_DIRECTORY_TTL,
+        snapshot_store: Optional[AccountSnapshotStore] = None,
+        clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+    ):
         self._logger = getLogger(self.__class__.__name__)
         self._org = boto_org
+        self._directory_ttl = directory_ttl
+        self._snapshot_store = snapshot_store
+        self._clock = clock
+        self._lock = Lock()
+        # accounts fetched from the organization because they were missing from the cache or expired
+        self.account_fetches = 0
+        self._account_names: Dict[str, str] = {}
+        self._accounts: Dict[str, AccountSnapshotEntry] = {}
+        self._directory_loaded_at: Optional[datetime] = None
+        self._snapshot_loaded = False
+        self._snapshot_dirty = False
 
     def get_account(self, account_id: str) -> Account:
+        with self._lock:
+            self._load_snapshot()
+            cached = self._accounts.get(account_id)
+            if cached and not self._is_stale(cached.fetched_at):
+                return cached.account
+            self.account_fetches += 1
+            try:
+                entry = AccountSnapshotEntry(account=self._fetch_account(account_id), fetched_at=self._clock())
+            except Exception as e:
+                self._logger.error(e)
+                if cached:
+                    return cached.account
+                return Account(identifier=account_id, name="account not found", slack_handle="owning-team-not-found")
+            self._accounts[account_id] = entry
+            self._snapshot_dirty = True
+            return entry.account
+
+    def preload(self) -> None:
+        with self._lock:
+            self._load_directory()
+
+    def save_snapshot(self) -> None:
+        with self._lock:
+            if self._snapshot_store and self._snapshot_dirty:
+                self._snapshot_store.save(self._accounts)
+                self._snapshot_dirty = False
+
+    def _fetch_account(self, account_id: str) -> Account:
+        self._load_directory()
+        name = self._account_names.get(account_id) or self._describe_account_name(account_id)
+        slack_handle = self._get_slack_handle(account_id)
+        return Account(identifier=account_id, name=name, slack_handle=slack_handle or "owning-team-not-found")
+
+    def _describe_account_name(self, account_id: str) -> str:
+        return str(self._org.describe_account(AccountId=account_id)["Account"]["Name"])
+
+    def _load_snapshot(self) -> None:
+        if self._snapshot_store and not self._snapshot_loaded:
+            self._snapshot_loaded = True
+            self._accounts.update(self._snapshot_store.load())
+
+    def _load_directory(self) -> None:
+        if self._directory_loaded_at is not None and not self._is_stale(self._directory_loaded_at):
+            return
+        # marked as loaded even on failure, falling back to per-account lookups until the directory expires
+        self._directory_loaded_at = self._clock()
+        self._account_names.clear()
         try:
-            name = self._org.describe_account(AccountId=account_id)["Account"]["Name"]
-            slack_handle = self._get_slack_handle(account_id)
+            for page in self._org.get_paginator("list_accounts").paginate():
+                for account in page["Accounts"]:
+                    self._account_names[account["Id"]] = account["Name"]
         except Exception as e:
-            name = "account not found"
-            slack_handle = None
-            self._logger.error(e)
+            self._logger.warning(f"unable to list organization accounts: {e}")
 
-        return Account(identifier=account_id, name=name, slack_handle=slack_handle or "owning-team-not-found")
+    def _is_stale(self, fetched_at: datetime) -> bool:
+        return self._clock() - fetched_at >= self._directory_ttl
 
     def _get_slack_handle(self, account_id: str) -> Optional[str]:
         paginator = self._org.get_paginator("list_tags_for_resource")
@@ -1,10 +1,14 @@
 from io import BytesIO
-from json import loads
-from typing import Any, Dict, List
+from json import dumps, loads
+from typing import Any, Dict, Iterator, List
 
 from botocore.client import BaseClient
 
-from src.clients import boto_try
+from src.clients import boto_iter, boto_try
+from src.clients.decompression import decompress_chunks, detect_encoding
+from src.clients.json_stream import iter_json_array
+
+STREAM_CHUNK_SIZE = 256 * 1024
 
 
 class AwsS3Client:
@@ -17,9 +21,37 @@ class AwsS3Client:
             f"failed to read object '{key}' from bucket '{bucket}'",
         )
 
+    def read_json_object(self, bucket: str, key: str) -> Any:
+        return boto_try(
+            lambda: loads(self.read_raw_object(bucket, key)),
+            f"failed to read object '{key}' from bucket '{bucket}'",
+        )
+
+    def write_json_object(self, bucket: str, key: str, obj: Any) -> None:
+        boto_try(
+            lambda: self._s3.put_object(Bucket=bucket, Key=key, Body=dumps(obj).encode("utf-8")),
+            f"failed to write object '{key}' to bucket '{bucket}'",
+        )
+
+    def delete_object(self, bucket: str, key: str) -> None:
+        boto_try(
+            lambda: self._s3.delete_object(Bucket=bucket, Key=key),
+            f"failed to delete object '{key}' from bucket '{bucket}'",
+        )
+
+    def stream_object(self, bucket: str, key: str) -> Iterator[Dict[str, Any]]:
+        except_msg = f"failed to read object '{key}' from bucket '{bucket}'"
+        return boto_iter(lambda: iter_json_array(self._stream_raw_object(bucket, key)), except_msg)
+
     def list_objects(self, bucket: str, prefix: str = "", max_keys: int = 1000) -> List[str]:
         return boto_try(
-            lambda: self._list_objects(bucket, prefix, max_keys),
+            lambda: [obj["Key"] for obj in self._list_objects(bucket, prefix, max_keys)],
+            f"failed to list objects{' with prefix ' + prefix if prefix else ''} from bucket '{bucket}'",
+        )
+
+    def list_object_etags(self, bucket: str, prefix: str = "", max_keys: int = 1000) -> Dict[str, str]:
+        return boto_try(
+            lambda: {obj["Key"]: obj["ETag"] for obj in self._list_objects(bucket, prefix, max_keys)},
             f"failed to list objects{' with prefix ' + prefix if prefix else ''} from bucket '{bucket}'",
         )
 
@@ -28,17 +60,26 @@ class AwsS3Client:
             self._s3.download_fileobj(Bucket=bucket, Key=key, Fileobj=buffer)
             return buffer.getvalue().decode("utf-8")
 
-    def _list_objects(self, bucket: str, prefix: str, max_keys: int) -> List[str]:
-        def get_keys(response: Dict[str, Any]) -> List[str]:
-            return [obj["Key"] for obj in response["Contents"]] if response.get("Contents") else []
+    def _stream_raw_object(self, bucket: str, key: str) -> Iterator[bytes]:
+        response = self._s3.get_object(Bucket=bucket, Key=key)
+        body = response["Body"]
+        try:
+            encoding = detect_encoding(key, response.get("ContentEncoding"))
+            yield from decompress_chunks(body.iter_chunks(chunk_size=STREAM_CHUNK_SIZE), encoding)
+        finally:
+            body.close()
+
+    def _list_objects(self, bucket: str, prefix: str, max_keys: int) -> List[Dict[str, Any]]:
+        def get_objects(response: Dict[str, Any]) -> List[Dict[str, Any]]:
+            return list(response["Contents"]) if response.get("Contents") else []
 
         resp = self._s3.list_objects_v2(Bucket=bucket, Prefix=prefix, MaxKeys=max_keys)
-        keys = get_keys(resp)
+        objects = get_objects(resp)
 
         while resp["IsTruncated"]:
             resp = self._s3.list_objects_v2(
                 Bucket=bucket, Prefix=prefix, MaxKeys=max_keys, ContinuationToken=resp["NextContinuationToken"]
             )
-            keys.extend(get_keys(resp))
+            objects.extend(get_objects(resp))
 
-        return keys
+        return objects
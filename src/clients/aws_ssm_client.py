@@ -1,14 +1,67 @@
+from datetime import datetime, timedelta, timezone
+from threading import Lock
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
 from botocore.client import BaseClient
 
 from src.clients import boto_try
+from src.data.exceptions import AwsClientException
+
+PARAMETER_CACHE_TTL = timedelta(minutes=5)
+GET_PARAMETERS_BATCH_SIZE = 10
 
 
 class AwsSsmClient:
-    def __init__(self, boto_ssm: BaseClient):
+    def __init__(
+        self,
+        boto_ssm: BaseClient,
+        parameter_ttl: timedelta = PARAMETER_CACHE_TTL,
+        clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+    ):
         self._ssm = boto_ssm
+        self._parameter_ttl = parameter_ttl
+        self._clock = clock
+        self._lock = Lock()
+        self._parameters: Dict[str, Tuple[str, datetime]] = {}
 
     def get_parameter(self, parameter_name: str) -> str:
-        return boto_try(
+        cached = self._get_cached(parameter_name)
+        if cached is not None:
+            return cached
+        value = boto_try(
             lambda: str(self._ssm.get_parameter(Name=parameter_name, WithDecryption=True)["Parameter"]["Value"]),
             f"failed to get parameter {parameter_name}",
         )
+        self._cache({parameter_name: value})
+        return value
+
+    def get_parameters(self, parameter_names: Iterable[str]) -> Dict[str, str]:
+        names = list(dict.fromkeys(parameter_names))
+        values = {name: value for name in names if (value := self._get_cached(name)) is not None}
+        missing = [name for name in names if name not in values]
+        for start in range(0, len(missing), GET_PARAMETERS_BATCH_SIZE):
+            fetched = self._get_parameters_batch(missing[start : start + GET_PARAMETERS_BATCH_SIZE])
+            self._cache(fetched)
+            values.update(fetched)
+        return {name: values[name] for name in names}
+
+    def _get_parameters_batch(self, parameter_names: List[str]) -> Dict[str, str]:
+        response = boto_try(
+            lambda: self._ssm.get_parameters(Names=parameter_names, WithDecryption=True),
+            f"failed to get parameters {parameter_names}",
+        )
+        if response.get("InvalidParameters"):
+            raise AwsClientException(f"failed to get parameters {response['InvalidParameters']}: ParameterNotFound")
+        return {str(parameter["Name"]): str(parameter["Value"]) for parameter in response["Parameters"]}
+
+    def _get_cached(self, parameter_name: str) -> Optional[str]:
+        with self._lock:
+            cached = self._parameters.get(parameter_name)
+        if cached is None or self._clock() - cached[1] >= self._parameter_ttl:
+            return None
+        return cached[0]
+
+    def _cache(self, values: Dict[str, str]) -> None:
+        now = self._clock()
+        with self._lock:
+            self._parameters.update({name: (value, now) for name, value in values.items()})
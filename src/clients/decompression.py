@@ -0,0 +1,49 @@
+import zlib
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+from zstandard import ZstdDecompressor, ZstdError
+
+GZIP = "gzip"
+ZSTD = "zstd"
+
+_KEY_SUFFIXES = {".gz": GZIP, ".gzip": GZIP, ".zst": ZSTD, ".zstd": ZSTD}
+_CONTENT_ENCODINGS = {"gzip": GZIP, "x-gzip": GZIP, "zstd": ZSTD}
+
+
+def detect_encoding(key: str, content_encoding: Optional[str] = None) -> Optional[str]:
+    if content_encoding and content_encoding.strip().lower() in _CONTENT_ENCODINGS:
+        return _CONTENT_ENCODINGS[content_encoding.strip().lower()]
+    return next((encoding for suffix, encoding in _KEY_SUFFIXES.items() if key.lower().endswith(suffix)), None)
+
+
+def decompress_chunks(chunks: Iterable[bytes], encoding: Optional[str]) -> Iterator[bytes]:
+    if encoding is None:
+        yield from chunks
+        return
+
+    new_decompressor = _decompressor_factory(encoding)
+    decompressor = new_decompressor()
+    pending = False
+    try:
+        for chunk in chunks:
+            while chunk:
+                pending = True
+                yield decompressor.decompress(chunk)
+                chunk = b""
+                if decompressor.eof:
+                    # concatenated members/frames are valid and each needs a fresh decompressor
+                    chunk, pending, decompressor = decompressor.unused_data, False, new_decompressor()
+    except (zlib.error, ZstdError) as err:
+        raise ValueError(f"unable to decompress {encoding} stream: {err}") from None
+    if pending:
+        raise ValueError(f"{encoding} stream is truncated")
+
+
+def _decompressor_factory(encoding: str) -> Callable[[], Any]:
+    factories: Dict[str, Callable[[], Any]] = {
+        GZIP: lambda: zlib.decompressobj(wbits=zlib.MAX_WBITS | 16),
+        ZSTD: lambda: ZstdDecompressor().decompressobj(),
+    }
+    if encoding not in factories:
+        raise ValueError(f"unsupported content encoding '{encoding}'")
+    return factories[encoding]
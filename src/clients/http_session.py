@@ -0,0 +1,27 @@
+from threading import Lock
+from typing import Dict, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+HTTP_POOL_SIZE = 10
+
+# kept at module level so that warm lambda invocations reuse open connections instead of redoing the tls handshake
+_sessions: Dict[Tuple[str, int], requests.Session] = {}
+_lock = Lock()
+
+
+def get_session(name: str, pool_size: int = HTTP_POOL_SIZE) -> requests.Session:
+    with _lock:
+        session = _sessions.get((name, pool_size))
+        if session is None:
+            session = _sessions[(name, pool_size)] = _build_session(pool_size)
+        return session
+
+
+def _build_session(pool_size: int) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
@@ -0,0 +1,86 @@
+from codecs import getincrementaldecoder
+from json import JSONDecodeError, JSONDecoder
+from typing import Any, Iterable, Iterator
+
+_WHITESPACE = " \t\n\r"
+_NUMBER_START = "-0123456789"
+_VALUE_END = _WHITESPACE + ",]"
+_decoder = JSONDecoder()
+
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator[Any]:
+    reader = _ArrayReader(iter(chunks))
+    reader.expect("[")
+    if reader.peek() == "]":
+        reader.advance()
+    else:
+        while True:
+            yield reader.decode_value()
+            delimiter = reader.peek()
+            reader.advance()
+            if delimiter == "]":
+                break
+            if delimiter != ",":
+                raise reader.error(f"expected ',' or ']' but found {delimiter!r}")
+    if reader.peek() != "":
+        raise reader.error("unexpected data after top-level array")
+
+
+class _ArrayReader:
+    def __init__(self, chunks: Iterator[bytes]):
+        self._chunks = chunks
+        self._text_decoder = getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def peek(self) -> str:
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer) or not self._fill():
+                return self._buffer[self._pos : self._pos + 1]
+
+    def advance(self) -> None:
+        self._pos += 1
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise self.error(f"expected {char!r} but found {found!r}")
+        self.advance()
+
+    def decode_value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self._buffer, self._pos)
+                # a scalar ending exactly at the buffer boundary may continue in the next chunk, and a number may
+                # also stop early at a trailing '.', 'e' or exponent sign whose digits are in the next chunk
+                is_number = self._buffer[self._pos] in _NUMBER_START
+                if self._eof or (end < len(self._buffer) and (not is_number or self._buffer[end] in _VALUE_END)):
+                    self._pos = end
+                    return value
+            except JSONDecodeError:
+                if self._eof:
+                    raise
+            # grow geometrically so that a large element is not re-parsed once per chunk
+            target = 2 * (len(self._buffer) - self._pos)
+            while self._fill() and len(self._buffer) - self._pos < target:
+                pass
+
+    def error(self, msg: str) -> JSONDecodeError:
+        return JSONDecodeError(msg, self._buffer, self._pos)
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self._eof = True
+            text = self._text_decoder.decode(b"", final=True)
+        else:
+            text = self._text_decoder.decode(chunk)
+        self._buffer = self._buffer[self._pos :] + text
+        self._pos = 0
+        return bool(text) or not self._eof
@@ -0,0 +1,26 @@
+from threading import Lock
+from typing import Any, Callable, Optional
+
+from botocore.client import BaseClient
+
+
+class LazyClient:
+    def __init__(self, name: str, build: Callable[[], BaseClient], is_stale: Callable[[], bool] = lambda: False):
+        self.name = name
+        self._build = build
+        self._is_stale = is_stale
+        self._client: Optional[BaseClient] = None
+        self._lock = Lock()
+
+    @property
+    def built(self) -> bool:
+        return self._client is not None
+
+    def __getattr__(self, item: str) -> Any:
+        return getattr(self._get(), item)
+
+    def _get(self) -> BaseClient:
+        with self._lock:
+            if self._client is None or self._is_stale():
+                self._client = self._build()
+            return self._client
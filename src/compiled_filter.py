@@ -0,0 +1,100 @@
+import re
+from collections import Counter
+from dataclasses import dataclass
+from fnmatch import translate
+from threading import Lock
+from typing import Dict, FrozenSet, List, Optional, Pattern, Set, Tuple
+
+from src.config.notification_filter_config import NotificationFilterConfig
+
+
+@dataclass(frozen=True)
+class _PatternGroup:
+    # the item patterns of the filters sharing an account and compliance item type scope, indexed by literal prefix so
+    # that an item is only tested against the patterns it can match
+    scope: NotificationFilterConfig
+    prefix_lengths: Tuple[int, ...]
+    by_prefix: Dict[str, List[Tuple[Pattern[str], NotificationFilterConfig]]]
+
+    def match(self, item: str) -> Optional[NotificationFilterConfig]:
+        for length in self.prefix_lengths:
+            for matcher, notification_filter in self.by_prefix.get(item[:length], ()) if length <= len(item) else ():
+                if matcher.match(item):
+                    return notification_filter
+        return None
+
+
+class CompiledFilter:
+    def __init__(self, filters: Set[NotificationFilterConfig]) -> None:
+        # several filters may share an item with different reasons, the first reason is kept for reporting
+        self._by_item: Dict[str, NotificationFilterConfig] = {}
+        self._scoped_by_item: Dict[str, List[NotificationFilterConfig]] = {}
+        scopes: Dict[Tuple[FrozenSet[str], FrozenSet[str]], List[NotificationFilterConfig]] = {}
+        for notification_filter in sorted(filters, key=lambda f: (f.pattern, f.reason, sorted(f.accounts))):
+            if notification_filter.item is None:
+                scope = (notification_filter.accounts, notification_filter.compliance_item_types)
+                scopes.setdefault(scope, []).append(notification_filter)
+            elif notification_filter.is_scoped:
+                self._scoped_by_item.setdefault(notification_filter.item, []).append(notification_filter)
+            else:
+                self._by_item.setdefault(notification_filter.item, notification_filter)
+        self._pattern_groups = [self._compile(group) for group in scopes.values()]
+        self._lock = Lock()
+        self._suppressed: Counter[str] = Counter()
+
+    def match(
+        self, item: str, account_id: Optional[str] = None, compliance_item_type: Optional[str] = None
+    ) -> Optional[NotificationFilterConfig]:
+        if item in self._by_item:
+            return self._by_item[item]
+        for notification_filter in self._scoped_by_item.get(item, ()):
+            if notification_filter.in_scope(account_id, compliance_item_type):
+                return notification_filter
+        for group in self._pattern_groups:
+            if group.scope.in_scope(account_id, compliance_item_type):
+                found = group.match(item)
+                if found:
+                    return found
+        return None
+
+    def suppresses(
+        self, item: str, account_id: Optional[str] = None, compliance_item_type: Optional[str] = None
+    ) -> bool:
+        notification_filter = self.match(item, account_id, compliance_item_type)
+        if notification_filter is None:
+            return False
+        with self._lock:
+            self._suppressed[notification_filter.pattern] += 1
+        return True
+
+    @property
+    def suppressed(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._suppressed)
+
+    @staticmethod
+    def _compile(filters: List[NotificationFilterConfig]) -> _PatternGroup:
+        by_prefix: Dict[str, List[Tuple[Pattern[str], NotificationFilterConfig]]] = {}
+        for notification_filter in filters:
+            prefix, regex = CompiledFilter._to_regex(notification_filter)
+            by_prefix.setdefault(prefix, []).append((re.compile(regex), notification_filter))
+        return _PatternGroup(
+            scope=filters[0], prefix_lengths=tuple(sorted({len(p) for p in by_prefix})), by_prefix=by_prefix
+        )
+
+    @staticmethod
+    def _to_regex(notification_filter: NotificationFilterConfig) -> Tuple[str, str]:
+        if notification_filter.item_glob is not None:
+            glob = notification_filter.item_glob
+            return re.split(r"[*?\[]", glob, maxsplit=1)[0], translate(glob)
+        regex = str(notification_filter.item_regex)
+        return _literal_prefix(regex), f"(?:{regex})\\Z"
+
+
+def _literal_prefix(regex: str) -> str:
+    # the characters every match starts with, stopping short of a character made optional or repeated by a quantifier
+    if "|" in regex:
+        return ""
+    prefix = re.match(r"\^?([^.^$*+?{}\[\]\\|()]*)(.?)", regex)
+    literal, following = (prefix.group(1), prefix.group(2)) if prefix else ("", "")
+    return literal[:-1] if following in ("*", "?", "{") else literal
@@ -9,10 +9,11 @@ from src.data.finding import Finding
 
 
 class GithubWebhookCompliance(Analyser):
-    webhooks: Dict[str, Set[str]] = {}
+    webhooks: Dict[str, Set[str]]
 
     def __init__(self, logger: Logger, config: Config):
         self.config = config
+        self.webhooks = {}
         super().__init__(logger=logger, item_type="github_repository_webhook")
 
     def analyse(self, audit: Audit) -> Set[Finding]:
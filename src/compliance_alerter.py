@@ -1,15 +1,23 @@
+import asyncio
 import logging
-from typing import Any, Dict, Set, TypeVar
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, TypeVar
 import json
 
+from src.alerter_context import AlerterContext
 from src.audit_analyser import AuditAnalyser
 from src.audit_fetcher import AuditFetcher
+from src.clients.account_snapshot import AccountSnapshotStore, FileAccountSnapshotStore, S3AccountSnapshotStore
 from src.clients.aws_client_factory import AwsClientFactory
 from src.config.config import Config
+from src.config.config_file_cache import ConfigFileCache
+from src.config.notification_config_snapshot import NotificationConfigSnapshot
 from src.data.audit import Audit
+from src.data.exceptions import ComplianceAlertingException, PagerDutyNotifierException, SlackNotifierException
 from src.data.finding import Finding
 from src.data.pagerduty_payload import PagerDutyPayload
 from src.notifiers.notifier import Notifier
+from src.notifiers.outbox import DirectoryOutbox, Outbox, S3Outbox
 from src.notifiers.pagerduty_notifier import PagerDutyNotifier
 from src.notifiers.slack_notifier import SlackNotifier
 from src.sns.codebuild import CodeBuild
@@ -22,41 +30,193 @@ N = TypeVar("N")
 P = TypeVar("P")
 
 
-def main(event: Dict[str, Any]) -> None:
-    compliance_alerter = ComplianceAlerter(
-        config=Config(
-            config_s3_client=AwsClientFactory().get_s3_client(
-                Config.get_aws_account(), Config.get_config_bucket_read_role()
-            ),
-            report_s3_client=AwsClientFactory().get_s3_client(
-                Config.get_aws_account(), Config.get_report_bucket_read_role()
-            ),
-            ssm_client=AwsClientFactory().get_ssm_client(Config.get_aws_account(), Config.get_ssm_read_role()),
-            org_client=AwsClientFactory().get_org_client(Config.get_org_account(), Config.get_org_read_role()),
-        )
+def build_config() -> Config:
+    return Config(
+        config_s3_client=client_factory.get_s3_client(Config.get_aws_account(), Config.get_config_bucket_read_role()),
+        report_s3_client=client_factory.get_s3_client(Config.get_aws_account(), Config.get_report_bucket_read_role()),
+        ssm_client=client_factory.get_ssm_client(
+            Config.get_aws_account(), Config.get_ssm_read_role(), parameter_ttl=Config.get_ssm_parameter_cache_ttl()
+        ),
+        org_client=client_factory.get_org_client(
+            Config.get_org_account(),
+            Config.get_org_read_role(),
+            directory_ttl=Config.get_account_directory_ttl(),
+            snapshot_store=build_account_snapshot_store(),
+        ),
+        config_file_cache=config_file_cache,
+        outbox=build_outbox(),
     )
 
-    if compliance_alerter.is_sns_event(event=event):
-        compliance_alerter.send(
-            notifier=SlackNotifier(config=compliance_alerter.config),
-            payloads=compliance_alerter.build_sns_event_findings(event=event),
-        )
-        compliance_alerter.send(
-            notifier=PagerDutyNotifier(config=compliance_alerter.config),
-            payloads=compliance_alerter.build_pagerduty_payloads(event=event),
-        )
 
-    if compliance_alerter.is_s3_event(event=event):
-        compliance_alerter.send(
-            notifier=SlackNotifier(config=compliance_alerter.config),
-            payloads=compliance_alerter.build_audit_report_findings(event=event),
+def build_account_snapshot_store() -> Optional[AccountSnapshotStore]:
+    key = Config.get_account_snapshot_key()
+    if key:
+        s3_client = client_factory.get_s3_client(Config.get_aws_account(), Config.get_account_snapshot_write_role())
+        return S3AccountSnapshotStore(s3_client, Config.get_config_bucket(), key)
+    path = Config.get_account_snapshot_path()
+    return FileAccountSnapshotStore(path) if path else None
+
+
+def build_outbox() -> Optional[Outbox]:
+    path = Config.get_outbox_path()
+    if path:
+        return DirectoryOutbox(path)
+    bucket = Config.get_outbox_bucket()
+    if bucket:
+        s3_client = client_factory.get_s3_client(Config.get_aws_account(), Config.get_outbox_write_role())
+        return S3Outbox(s3_client, bucket, Config.get_outbox_prefix())
+    return None
+
+
+# kept at module level so that warm lambda invocations reuse the config, its aws clients and their credentials
+client_factory = AwsClientFactory(lazy=True)
+config_file_cache = ConfigFileCache()
+alerter_context = AlerterContext(build_config)
+
+
+def main(event: Dict[str, Any], remaining_millis: Optional[Callable[[], int]] = None) -> None:
+    sts_calls, startup_costs = client_factory.sts_calls, len(client_factory.startup_costs)
+    compliance_alerter = ComplianceAlerter(config=alerter_context.get_config())
+    try:
+        if compliance_alerter.is_sns_event(event=event):
+            deliveries: List[Tuple[Notifier[Any, Any], Set[Any]]] = []
+            findings = compliance_alerter.build_sns_event_findings(event=event)
+            if findings:
+                deliveries.append(
+                    (
+                        SlackNotifier(
+                            config=compliance_alerter.config,
+                            notification_config=compliance_alerter.get_notification_config(),
+                            outbox=compliance_alerter.config.outbox,
+                            remaining_millis=remaining_millis,
+                        ),
+                        findings,
+                    )
+                )
+            payloads = compliance_alerter.build_pagerduty_payloads(event=event)
+            if payloads:
+                deliveries.append(
+                    (
+                        PagerDutyNotifier(
+                            config=compliance_alerter.config,
+                            notification_config=compliance_alerter.get_notification_config(),
+                            outbox=compliance_alerter.config.outbox,
+                        ),
+                        payloads,
+                    )
+                )
+            if deliveries:
+                compliance_alerter.send_all(deliveries)
+
+        if compliance_alerter.is_s3_event(event=event):
+            findings = (
+                compliance_alerter.build_all_audit_report_findings(event=event)
+                if Config.get_process_all_s3_records()
+                else compliance_alerter.build_audit_report_findings(event=event)
+            )
+            if findings:
+                compliance_alerter.send(
+                    notifier=SlackNotifier(
+                        config=compliance_alerter.config,
+                        notification_config=compliance_alerter.get_notification_config(),
+                        outbox=compliance_alerter.config.outbox,
+                        remaining_millis=remaining_millis,
+                    ),
+                    payloads=findings,
+                )
+    finally:
+        compliance_alerter.log_filter_suppressions()
+        compliance_alerter.log_org_account_fetches()
+        compliance_alerter.config.get_org_client().save_snapshot()
+        costs = client_factory.startup_costs[startup_costs:]
+        compliance_alerter.logger.info(
+            f"aws client startup costs for {compliance_alerter.event_source(event) or 'unknown'} event: "
+            f"{', '.join(f'{name}={seconds * 1000:.0f}ms' for name, seconds in costs) or 'none'} "
+            f"({client_factory.sts_calls - sts_calls} sts assume role calls)"
         )
 
 
+def replay_outbox(remaining_millis: Optional[Callable[[], int]] = None) -> None:
+    ComplianceAlerter(config=alerter_context.get_config()).replay_outbox(remaining_millis)
+
+
 class ComplianceAlerter:
     def __init__(self, config: Config) -> None:
         self.config = config
         self.logger = Config.configure_logging()
+        self._notification_config: Optional[NotificationConfigSnapshot] = None
+        self._org_account_fetches = config.get_org_client().account_fetches
+
+    def get_notification_config(self) -> NotificationConfigSnapshot:
+        if self._notification_config is None:
+            cache = self.config.config_file_cache
+            hits, misses = cache.hits, cache.misses
+            self._notification_config = NotificationConfigSnapshot.load(self.config)
+            self.logger.info(
+                f"loaded {self._notification_config.filter_count} notification filters and "
+                f"{self._notification_config.mapping_count} notification mappings "
+                f"in {self._notification_config.load_seconds * 1000:.0f}ms "
+                f"({cache.hits - hits} config file cache hits, {cache.misses - misses} misses)"
+            )
+        return self._notification_config
+
+    def log_filter_suppressions(self) -> None:
+        if self._notification_config is None:
+            return
+        suppressed = self._notification_config.compiled_filter.suppressed
+        if suppressed:
+            self.logger.info(
+                "notification filters suppressed "
+                + ", ".join(f"{item}={count}" for item, count in sorted(suppressed.items()))
+            )
+
+    def log_org_account_fetches(self) -> None:
+        fetches = self.config.get_org_client().account_fetches - self._org_account_fetches
+        if fetches:
+            self.logger.info(f"{fetches} accounts fetched from the organization")
+
+    def replay_outbox(self, remaining_millis: Optional[Callable[[], int]] = None) -> None:
+        outbox = self.config.outbox
+        if outbox is None:
+            self.logger.warning("no outbox is configured, nothing to replay")
+            return
+        keys = outbox.keys()
+        if not keys:
+            self.logger.info("outbox is empty, nothing to replay")
+            return
+        # no filters or mappings are needed to resend payloads that were already mapped
+        empty_config = NotificationConfigSnapshot(filters=set(), mappings=set())
+        notifier_factories: Dict[str, Callable[[], Notifier[Any, Any]]] = {
+            "slack": lambda: SlackNotifier(
+                config=self.config, notification_config=empty_config, remaining_millis=remaining_millis
+            ),
+            "pagerduty": lambda: PagerDutyNotifier(config=self.config, notification_config=empty_config),
+        }
+        notifiers = {
+            name: new_notifier()
+            for name, new_notifier in notifier_factories.items()
+            if any(key.startswith(f"{name}/") for key in keys)
+        }
+        with ThreadPoolExecutor(max_workers=min(len(keys), Config.get_outbox_replay_concurrency())) as executor:
+            replayed = sum(executor.map(lambda key: self._replay(outbox, notifiers, key), keys))
+        self.logger.info(f"replayed {replayed} of {len(keys)} outbox notifications")
+
+    def _replay(self, outbox: Outbox, notifiers: Dict[str, Notifier[Any, Any]], key: str) -> bool:
+        try:
+            entry = outbox.read(key)
+            notifiers[entry.notifier].replay(entry)
+            outbox.delete(key)
+        except (
+            ComplianceAlertingException,
+            SlackNotifierException,
+            PagerDutyNotifierException,
+            OSError,
+            KeyError,
+            ValueError,
+        ) as err:
+            self.logger.error(f"unable to replay outbox notification '{key}': {err}")
+            return False
+        return True
 
     @staticmethod
     def event_source(event: Dict[str, Any]) -> str:
@@ -78,7 +238,9 @@ class ComplianceAlerter:
         return ComplianceAlerter.event_source(event=event) == "aws:s3"
 
     def fetch(self, event: Dict[str, Any]) -> Audit:
-        return AuditFetcher().fetch_audit(self.config.get_report_s3_client(), event)
+        return AuditFetcher(stream=self.config.get_stream_audit_reports()).fetch_audit(
+            self.config.get_report_s3_client(), event
+        )
 
     def analyse(self, audit: Audit) -> Set[Finding]:
         return AuditAnalyser().analyse(self.logger, audit, self.config)
@@ -86,6 +248,27 @@ class ComplianceAlerter:
     def build_audit_report_findings(self, event: Dict[str, Any]) -> Set[Finding]:
         return self.analyse(self.fetch(event))
 
+    def build_all_audit_report_findings(self, event: Dict[str, Any]) -> Set[Finding]:
+        fetcher = AuditFetcher(stream=self.config.get_stream_audit_reports())
+        records = fetcher.read_records(event)
+        with ThreadPoolExecutor(max_workers=min(len(records), self.config.get_s3_record_concurrency())) as executor:
+            futures = [executor.submit(self._build_record_findings, fetcher, record) for record in records]
+
+        findings: Set[Finding] = set()
+        failures = []
+        for record, future in zip(records, futures):
+            try:
+                findings.update(future.result())
+            except Exception as err:
+                failures.append(err)
+                self.logger.error(f"unable to process audit report '{fetcher.record_key(record)}': {err}")
+        if len(failures) == len(records):
+            raise failures[0]
+        return findings
+
+    def _build_record_findings(self, fetcher: AuditFetcher, record: Dict[str, Any]) -> Set[Finding]:
+        return self.analyse(fetcher.fetch_record_audit(self.config.get_report_s3_client(), record))
+
     def build_sns_event_findings(self, event: Dict[str, Any]) -> Set[Finding]:
         findings: Set[Finding] = set()
         for record in event["Records"]:
@@ -121,3 +304,19 @@ class ComplianceAlerter:
 
     def send(self, notifier: Notifier[N, P], payloads: Set[P]) -> None:
         notifier.send(notifier.apply_mappings(notifier.apply_filters(payloads)))
+
+    def send_all(self, deliveries: List[Tuple[Notifier[Any, Any], Set[Any]]]) -> None:
+        notifications = [
+            (notifier, notifier.apply_mappings(notifier.apply_filters(payloads))) for notifier, payloads in deliveries
+        ]
+        asyncio.run(self._send_all(notifications))
+
+    @staticmethod
+    async def _send_all(notifications: List[Tuple[Notifier[Any, Any], List[Any]]]) -> None:
+        # every notifier finishes sending before the first failure, if any, is raised
+        results = await asyncio.gather(
+            *[notifier.send_async(messages) for notifier, messages in notifications], return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
@@ -0,0 +1,52 @@
+import json
+import os
+import sys
+from argparse import ArgumentParser
+from typing import Any, Dict, List, Optional
+
+from src.config.notification_config_bundle import NotificationConfigBundle
+from src.data.exceptions import ComplianceAlertingException, InvalidConfigException
+
+
+def compile_directory(config_dir: str) -> NotificationConfigBundle:
+    return NotificationConfigBundle.compile(
+        filter_files=_read_config_files(config_dir, "filters"),
+        mapping_files=_read_config_files(config_dir, "mappings"),
+    )
+
+
+def _read_config_files(config_dir: str, prefix: str) -> Dict[str, Any]:
+    directory = os.path.join(config_dir, prefix)
+    if not os.path.isdir(directory):
+        return {}
+    files = {}
+    for name in sorted(os.listdir(directory)):
+        key = f"{prefix}/{name}"
+        try:
+            with open(os.path.join(directory, name), "r") as config_file:
+                files[key] = json.load(config_file)
+        except (OSError, ValueError) as err:
+            raise InvalidConfigException(f"invalid config file '{key}': {err}") from None
+    return files
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = ArgumentParser(description="compile notification filters and mappings into a single config bundle")
+    parser.add_argument("config_dir", help="directory holding the filters/ and mappings/ config files")
+    parser.add_argument("output", help="path of the bundle file to write")
+    args = parser.parse_args(argv)
+
+    try:
+        bundle = compile_directory(args.config_dir)
+    except ComplianceAlertingException as err:
+        print(f"unable to compile notification config: {err}", file=sys.stderr)
+        return 1
+
+    with open(args.output, "w") as output:
+        json.dump(bundle.to_dict(), output, sort_keys=True, separators=(",", ":"))
+    print(f"compiled {len(bundle.filters)} filters and {len(bundle.mappings)} mappings ({bundle.version_hash})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,16 +1,21 @@
 import logging
-from logging import Logger
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from logging import Logger, getLogger
 from itertools import chain
 from os import environ
-from typing import Callable, Dict, Set, List
+from typing import Callable, Dict, Optional, Set, List
 
 from src import T, error
 from src.clients.aws_s3_client import AwsS3Client
 from src.clients.aws_org_client import AwsOrgClient
 from src.clients.aws_ssm_client import AwsSsmClient
+from src.config.config_file_cache import ConfigFileCache
+from src.config.notification_config_bundle import NotificationConfigBundle
 from src.config.notification_filter_config import NotificationFilterConfig
 from src.config.notification_mapping_config import NotificationMappingConfig
 from src.config.slack_notifier_config import SlackNotifierConfig
+from src.notifiers.outbox import Outbox
 from src.data.exceptions import ComplianceAlertingException, MissingConfigException, InvalidConfigException
 
 
@@ -21,11 +26,15 @@ class Config:
         report_s3_client: AwsS3Client,
         ssm_client: AwsSsmClient,
         org_client: AwsOrgClient,
+        config_file_cache: Optional[ConfigFileCache] = None,
+        outbox: Optional[Outbox] = None,
     ):
         self.config_s3_client = config_s3_client
         self.report_s3_client = report_s3_client
         self.ssm_client = ssm_client
         self.org_client = org_client
+        self.config_file_cache = config_file_cache or ConfigFileCache()
+        self.outbox = outbox
 
     @classmethod
     def get_aws_account(self) -> str:
@@ -144,6 +153,50 @@ class Config:
     def get_org_read_role(self) -> str:
         return self._get_env("ORG_READ_ROLE")
 
+    @classmethod
+    def get_account_directory_ttl(self) -> timedelta:
+        return timedelta(seconds=self._get_positive_int("ACCOUNT_DIRECTORY_TTL_SECONDS", 1800))
+
+    @classmethod
+    def get_ssm_parameter_cache_ttl(self) -> timedelta:
+        return timedelta(seconds=self._get_positive_int("SSM_PARAMETER_CACHE_TTL_SECONDS", 300))
+
+    @staticmethod
+    def get_notification_config_bundle_key() -> Optional[str]:
+        return environ.get("NOTIFICATION_CONFIG_BUNDLE_KEY", "bundle/notification_config.json") or None
+
+    @staticmethod
+    def get_account_snapshot_key() -> Optional[str]:
+        return environ.get("ACCOUNT_SNAPSHOT_KEY") or None
+
+    @classmethod
+    def get_account_snapshot_write_role(self) -> str:
+        return self._get_env("ACCOUNT_SNAPSHOT_WRITE_ROLE")
+
+    @staticmethod
+    def get_account_snapshot_path() -> Optional[str]:
+        return environ.get("ACCOUNT_SNAPSHOT_PATH") or None
+
+    @staticmethod
+    def get_outbox_path() -> Optional[str]:
+        return environ.get("OUTBOX_PATH") or None
+
+    @staticmethod
+    def get_outbox_bucket() -> Optional[str]:
+        return environ.get("OUTBOX_BUCKET") or None
+
+    @staticmethod
+    def get_outbox_prefix() -> str:
+        return environ.get("OUTBOX_PREFIX", "outbox/")
+
+    @classmethod
+    def get_outbox_write_role(self) -> str:
+        return self._get_env("OUTBOX_WRITE_ROLE")
+
+    @classmethod
+    def get_outbox_replay_concurrency(self) -> int:
+        return self._get_positive_int("OUTBOX_REPLAY_CONCURRENCY", 8)
+
     def get_slack_notifier_config(self) -> SlackNotifierConfig:
         return SlackNotifierConfig(
             api_v2_key=self.ssm_client.get_parameter(self.get_slack_v2_api_key()),
@@ -163,11 +216,45 @@ class Config:
         return self.org_client
 
     def get_notification_filters(self) -> Set[NotificationFilterConfig]:
-        return self._fetch_config_files("filters/", NotificationFilterConfig.from_dict)
+        bundle = self.get_notification_config_bundle()
+        if bundle:
+            return set(bundle.filters)
+        return self.get_notification_filter_files()
 
     def get_notification_mappings(self) -> Set[NotificationMappingConfig]:
+        bundle = self.get_notification_config_bundle()
+        if bundle:
+            return set(bundle.mappings)
+        return self.get_notification_mapping_files()
+
+    def get_notification_filter_files(self) -> Set[NotificationFilterConfig]:
+        return self._fetch_config_files("filters/", NotificationFilterConfig.from_dict)
+
+    def get_notification_mapping_files(self) -> Set[NotificationMappingConfig]:
         return self._fetch_config_files("mappings/", NotificationMappingConfig.from_dict)
 
+    def get_notification_config_bundle(self) -> Optional[NotificationConfigBundle]:
+        key = self.get_notification_config_bundle_key()
+        if not key:
+            return None
+        etag = self.config_s3_client.list_object_etags(self.get_config_bucket(), key).get(key)
+        if etag is None:
+            return None
+        cached = self.config_file_cache.get(key, etag)
+        if cached:
+            cached_bundle: NotificationConfigBundle = next(iter(cached))
+            return cached_bundle
+        try:
+            bundle = NotificationConfigBundle.from_dict(
+                self.config_s3_client.read_json_object(self.get_config_bucket(), key)
+            )
+        except ComplianceAlertingException as err:
+            error(self, f"unable to load notification config bundle '{key}': {err}")
+            return None
+        getLogger(self.__class__.__name__).info(f"loaded notification config bundle {bundle.version_hash}")
+        self.config_file_cache.put(key, etag, {bundle})
+        return bundle
+
     @staticmethod
     def _get_env(key: str) -> str:
         try:
@@ -179,6 +266,58 @@ class Config:
     def get_enable_wiki_checking(self) -> bool:
         return self._get_feature_switch("ENABLE_WIKI_CHECKING")
 
+    @classmethod
+    def get_stream_audit_reports(self) -> bool:
+        return self._get_feature_switch("STREAM_AUDIT_REPORTS")
+
+    @classmethod
+    def get_process_all_s3_records(self) -> bool:
+        return self._get_feature_switch("PROCESS_ALL_S3_RECORDS")
+
+    @classmethod
+    def get_coalesce_slack_messages(self) -> bool:
+        return self._get_feature_switch("COALESCE_SLACK_MESSAGES")
+
+    @classmethod
+    def get_s3_record_concurrency(self) -> int:
+        return self._get_positive_int("S3_RECORD_CONCURRENCY", 4)
+
+    @classmethod
+    def get_config_load_concurrency(self) -> int:
+        return self._get_positive_int("CONFIG_LOAD_CONCURRENCY", 8)
+
+    @classmethod
+    def get_slack_delivery_concurrency(self) -> int:
+        return self._get_positive_int("SLACK_DELIVERY_CONCURRENCY", 1)
+
+    @classmethod
+    def get_slack_messages_per_minute(self) -> Optional[int]:
+        return self._get_optional_positive_int("SLACK_MESSAGES_PER_MINUTE")
+
+    @classmethod
+    def get_slack_channel_messages_per_minute(self) -> Optional[int]:
+        return self._get_optional_positive_int("SLACK_CHANNEL_MESSAGES_PER_MINUTE")
+
+    @classmethod
+    def get_slack_retry_budget(self) -> timedelta:
+        return timedelta(seconds=self._get_positive_int("SLACK_RETRY_BUDGET_SECONDS", 120))
+
+    @classmethod
+    def get_notifier_max_attempts(self) -> int:
+        return self._get_positive_int("NOTIFIER_MAX_ATTEMPTS", 3)
+
+    @classmethod
+    def get_notifier_circuit_error_percent(self) -> int:
+        return self._get_positive_int("NOTIFIER_CIRCUIT_ERROR_PERCENT", 50)
+
+    @classmethod
+    def get_notifier_circuit_open_seconds(self) -> int:
+        return self._get_positive_int("NOTIFIER_CIRCUIT_OPEN_SECONDS", 30)
+
+    @classmethod
+    def get_http_pool_size(self) -> int:
+        return self._get_positive_int("HTTP_POOL_SIZE", 10)
+
     @staticmethod
     def _get_feature_switch(key: str) -> bool:
         try:
@@ -186,16 +325,43 @@ class Config:
         except KeyError:
             return False
 
+    @staticmethod
+    def _get_positive_int(key: str, default: int) -> int:
+        value = environ.get(key, str(default))
+        try:
+            number = int(value)
+        except ValueError:
+            raise InvalidConfigException(f"invalid {key}: {value}") from None
+        if number < 1:
+            raise InvalidConfigException(f"invalid {key}: {value}")
+        return number
+
+    @classmethod
+    def _get_optional_positive_int(self, key: str) -> Optional[int]:
+        return self._get_positive_int(key, 0) if environ.get(key) else None
+
     def _fetch_config_files(self, prefix: str, mapper: Callable[[Dict[str, str]], T]) -> Set[T]:
-        keys = self.config_s3_client.list_objects(self.get_config_bucket(), prefix)
-        return set(chain.from_iterable(map(lambda key: self._load(key, mapper), keys)))
+        etags = self.config_s3_client.list_object_etags(self.get_config_bucket(), prefix)
+        self.config_file_cache.retain(prefix, set(etags))
+        if not etags:
+            return set()
+        with ThreadPoolExecutor(max_workers=min(len(etags), self.get_config_load_concurrency())) as executor:
+            return set(chain.from_iterable(executor.map(lambda key: self._load_cached(key, etags[key], mapper), etags)))
 
-    def _load(self, key: str, mapper: Callable[[Dict[str, str]], T]) -> Set[T]:
+    def _load_cached(self, key: str, etag: str, mapper: Callable[[Dict[str, str]], T]) -> Set[T]:
+        cached = self.config_file_cache.get(key, etag)
+        if cached is not None:
+            return cached
         try:
-            return {mapper(item) for item in self.config_s3_client.read_object(self.get_config_bucket(), key)}
+            items = self._load(key, mapper)
         except ComplianceAlertingException as err:
             error(self, f"unable to load config file '{key}': {err}")
             return set()
+        self.config_file_cache.put(key, etag, items)
+        return items
+
+    def _load(self, key: str, mapper: Callable[[Dict[str, str]], T]) -> Set[T]:
+        return {mapper(item) for item in self.config_s3_client.read_object(self.get_config_bucket(), key)}
 
     @staticmethod
     def configure_logging() -> Logger:
@@ -0,0 +1,28 @@
+from threading import Lock
+from typing import Any, Dict, Optional, Set, Tuple
+
+
+class ConfigFileCache:
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self._lock = Lock()
+        self._entries: Dict[str, Tuple[str, Set[Any]]] = {}
+
+    def get(self, key: str, etag: str) -> Optional[Set[Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] == etag:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            return None
+
+    def put(self, key: str, etag: str, items: Set[Any]) -> None:
+        with self._lock:
+            self._entries[key] = (etag, items)
+
+    def retain(self, prefix: str, keys: Set[str]) -> None:
+        with self._lock:
+            for key in [key for key in self._entries if key.startswith(prefix) and key not in keys]:
+                del self._entries[key]
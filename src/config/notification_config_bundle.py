@@ -0,0 +1,151 @@
+from __future__ import annotations
+import json
+from dataclasses import dataclass
+from hashlib import sha256
+from typing import Any, Callable, Dict, FrozenSet, List, Sequence, Set, Tuple
+
+from src import T
+from src.config.notification_filter_config import NotificationFilterConfig
+from src.config.notification_mapping_config import NotificationMappingConfig
+from src.data.exceptions import ComplianceAlertingException, InvalidConfigException
+
+BUNDLE_VERSION = 2
+MAPPING_INDEX_FIELDS = ("items", "accounts", "compliance_item_types")
+
+
+@dataclass(frozen=True)
+class MappingIndex:
+    # mapping positions by field value, plus the positions of the mappings that match any value of that field
+    values: Dict[str, Dict[str, FrozenSet[int]]]
+    wildcards: Dict[str, FrozenSet[int]]
+
+    @staticmethod
+    def build(mappings: Sequence[NotificationMappingConfig]) -> MappingIndex:
+        values: Dict[str, Dict[str, Set[int]]] = {field: {} for field in MAPPING_INDEX_FIELDS}
+        wildcards: Dict[str, Set[int]] = {field: set() for field in MAPPING_INDEX_FIELDS}
+        for position, mapping in enumerate(mappings):
+            for field in MAPPING_INDEX_FIELDS:
+                field_values: FrozenSet[str] = getattr(mapping, field)
+                if not field_values:
+                    wildcards[field].add(position)
+                for value in field_values:
+                    values[field].setdefault(value, set()).add(position)
+        return MappingIndex(
+            values={field: {v: frozenset(p) for v, p in by_value.items()} for field, by_value in values.items()},
+            wildcards={field: frozenset(positions) for field, positions in wildcards.items()},
+        )
+
+    @staticmethod
+    def from_dict(index: Dict[str, Any]) -> MappingIndex:
+        return MappingIndex(
+            values={
+                field: {value: frozenset(positions) for value, positions in index["values"][field].items()}
+                for field in MAPPING_INDEX_FIELDS
+            },
+            wildcards={field: frozenset(index["wildcards"][field]) for field in MAPPING_INDEX_FIELDS},
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "values": {
+                field: {value: sorted(positions) for value, positions in sorted(by_value.items())}
+                for field, by_value in self.values.items()
+            },
+            "wildcards": {field: sorted(positions) for field, positions in self.wildcards.items()},
+        }
+
+
+@dataclass(frozen=True, eq=False)
+class NotificationConfigBundle:
+    version_hash: str
+    filters: Set[NotificationFilterConfig]
+    mappings: Tuple[NotificationMappingConfig, ...]
+    mapping_index: MappingIndex
+
+    @staticmethod
+    def compile(
+        filter_files: Dict[str, List[Dict[str, Any]]], mapping_files: Dict[str, List[Dict[str, Any]]]
+    ) -> NotificationConfigBundle:
+        filters = set(_parse_files(filter_files, NotificationFilterConfig.from_dict))
+        mappings = set(_parse_files(mapping_files, NotificationMappingConfig.from_dict))
+        filter_dicts = sorted((_filter_to_dict(f) for f in filters), key=_canonical)
+        mapping_dicts = sorted((_mapping_to_dict(m) for m in mappings), key=_canonical)
+        ordered_mappings = tuple(NotificationMappingConfig.from_dict(m) for m in mapping_dicts)
+        mapping_index = MappingIndex.build(ordered_mappings)
+        return NotificationConfigBundle(
+            version_hash=_hash(filter_dicts, mapping_dicts, mapping_index.to_dict()),
+            filters=filters,
+            mappings=ordered_mappings,
+            mapping_index=mapping_index,
+        )
+
+    @staticmethod
+    def from_dict(bundle: Dict[str, Any]) -> NotificationConfigBundle:
+        try:
+            if bundle["version"] != BUNDLE_VERSION:
+                raise InvalidConfigException(f"unsupported notification config bundle version {bundle['version']}")
+            # the indexes are hashed too, so that an index that no longer matches its mappings is never used
+            if bundle["hash"] != _hash(bundle["filters"], bundle["mappings"], bundle["indexes"]):
+                raise InvalidConfigException(f"notification config bundle hash mismatch for {bundle['hash']}")
+            mappings = tuple(NotificationMappingConfig.from_dict(mapping) for mapping in bundle["mappings"])
+            return NotificationConfigBundle(
+                version_hash=bundle["hash"],
+                filters={NotificationFilterConfig.from_dict(f) for f in bundle["filters"]},
+                mappings=mappings,
+                mapping_index=MappingIndex.from_dict(bundle["indexes"]),
+            )
+        except (KeyError, TypeError, AttributeError) as err:
+            raise InvalidConfigException(f"invalid notification config bundle: {err!r}") from None
+
+    def to_dict(self) -> Dict[str, Any]:
+        filter_dicts = sorted((_filter_to_dict(f) for f in self.filters), key=_canonical)
+        return {
+            "version": BUNDLE_VERSION,
+            "hash": self.version_hash,
+            "filters": filter_dicts,
+            "mappings": [_mapping_to_dict(mapping) for mapping in self.mappings],
+            "indexes": self.mapping_index.to_dict(),
+        }
+
+
+def _parse_files(files: Dict[str, List[Dict[str, Any]]], mapper: Callable[[Dict[str, Any]], T]) -> List[T]:
+    parsed: List[T] = []
+    for key, items in sorted(files.items()):
+        try:
+            if not isinstance(items, list):
+                raise InvalidConfigException("expected a list of config entries")
+            parsed.extend(mapper(item) for item in items)
+        except ComplianceAlertingException as err:
+            raise InvalidConfigException(f"invalid config file '{key}': {err}") from None
+    return parsed
+
+
+def _filter_to_dict(notification_filter: NotificationFilterConfig) -> Dict[str, Any]:
+    # optional fields are left out when unset, so that bundles of exact item filters keep their hash
+    optional = {
+        "item": notification_filter.item,
+        "item_glob": notification_filter.item_glob,
+        "item_regex": notification_filter.item_regex,
+        "accounts": sorted(notification_filter.accounts),
+        "compliance_item_types": sorted(notification_filter.compliance_item_types),
+    }
+    return {"reason": notification_filter.reason, **{key: value for key, value in optional.items() if value}}
+
+
+def _mapping_to_dict(mapping: NotificationMappingConfig) -> Dict[str, Any]:
+    return {
+        "channel": mapping.channel,
+        "pagerduty_service": mapping.pagerduty_service,
+        "accounts": sorted(mapping.accounts),
+        "items": sorted(mapping.items),
+        "compliance_item_types": sorted(mapping.compliance_item_types),
+    }
+
+
+def _canonical(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"))
+
+
+def _hash(filters: List[Dict[str, Any]], mappings: List[Dict[str, Any]], indexes: Dict[str, Any]) -> str:
+    content = {"filters": filters, "mappings": mappings, "indexes": indexes}
+    return sha256(_canonical(content).encode("utf-8")).hexdigest()
@@ -0,0 +1,54 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from functools import cached_property
+from time import perf_counter
+from typing import Optional, Set
+
+from src.compiled_filter import CompiledFilter
+from src.config.config import Config
+from src.config.notification_config_bundle import NotificationConfigBundle
+from src.config.notification_filter_config import NotificationFilterConfig
+from src.config.notification_mapping_config import NotificationMappingConfig
+from src.notification_router import NotificationRouter
+
+
+@dataclass(frozen=True)
+class NotificationConfigSnapshot:
+    filters: Set[NotificationFilterConfig]
+    mappings: Set[NotificationMappingConfig]
+    load_seconds: float = 0.0
+    bundle: Optional[NotificationConfigBundle] = None
+
+    @property
+    def filter_count(self) -> int:
+        return len(self.filters)
+
+    @property
+    def mapping_count(self) -> int:
+        return len(self.mappings)
+
+    @cached_property
+    def compiled_filter(self) -> CompiledFilter:
+        return CompiledFilter(self.filters)
+
+    @cached_property
+    def router(self) -> NotificationRouter:
+        if self.bundle:
+            return NotificationRouter(self.bundle.mappings, self.bundle.mapping_index)
+        return NotificationRouter(list(self.mappings))
+
+    @staticmethod
+    def load(config: Config) -> NotificationConfigSnapshot:
+        start = perf_counter()
+        bundle = config.get_notification_config_bundle()
+        if bundle:
+            return NotificationConfigSnapshot(
+                filters=set(bundle.filters),
+                mappings=set(bundle.mappings),
+                load_seconds=perf_counter() - start,
+                bundle=bundle,
+            )
+        # the bundle was just looked up, so the per-file config is loaded without looking it up again
+        filters = config.get_notification_filter_files()
+        mappings = config.get_notification_mapping_files()
+        return NotificationConfigSnapshot(filters=filters, mappings=mappings, load_seconds=perf_counter() - start)
@@ -1,17 +1,61 @@
 from __future__ import annotations
+import re
 from dataclasses import dataclass
-from typing import Dict
+from typing import Any, Dict, FrozenSet, List, Optional
 
 from src.data.exceptions import FilterConfigException
 
 
 @dataclass(frozen=True)
 class NotificationFilterConfig:
-    item: str
+    item: Optional[str]
     reason: str
+    item_glob: Optional[str]
+    item_regex: Optional[str]
+    accounts: FrozenSet[str]
+    compliance_item_types: FrozenSet[str]
+
+    def __init__(
+        self,
+        item: Optional[str] = None,
+        reason: Optional[str] = None,
+        item_glob: Optional[str] = None,
+        item_regex: Optional[str] = None,
+        accounts: Optional[List[str]] = None,
+        compliance_item_types: Optional[List[str]] = None,
+    ):
+        if [item, item_glob, item_regex].count(None) != 2:
+            raise FilterConfigException("exactly one of item, item_glob or item_regex is required")
+        if not reason:
+            raise FilterConfigException("missing required argument: 'reason'")
+        if item_regex is not None:
+            try:
+                re.compile(item_regex)
+            except re.error as err:
+                raise FilterConfigException(f"invalid item_regex '{item_regex}': {err}") from None
+        # the dataclass is frozen, so its fields are set the way its generated __init__ would set them
+        object.__setattr__(self, "item", item)
+        object.__setattr__(self, "reason", reason)
+        object.__setattr__(self, "item_glob", item_glob)
+        object.__setattr__(self, "item_regex", item_regex)
+        object.__setattr__(self, "accounts", frozenset(accounts or {}))
+        object.__setattr__(self, "compliance_item_types", frozenset(compliance_item_types or {}))
+
+    @property
+    def pattern(self) -> str:
+        return self.item or self.item_glob or self.item_regex or ""
+
+    @property
+    def is_scoped(self) -> bool:
+        return bool(self.accounts or self.compliance_item_types)
+
+    def in_scope(self, account_id: Optional[str], compliance_item_type: Optional[str]) -> bool:
+        return (not self.accounts or account_id in self.accounts) and (
+            not self.compliance_item_types or compliance_item_type in self.compliance_item_types
+        )
 
     @staticmethod
-    def from_dict(filter_config: Dict[str, str]) -> NotificationFilterConfig:
+    def from_dict(filter_config: Dict[str, Any]) -> NotificationFilterConfig:
         try:
             return NotificationFilterConfig(**filter_config)
         except TypeError as err:
@@ -1,8 +1,8 @@
 from dataclasses import dataclass
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable
 
 
 @dataclass
 class Audit:
     type: str
-    report: List[Dict[str, Any]]
+    report: Iterable[Dict[str, Any]]
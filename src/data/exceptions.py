@@ -34,9 +34,19 @@ class UnsupportedEventException(ComplianceAlertingException):
     pass
 
 
+class CircuitOpenException(ComplianceAlertingException):
+    pass
+
+
 class SlackNotifierException(Exception):
     pass
 
 
+class SlackRateLimitedException(SlackNotifierException):
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
 class PagerDutyNotifierException(Exception):
     pass
@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from src.data.notification import Notification
 
@@ -13,6 +13,7 @@ class SlackMessage(Notification):
     color: str
     emoji: str
     source: str
+    attachments: List[Dict[str, str]]
 
     def __init__(
         self,
@@ -23,6 +24,7 @@ class SlackMessage(Notification):
         color: str,
         emoji: str,
         source: str,
+        attachments: Optional[List[Dict[str, str]]] = None,
     ):
         self.channels = list(filter(None, channels))
         self.heading = heading if heading else "Unknown Service"
@@ -31,6 +33,7 @@ class SlackMessage(Notification):
         self.color = color
         self.emoji = emoji
         self.source = source
+        self.attachments = attachments or [{"color": color, "title": title, "text": text}]
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -54,11 +57,5 @@ class SlackMessage(Notification):
             ],
             "text": "",
             "callbackChannel": "team-platsec-alerts",
-            "attachments": [
-                {
-                    "color": self.color,
-                    "title": self.title,
-                    "text": self.text,
-                }
-            ],
+            "attachments": self.attachments,
         }
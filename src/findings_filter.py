@@ -1,4 +1,5 @@
-from typing import Set
+from typing import Optional, Set
+from src.compiled_filter import CompiledFilter
 from src.data.finding import Finding
 
 from src.config.notification_filter_config import NotificationFilterConfig
@@ -6,5 +7,15 @@ from src.config.notification_filter_config import NotificationFilterConfig
 
 class FindingsFilter:
     @staticmethod
-    def do_filter(findings: Set[Finding], filters: Set[NotificationFilterConfig]) -> Set[Finding]:
-        return {n for n in findings if n.findings and n.item not in [f.item for f in filters]}
+    def do_filter(
+        findings: Set[Finding], filters: Set[NotificationFilterConfig], compiled_filter: Optional[CompiledFilter] = None
+    ) -> Set[Finding]:
+        compiled_filter = compiled_filter or CompiledFilter(filters)
+        return {
+            n
+            for n in findings
+            if n.findings
+            and not compiled_filter.suppresses(
+                n.item, n.account.identifier if n.account else None, n.compliance_item_type
+            )
+        }
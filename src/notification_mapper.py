@@ -1,4 +1,4 @@
-from typing import List, Set, Optional
+from typing import Dict, List, Set, Optional, Tuple
 
 from src.clients.aws_org_client import AwsOrgClient
 from src.data.account import Account
@@ -6,27 +6,38 @@ from src.data.finding import Finding
 from src.config.notification_mapping_config import NotificationMappingConfig
 from src.data.slack_message import SlackMessage
 from src.config.config import Config
+from src.notification_router import NotificationRouter
 
 
 class NotificationMapper:
     def do_map(
-        self, notifications: Set[Finding], mappings: Set[NotificationMappingConfig], org_client: AwsOrgClient
+        self,
+        notifications: Set[Finding],
+        mappings: Set[NotificationMappingConfig],
+        org_client: AwsOrgClient,
+        router: Optional[NotificationRouter] = None,
     ) -> List[SlackMessage]:
-        return sorted(
-            [
+        router = router or NotificationRouter(list(mappings))
+        # many findings share an account, so each account is looked up once per mapping pass
+        headings: Dict[Tuple[Optional[str], Optional[str]], str] = {}
+        emoji, source = Config.get_slack_emoji(), Config.get_service_name()
+        messages = []
+        for notification in notifications:
+            key = (notification.account.identifier if notification.account else None, notification.region_name)
+            if key not in headings:
+                headings[key] = self.build_heading(org_client, notification.region_name, notification.account)
+            messages.append(
                 SlackMessage(
-                    channels=sorted(NotificationMapper._find_channels(notification, mappings)),
-                    heading=self.build_heading(org_client, notification.region_name, notification.account),
+                    channels=sorted(router.find_channels(notification)),
+                    heading=headings[key],
                     title=notification.item,
                     text=NotificationMapper._create_message_text(notification),
                     color=notification.severity,
-                    emoji=Config.get_slack_emoji(),
-                    source=Config.get_service_name(),
+                    emoji=emoji,
+                    source=source,
                 )
-                for notification in notifications
-            ],
-            key=lambda msg: (msg.heading, msg.title),
-        )
+            )
+        return sorted(messages, key=lambda msg: (msg.heading, msg.title))
 
     def build_heading(self, org_client: AwsOrgClient, region_name: Optional[str], account: Optional[Account]) -> str:
         if region_name is None:
@@ -37,18 +48,6 @@ class NotificationMapper:
             account = org_client.get_account(account_id=account.identifier)
             return f"{account.name} ({account.identifier}) {region_name} {account.slack_handle}"
 
-    @staticmethod
-    def _find_channels(notification: Finding, mappings: Set[NotificationMappingConfig]) -> Set[str]:
-        return {
-            mapping.channel
-            for mapping in mappings
-            if (not mapping.items or notification.item in mapping.items)
-            and (not mapping.accounts or (notification.account and notification.account.identifier in mapping.accounts))
-            and (
-                not mapping.compliance_item_types or notification.compliance_item_type in mapping.compliance_item_types
-            )
-        }
-
     @staticmethod
     def _create_message_text(notification: Finding) -> str:
         findings = "\n".join(sorted(notification.findings))
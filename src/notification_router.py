@@ -0,0 +1,56 @@
+from typing import Dict, FrozenSet, List, Optional, Sequence, Set, Tuple
+
+from src.config.notification_config_bundle import MAPPING_INDEX_FIELDS, MappingIndex
+from src.config.notification_mapping_config import NotificationMappingConfig
+from src.data.finding import Finding
+
+# the position of a field in MAPPING_INDEX_FIELDS and the values a mapping allows for it
+Check = Tuple[int, FrozenSet[str]]
+
+
+class NotificationRouter:
+    def __init__(self, mappings: Sequence[NotificationMappingConfig], index: Optional[MappingIndex] = None) -> None:
+        self._mappings = tuple(mappings)
+        index = index or MappingIndex.build(self._mappings)
+        # each mapping is looked up through its most selective non-empty field, the field with the most distinct values,
+        # and its other non-empty fields are then intersected with the finding's values
+        fields = sorted(MAPPING_INDEX_FIELDS, key=lambda field: -len(index.values[field]))
+        field_order = {field: position for position, field in enumerate(MAPPING_INDEX_FIELDS)}
+        self._unconstrained = frozenset.intersection(*(index.wildcards[field] for field in fields))
+        self._direct: Dict[str, Dict[str, FrozenSet[int]]] = {field: {} for field in fields}
+        self._checked: Dict[str, Dict[str, List[Tuple[int, Tuple[Check, ...]]]]] = {field: {} for field in fields}
+        for position, mapping in enumerate(self._mappings):
+            constrained = [field for field in fields if position not in index.wildcards[field]]
+            if not constrained:
+                continue
+            primary, others = constrained[0], constrained[1:]
+            checks = tuple((field_order[field], getattr(mapping, field)) for field in others)
+            for value in getattr(mapping, primary):
+                if checks:
+                    self._checked[primary].setdefault(value, []).append((position, checks))
+                else:
+                    self._direct[primary][value] = self._direct[primary].get(value, frozenset()) | {position}
+
+    def find_channels(self, finding: Finding) -> Set[str]:
+        return {self._mappings[position].channel for position in self.find_mappings(finding)}
+
+    def find_mappings(self, finding: Finding) -> Set[int]:
+        values = self._values(finding)
+        matches = set(self._unconstrained)
+        for field, value in zip(MAPPING_INDEX_FIELDS, values):
+            if value is None:
+                continue
+            matches |= self._direct[field].get(value, frozenset())
+            for position, checks in self._checked[field].get(value, ()):
+                if all(values[other] in allowed for other, allowed in checks):
+                    matches.add(position)
+        return matches
+
+    @staticmethod
+    def _values(finding: Finding) -> Tuple[Optional[str], ...]:
+        # in the order of MAPPING_INDEX_FIELDS
+        return (
+            finding.item,
+            finding.account.identifier if finding.account else None,
+            finding.compliance_item_type,
+        )
@@ -1,6 +1,9 @@
+import asyncio
 from abc import ABC, abstractmethod
 from typing import Generic, List, Set, TypeVar
 
+from src.notifiers.outbox import OutboxEntry
+
 N = TypeVar("N")
 P = TypeVar("P")
 
@@ -17,3 +20,10 @@ class Notifier(ABC, Generic[N, P]):
     @abstractmethod
     def send(self, notifications: List[N]) -> None:
         pass
+
+    @abstractmethod
+    def replay(self, entry: OutboxEntry) -> None:
+        pass
+
+    async def send_async(self, notifications: List[N]) -> None:
+        await asyncio.to_thread(self.send, notifications)
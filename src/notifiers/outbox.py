@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import json
+import os
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from logging import getLogger
+from tempfile import NamedTemporaryFile
+from typing import Any, Callable, Dict, List
+from uuid import uuid4
+
+from src.clients.aws_s3_client import AwsS3Client
+from src.data.exceptions import ComplianceAlertingException
+
+
+@dataclass(frozen=True)
+class OutboxEntry:
+    notifier: str
+    target: str
+    payload: Dict[str, Any]
+    error: str
+    failed_at: str
+
+    @staticmethod
+    def from_dict(entry: Dict[str, Any]) -> OutboxEntry:
+        return OutboxEntry(
+            notifier=entry["notifier"],
+            target=entry["target"],
+            payload=entry["payload"],
+            error=entry["error"],
+            failed_at=entry["failed_at"],
+        )
+
+
+class Outbox(ABC):
+    def __init__(self, clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc)):
+        self._logger = getLogger(self.__class__.__name__)
+        self._clock = clock
+
+    def put(self, notifier: str, target: str, payload: Dict[str, Any], error: str) -> None:
+        failed_at = self._clock()
+        entry = OutboxEntry(
+            notifier=notifier, target=target, payload=payload, error=error, failed_at=failed_at.isoformat()
+        )
+        key = f"{notifier}/{failed_at.strftime('%Y%m%dT%H%M%S%f')}-{uuid4().hex}.json"
+        try:
+            self._write(key, asdict(entry))
+        except (ComplianceAlertingException, OSError) as err:
+            self._logger.error(f"unable to save {notifier} notification for {target} to the outbox: {err}")
+
+    @abstractmethod
+    def keys(self) -> List[str]:
+        pass
+
+    @abstractmethod
+    def read(self, key: str) -> OutboxEntry:
+        pass
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        pass
+
+    @abstractmethod
+    def _write(self, key: str, entry: Dict[str, Any]) -> None:
+        pass
+
+
+class S3Outbox(Outbox):
+    def __init__(self, s3: AwsS3Client, bucket: str, prefix: str, **kwargs: Any):
+        super().__init__(**kwargs)
+        self._s3 = s3
+        self._bucket = bucket
+        self._prefix = prefix
+
+    def keys(self) -> List[str]:
+        return sorted(key[len(self._prefix) :] for key in self._s3.list_objects(self._bucket, self._prefix))
+
+    def read(self, key: str) -> OutboxEntry:
+        return OutboxEntry.from_dict(self._s3.read_json_object(self._bucket, self._prefix + key))
+
+    def delete(self, key: str) -> None:
+        self._s3.delete_object(self._bucket, self._prefix + key)
+
+    def _write(self, key: str, entry: Dict[str, Any]) -> None:
+        self._s3.write_json_object(self._bucket, self._prefix + key, entry)
+
+
+class DirectoryOutbox(Outbox):
+    def __init__(self, path: str, **kwargs: Any):
+        super().__init__(**kwargs)
+        self._path = path
+
+    def keys(self) -> List[str]:
+        return sorted(
+            os.path.relpath(os.path.join(directory, name), self._path).replace(os.sep, "/")
+            for directory, _, names in os.walk(self._path)
+            for name in names
+            if name.endswith(".json")
+        )
+
+    def read(self, key: str) -> OutboxEntry:
+        with open(os.path.join(self._path, key), "r") as entry_file:
+            return OutboxEntry.from_dict(json.load(entry_file))
+
+    def delete(self, key: str) -> None:
+        os.remove(os.path.join(self._path, key))
+
+    def _write(self, key: str, entry: Dict[str, Any]) -> None:
+        path = os.path.join(self._path, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with NamedTemporaryFile("w", dir=os.path.dirname(path), delete=False, suffix=".tmp") as entry_file:
+            json.dump(entry, entry_file)
+        # a replay running at the same time never reads a partially written entry
+        os.replace(entry_file.name, path)
@@ -1,31 +1,44 @@
 from logging import getLogger
-from typing import Any, Dict, List, Set
+from typing import Any, Dict, List, Optional, Set
 
 import requests
+from src.clients.http_session import get_session
 from src.config.config import Config
-from src.data.exceptions import PagerDutyNotifierException
+from src.config.notification_config_snapshot import NotificationConfigSnapshot
+from src.data.exceptions import CircuitOpenException, PagerDutyNotifierException
 from src.data.pagerduty_event import PagerDutyEvent
 from src.data.pagerduty_payload import PagerDutyPayload
 
 from src.notifiers.notifier import Notifier
+from src.notifiers.outbox import Outbox, OutboxEntry
+from src.notifiers.resilience import build_resilience
 from src.pagerduty_notification_mapper import PagerDutyNotificationMapper
 from src.pagerduty_payload_filter import PagerDutyPayloadFilter
 
 
 class PagerDutyNotifier(Notifier[PagerDutyEvent, PagerDutyPayload]):
-    def __init__(self, config: Config) -> None:
+    def __init__(
+        self,
+        config: Config,
+        notification_config: Optional[NotificationConfigSnapshot] = None,
+        outbox: Optional[Outbox] = None,
+    ) -> None:
         self.config = config
+        self._outbox = outbox
         self._logger = getLogger(self.__class__.__name__)
         self._api_url = config.get_pagerduty_api_url()
-        self._filters_config = config.get_notification_filters()
-        self._mappings_config = config.get_notification_mappings()
+        self._notification_config = notification_config or NotificationConfigSnapshot.load(config)
+        self._resilience = build_resilience("pagerduty")
+        self._session = get_session("pagerduty", Config.get_http_pool_size())
 
     def apply_filters(self, payloads: Set[PagerDutyPayload]) -> Set[PagerDutyPayload]:
-        return PagerDutyPayloadFilter().do_filter(payloads, self.config.get_notification_filters())
+        return PagerDutyPayloadFilter().do_filter(
+            payloads, self._notification_config.filters, compiled_filter=self._notification_config.compiled_filter
+        )
 
     def apply_mappings(self, payloads: Set[PagerDutyPayload]) -> List[PagerDutyEvent]:
         return PagerDutyNotificationMapper(ssm_client=self.config.ssm_client).do_map(
-            payloads, self.config.get_notification_mappings()
+            payloads, self._notification_config.mappings
         )
 
     def send(self, pagerduty_events: List[PagerDutyEvent]) -> None:
@@ -35,6 +48,11 @@ class PagerDutyNotifier(Notifier[PagerDutyEvent, PagerDutyPayload]):
                 self.send_pagerduty_event(event)
             except PagerDutyNotifierException as ex:
                 self._logger.error(f"unable to send event: {event}. Cause: {ex}")
+                if self._outbox:
+                    # the routing key is a secret, so it is left out and fetched again on replay
+                    payload = {key: value for key, value in event.to_dict().items() if key != "routing_key"}
+                    self._outbox.put("pagerduty", str(event.service), payload, str(ex))
+        self._resilience.log_metrics()
 
     @staticmethod
     def _handle_response(response: Dict[str, Any], service: str) -> None:
@@ -45,25 +63,32 @@ class PagerDutyNotifier(Notifier[PagerDutyEvent, PagerDutyPayload]):
                 f"unable to send event to pagerduty service {service}. Errors: {errors}. Exclusions: {exclusions}"
             )
 
-    def _send(self, pagerduty_event: PagerDutyEvent) -> Dict[str, Any]:
-        response = requests.post(
+    def _send(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        return self._resilience.call(lambda: self._post(payload))
+
+    def _post(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        response = self._session.post(
             url=self._api_url,
             headers=self._build_headers(),
-            json=pagerduty_event.to_dict(),
+            json=payload,
             timeout=10,
         )
         response.raise_for_status()
         return dict(response.json())
 
     def send_pagerduty_event(self, pagerduty_event: PagerDutyEvent) -> None:
+        if pagerduty_event.service:
+            self.send_payload(pagerduty_event.to_dict(), pagerduty_event.service)
+
+    def send_payload(self, payload: Dict[str, Any], service: str) -> None:
         try:
-            self._handle_response(
-                self._send(pagerduty_event), pagerduty_event.service
-            ) if pagerduty_event.service else None
-        except requests.RequestException as ex:
-            raise PagerDutyNotifierException(
-                f"unable to event to pagerduty service {pagerduty_event.service}: {ex}"
-            ) from None
+            self._handle_response(self._send(payload), service)
+        except (requests.RequestException, CircuitOpenException) as ex:
+            raise PagerDutyNotifierException(f"unable to event to pagerduty service {service}: {ex}") from None
+
+    def replay(self, entry: OutboxEntry) -> None:
+        routing_key = PagerDutyNotificationMapper(ssm_client=self.config.ssm_client).get_routing_key(entry.target)
+        self.send_payload({**entry.payload, "routing_key": routing_key}, entry.target)
 
     def _build_headers(self) -> Dict[str, str]:
         return {"Accept": "application/json", "Content-Type": "application/json"}
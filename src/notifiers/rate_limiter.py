@@ -0,0 +1,66 @@
+from threading import Lock
+from time import monotonic, sleep
+from typing import Callable, Dict, Iterable, List, Optional
+
+
+class TokenBucket:
+    def __init__(self, per_minute: int, now: float):
+        self._rate = per_minute / 60
+        # allows a burst of up to one second worth of messages, and at least one message
+        self._capacity = max(1.0, self._rate)
+        self._tokens = self._capacity
+        self._updated = now
+
+    def reserve(self, now: float) -> float:
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+        self._tokens -= 1
+        return max(0.0, -self._tokens / self._rate)
+
+    def release(self) -> None:
+        self._tokens += 1
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        per_minute: Optional[int] = None,
+        channel_per_minute: Optional[int] = None,
+        clock: Callable[[], float] = monotonic,
+        sleep: Callable[[float], None] = sleep,
+    ):
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = Lock()
+        self._global = TokenBucket(per_minute, clock()) if per_minute else None
+        self._channel_per_minute = channel_per_minute
+        self._channels: Dict[str, TokenBucket] = {}
+        self._paused_until = 0.0
+
+    def acquire(self, channels: Iterable[str], deadline: Optional[float] = None) -> bool:
+        # returns False, without waiting or using up a token, when the wait would end after the deadline
+        with self._lock:
+            now = self._clock()
+            buckets = self._buckets(channels)
+            waits = [bucket.reserve(now) for bucket in buckets]
+            wait = max([self._paused_until - now, *waits])
+            if wait > 0 and deadline is not None and now + wait > deadline:
+                for bucket in buckets:
+                    bucket.release()
+                return False
+        if wait > 0:
+            self._sleep(wait)
+        return True
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            self._paused_until = max(self._paused_until, self._clock() + seconds)
+
+    def _buckets(self, channels: Iterable[str]) -> List[TokenBucket]:
+        buckets = [self._global] if self._global else []
+        if self._channel_per_minute:
+            for channel in channels:
+                if channel not in self._channels:
+                    self._channels[channel] = TokenBucket(self._channel_per_minute, self._clock())
+                buckets.append(self._channels[channel])
+        return buckets
@@ -0,0 +1,159 @@
+import random
+from collections import deque
+from logging import getLogger
+from threading import Lock
+from time import monotonic, sleep
+from typing import Callable, Deque, Optional, TypeVar
+
+import requests
+
+from src.config.config import Config
+from src.data.exceptions import CircuitOpenException
+
+R = TypeVar("R")
+
+RETRY_BASE_SECONDS = 0.2
+RETRY_CAP_SECONDS = 2.0
+CIRCUIT_WINDOW = 10
+
+
+def is_failure(err: Exception) -> bool:
+    if isinstance(err, requests.HTTPError):
+        return err.response is not None and err.response.status_code >= 500
+    return isinstance(err, (requests.ConnectionError, requests.Timeout))
+
+
+def is_retryable(err: Exception) -> bool:
+    # a read timeout is not retried: the api may already have accepted the request, and sending it again may duplicate
+    # the slack message or the PagerDuty incident (a connect timeout is also a ConnectionError)
+    if isinstance(err, requests.HTTPError):
+        return is_failure(err)
+    return isinstance(err, requests.ConnectionError)
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        error_rate: float,
+        open_seconds: float,
+        window: int = CIRCUIT_WINDOW,
+        clock: Callable[[], float] = monotonic,
+    ):
+        self._error_rate = error_rate
+        self._open_seconds = open_seconds
+        self._clock = clock
+        self._lock = Lock()
+        self._outcomes: Deque[bool] = deque(maxlen=window)
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._total_open_seconds = 0.0
+        self.rejected = 0
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+    @property
+    def open_seconds(self) -> float:
+        with self._lock:
+            current = self._clock() - self._opened_at if self._opened_at is not None else 0.0
+            return self._total_open_seconds + current
+
+    def before_call(self) -> None:
+        with self._lock:
+            if self._opened_at is None:
+                return
+            # once open for long enough, a single trial call decides whether the circuit closes again
+            if self._clock() - self._opened_at < self._open_seconds or self._trial_in_flight:
+                self.rejected += 1
+                raise CircuitOpenException("circuit open after too many failures")
+            self._trial_in_flight = True
+
+    def record(self, success: Optional[bool]) -> None:
+        # an outcome of None says nothing about the api's health and only releases a trial call
+        with self._lock:
+            now = self._clock()
+            if self._opened_at is not None:
+                if self._trial_in_flight:
+                    self._trial_in_flight = False
+                    if success is not None:
+                        self._total_open_seconds += now - self._opened_at
+                        self._opened_at = None if success else now
+                        self._outcomes.clear()
+                return
+            if success is None:
+                return
+            self._outcomes.append(success)
+            failures = self._outcomes.count(False)
+            if len(self._outcomes) == self._outcomes.maxlen and failures >= self._error_rate * len(self._outcomes):
+                self._opened_at = now
+
+
+class Resilience:
+    def __init__(
+        self,
+        name: str,
+        breaker: CircuitBreaker,
+        max_attempts: int = 3,
+        uniform: Callable[[float, float], float] = random.uniform,
+        sleep: Callable[[float], None] = sleep,
+    ):
+        self._logger = getLogger(f"{self.__class__.__name__}.{name}")
+        self._name = name
+        self._breaker = breaker
+        self._max_attempts = max_attempts
+        self._uniform = uniform
+        self._sleep = sleep
+        self._lock = Lock()
+        self.retries = 0
+
+    def call(self, fn: Callable[[], R]) -> R:
+        delay = RETRY_BASE_SECONDS
+        attempt = 1
+        while True:
+            self._breaker.before_call()
+            outcome: Optional[bool] = None
+            try:
+                result = fn()
+                outcome = True
+            except Exception as err:
+                if is_failure(err):
+                    outcome = False
+                elif isinstance(err, requests.HTTPError):
+                    # the api answered, so a client error does not count against its health
+                    outcome = True
+                error = err
+                if not is_retryable(err):
+                    raise
+            finally:
+                # always recorded, so that a trial call can never keep the circuit open
+                self._breaker.record(outcome)
+            if outcome:
+                return result
+            if attempt >= self._max_attempts or self._breaker.is_open:
+                raise error
+            attempt += 1
+            # decorrelated jitter: each delay is drawn between the base and three times the previous delay
+            delay = min(RETRY_CAP_SECONDS, self._uniform(RETRY_BASE_SECONDS, delay * 3))
+            with self._lock:
+                self.retries += 1
+            self._sleep(delay)
+
+    def log_metrics(self) -> None:
+        open_seconds = self._breaker.open_seconds
+        if self.retries or self._breaker.rejected or open_seconds:
+            self._logger.info(
+                f"{self._name} calls retried {self.retries} times, {self._breaker.rejected} failed fast "
+                f"while the circuit was open, circuit open for {open_seconds:.1f}s"
+            )
+
+
+def build_resilience(name: str) -> Resilience:
+    return Resilience(
+        name,
+        breaker=CircuitBreaker(
+            error_rate=Config.get_notifier_circuit_error_percent() / 100,
+            open_seconds=Config.get_notifier_circuit_open_seconds(),
+        ),
+        max_attempts=Config.get_notifier_max_attempts(),
+    )
@@ -1,38 +1,129 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from logging import getLogger
-from typing import Any, Dict, List, Set
+from time import monotonic
+from typing import Any, Callable, Dict, List, Optional, Set
 
 import requests
 
+from src.clients.http_session import get_session
 from src.config.config import Config
-from src.data.exceptions import SlackNotifierException
+from src.config.notification_config_snapshot import NotificationConfigSnapshot
+from src.data.exceptions import CircuitOpenException, SlackNotifierException, SlackRateLimitedException
 from src.data.finding import Finding
 
 from src.data.slack_message import SlackMessage
 from src.findings_filter import FindingsFilter
 from src.notification_mapper import NotificationMapper
 from src.notifiers.notifier import Notifier
+from src.notifiers.outbox import Outbox, OutboxEntry
+from src.notifiers.resilience import build_resilience
+from src.notifiers.rate_limiter import RateLimiter
+from src.slack_message_coalescer import SlackMessageCoalescer
+from src.slack_text_chunker import SlackTextChunker
+
+DEFAULT_RETRY_AFTER_SECONDS = 1.0
+# time left to the rest of the invocation, including the last request, before the lambda times out
+LAMBDA_TIMEOUT_MARGIN_SECONDS = 15.0
 
 
 class SlackNotifier(Notifier[SlackMessage, Finding]):
-    def __init__(self, config: Config):
+    def __init__(
+        self,
+        config: Config,
+        notification_config: Optional[NotificationConfigSnapshot] = None,
+        outbox: Optional[Outbox] = None,
+        remaining_millis: Optional[Callable[[], int]] = None,
+    ):
         self._logger = getLogger(self.__class__.__name__)
+        self._outbox = outbox
         self._org_client = config.org_client
         self._notifier_config = config.get_slack_notifier_config()
-        self._filters_config = config.get_notification_filters()
-        self._mappings_config = config.get_notification_mappings()
+        self._notification_config = notification_config or NotificationConfigSnapshot.load(config)
+        self._delivery_concurrency = Config.get_slack_delivery_concurrency()
+        self._resilience = build_resilience("slack")
+        self._session = get_session("slack", max(Config.get_http_pool_size(), self._delivery_concurrency))
+        self._rate_limiter = RateLimiter(
+            per_minute=Config.get_slack_messages_per_minute(),
+            channel_per_minute=Config.get_slack_channel_messages_per_minute(),
+        )
+        self._remaining_millis = remaining_millis
+        self._start_retry_budget()
+
+    def _start_retry_budget(self) -> None:
+        budget = Config.get_slack_retry_budget().total_seconds()
+        if self._remaining_millis:
+            budget = min(budget, self._remaining_millis() / 1000 - LAMBDA_TIMEOUT_MARGIN_SECONDS)
+        self._retry_deadline = monotonic() + budget
 
     def send_messages(self, messages: List[SlackMessage]) -> None:
-        for message in messages:
+        self._start_retry_budget()
+        workers = min(len(messages), self._delivery_concurrency)
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                failures = list(executor.map(self._try_send_message, messages))
+        else:
+            failures = [self._try_send_message(message) for message in messages]
+        self._log_failures(messages, failures)
+        self._resilience.log_metrics()
+
+    async def send_async(self, messages: List[SlackMessage]) -> None:
+        self._logger.debug("Sending the following messages: %s", messages)
+        self._start_retry_budget()
+        semaphore = asyncio.Semaphore(self._delivery_concurrency)
+
+        async def deliver(message: SlackMessage) -> Optional[SlackNotifierException]:
+            async with semaphore:
+                return await asyncio.to_thread(self._try_send_message, message)
+
+        self._log_failures(messages, await asyncio.gather(*[deliver(message) for message in messages]))
+        self._resilience.log_metrics()
+
+    def _log_failures(self, messages: List[SlackMessage], failures: List[Optional[SlackNotifierException]]) -> None:
+        # logged once every message is sent so that the log follows the order of the messages
+        for message, failure in zip(messages, failures):
+            if failure:
+                self._logger.error(f"unable to send message: {message}. Cause: {failure}")
+                if self._outbox:
+                    self._outbox.put("slack", str(message.channels), message.to_dict(), str(failure))
+
+    def _try_send_message(self, message: SlackMessage) -> Optional[SlackNotifierException]:
+        return self._try_send_payload(message.to_dict()) if message.channels else None
+
+    def _try_send_payload(self, payload: Dict[str, Any]) -> Optional[SlackNotifierException]:
+        channels = payload["channelLookup"]["slackChannels"]
+        while True:
+            if not self._rate_limiter.acquire(channels, deadline=self._retry_deadline):
+                return SlackRateLimitedException(
+                    f"unable to send message to channels {channels}: throttled past the retry budget", retry_after=0.0
+                )
             try:
-                self.send_message(message)
+                self.send_payload(payload)
+            except SlackRateLimitedException as ex:
+                if monotonic() + ex.retry_after > self._retry_deadline:
+                    return ex
+                self._logger.info(f"rate limited by slack, retrying in {ex.retry_after}s: {channels}")
+                self._rate_limiter.pause(ex.retry_after)
+                continue
             except SlackNotifierException as ex:
-                self._logger.error(f"unable to send message: {message}. Cause: {ex}")
+                return ex
+            return None
 
     def send_message(self, message: SlackMessage) -> None:
+        if message.channels:
+            self.send_payload(message.to_dict())
+
+    def send_payload(self, payload: Dict[str, Any]) -> None:
+        channels = payload["channelLookup"]["slackChannels"]
         try:
-            self._handle_response(self._send(message), message.channels) if message.channels else None
-        except requests.RequestException as ex:
-            raise SlackNotifierException(f"unable to send message to channels {message.channels}: {ex}") from None
+            self._handle_response(self._send(payload, channels), channels)
+        except (requests.RequestException, CircuitOpenException) as ex:
+            raise SlackNotifierException(f"unable to send message to channels {channels}: {ex}") from None
+
+    def replay(self, entry: OutboxEntry) -> None:
+        failure = self._try_send_payload(entry.payload)
+        if failure:
+            raise failure
 
     @staticmethod
     def _handle_response(response: Dict[str, Any], channels: List[str]) -> None:
@@ -43,25 +134,53 @@ class SlackNotifier(Notifier[SlackMessage, Finding]):
                 f"unable to send message to channels {channels}. Errors: {errors}. Exclusions: {exclusions}"
             )
 
-    def _send(self, message: SlackMessage) -> Dict[str, Any]:
-        response = requests.post(
+    def _send(self, payload: Dict[str, Any], channels: List[str]) -> Dict[str, Any]:
+        return self._resilience.call(lambda: self._post(payload, channels))
+
+    def _post(self, payload: Dict[str, Any], channels: List[str]) -> Dict[str, Any]:
+        response = self._session.post(
             url=self._notifier_config.api_url,
             headers=self._build_headers(),
-            json=message.to_dict(),
+            json=payload,
             timeout=10,
         )
+        if response.status_code == 429:
+            raise SlackRateLimitedException(
+                f"unable to send message to channels {channels}: rate limited",
+                retry_after=self._retry_after(response.headers.get("Retry-After")),
+            )
         response.raise_for_status()
         return dict(response.json())
 
+    @staticmethod
+    def _retry_after(header: Optional[str]) -> float:
+        try:
+            return max(0.0, float(header or DEFAULT_RETRY_AFTER_SECONDS))
+        except ValueError:
+            return DEFAULT_RETRY_AFTER_SECONDS
+
     def _build_headers(self) -> Dict[str, str]:
         credentials = f"{self._notifier_config.api_v2_key}"
         return {"Content-Type": "application/json", "Authorization": credentials}
 
     def apply_filters(self, findings: Set[Finding]) -> Set[Finding]:
-        return FindingsFilter().do_filter(findings, self._filters_config)
+        return FindingsFilter().do_filter(
+            findings, self._notification_config.filters, compiled_filter=self._notification_config.compiled_filter
+        )
 
     def apply_mappings(self, findings: Set[Finding]) -> List[SlackMessage]:
-        return NotificationMapper().do_map(findings, self._mappings_config, self._org_client)
+        messages = NotificationMapper().do_map(
+            findings, self._notification_config.mappings, self._org_client, router=self._notification_config.router
+        )
+        chunker = SlackTextChunker()
+        messages = chunker.split(messages)
+        if chunker.chunks:
+            self._logger.info(f"split oversized slack message text into {chunker.chunks} messages")
+        if not Config.get_coalesce_slack_messages():
+            return messages
+        coalesced = SlackMessageCoalescer().coalesce(messages)
+        self._logger.info(f"coalesced {len(messages)} slack messages into {len(coalesced)}")
+        return coalesced
 
     def send(self, notifications: List[SlackMessage]) -> None:
         self._logger.debug("Sending the following messages: %s", notifications)
@@ -1,5 +1,4 @@
-from dataclasses import dataclass
-from typing import List, Set
+from typing import Dict, List, Set
 
 
 from src.clients.aws_ssm_client import AwsSsmClient
@@ -13,12 +12,6 @@ EVENT_ACTION = "trigger"
 PAGERDUTY_SSM_PARAMETER_STORE_PREFIX = "/service_accounts/pagerduty/"
 
 
-@dataclass(unsafe_hash=True)
-class PagerDutyService:
-    name: str
-    routing_key: str
-
-
 class PagerDutyNotificationMapper:
     def __init__(self, ssm_client: AwsSsmClient) -> None:
         self.ssm_client = ssm_client
@@ -28,36 +21,40 @@ class PagerDutyNotificationMapper:
         notifications: Set[PagerDutyPayload],
         mappings: Set[NotificationMappingConfig],
     ) -> List[PagerDutyEvent]:
+        services = {notification: self._find_services(notification, mappings) for notification in notifications}
+        routing_keys = self._get_pagerduty_service_routing_keys(set().union(*services.values()))
         events = [
             PagerDutyEvent(
                 payload=notification,
-                service=service.name,
-                routing_key=service.routing_key,
+                service=service,
+                routing_key=routing_keys[service],
                 event_action="trigger",
                 client=CLIENT,
                 client_url=CLIENT_URL,
                 links=[],
                 images=[],
             )
-            for notification in notifications
-            for service in self._find_routing_keys(notification, mappings)
+            for notification, notification_services in services.items()
+            for service in notification_services
         ]
         return sorted(events, key=lambda msg: (msg.payload.source, msg.payload.component, msg.routing_key))
 
+    def get_routing_key(self, service: str) -> str:
+        return self._get_pagerduty_service_routing_keys({service})[service]
+
     def _pagerduty_ssm_parameter_name(self, service: str) -> str:
         return f"{PAGERDUTY_SSM_PARAMETER_STORE_PREFIX}{service}".replace(" ", "_").lower()
 
-    def _get_pagerduty_service_routing_key(self, service: str) -> str:
-        return self.ssm_client.get_parameter(parameter_name=self._pagerduty_ssm_parameter_name(service))
+    def _get_pagerduty_service_routing_keys(self, services: Set[str]) -> Dict[str, str]:
+        if not services:
+            return {}
+        parameter_names = {service: self._pagerduty_ssm_parameter_name(service) for service in services}
+        routing_keys = self.ssm_client.get_parameters(parameter_names=parameter_names.values())
+        return {service: routing_keys[parameter_name] for service, parameter_name in parameter_names.items()}
 
-    def _find_routing_keys(
-        self, notification: PagerDutyPayload, mappings: Set[NotificationMappingConfig]
-    ) -> Set[PagerDutyService]:
+    def _find_services(self, notification: PagerDutyPayload, mappings: Set[NotificationMappingConfig]) -> Set[str]:
         return {
-            PagerDutyService(
-                name=mapping.pagerduty_service,
-                routing_key=self._get_pagerduty_service_routing_key(mapping.pagerduty_service),
-            )
+            mapping.pagerduty_service
             for mapping in mappings
             if mapping.pagerduty_service
             and (not mapping.accounts or (notification.account and notification.account.identifier in mapping.accounts))
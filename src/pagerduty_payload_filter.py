@@ -1,10 +1,22 @@
-from typing import Set
+from typing import Optional, Set
 
+from src.compiled_filter import CompiledFilter
 from src.config.notification_filter_config import NotificationFilterConfig
 from src.data.pagerduty_payload import PagerDutyPayload
 
 
 class PagerDutyPayloadFilter:
     @staticmethod
-    def do_filter(payloads: Set[PagerDutyPayload], filters: Set[NotificationFilterConfig]) -> Set[PagerDutyPayload]:
-        return {n for n in payloads if n.component not in [f.item for f in filters]}
+    def do_filter(
+        payloads: Set[PagerDutyPayload],
+        filters: Set[NotificationFilterConfig],
+        compiled_filter: Optional[CompiledFilter] = None,
+    ) -> Set[PagerDutyPayload]:
+        compiled_filter = compiled_filter or CompiledFilter(filters)
+        return {
+            n
+            for n in payloads
+            if not compiled_filter.suppresses(
+                n.component, n.account.identifier if n.account else None, n.compliance_item_type
+            )
+        }
@@ -0,0 +1,58 @@
+import json
+from typing import Any, Dict, List, Tuple
+
+from src.data.slack_message import SlackMessage
+
+# slack advises against more than 20 attachments per message and limits messages to 40,000 characters
+MAX_ATTACHMENTS = 20
+MAX_PAYLOAD_BYTES = 40_000
+
+
+class SlackMessageCoalescer:
+    def __init__(self, max_attachments: int = MAX_ATTACHMENTS, max_payload_bytes: int = MAX_PAYLOAD_BYTES):
+        self._max_attachments = max_attachments
+        self._max_payload_bytes = max_payload_bytes
+
+    def coalesce(self, messages: List[SlackMessage]) -> List[SlackMessage]:
+        groups: Dict[Tuple[Tuple[str, ...], str], List[SlackMessage]] = {}
+        for message in messages:
+            groups.setdefault((tuple(message.channels), message.heading), []).append(message)
+        return [batch for group in groups.values() for batch in self._pack(group)]
+
+    def _pack(self, group: List[SlackMessage]) -> List[SlackMessage]:
+        empty_size = _size({**group[0].to_dict(), "attachments": []})
+        batches: List[List[SlackMessage]] = [[]]
+        count, size = 0, empty_size
+        for message in group:
+            # each attachment after the first also adds a ", " separator
+            message_size = sum(_size(attachment) + 2 for attachment in message.attachments)
+            if batches[-1] and (
+                count + len(message.attachments) > self._max_attachments
+                or size + message_size > self._max_payload_bytes
+            ):
+                batches.append([])
+                count, size = 0, empty_size
+            batches[-1].append(message)
+            count += len(message.attachments)
+            size += message_size
+        return [self._merge(batch) for batch in batches]
+
+    @staticmethod
+    def _merge(batch: List[SlackMessage]) -> SlackMessage:
+        if len(batch) == 1:
+            return batch[0]
+        first = batch[0]
+        return SlackMessage(
+            channels=first.channels,
+            heading=first.heading,
+            title=first.title,
+            text=first.text,
+            color=first.color,
+            emoji=first.emoji,
+            source=first.source,
+            attachments=[attachment for message in batch for attachment in message.attachments],
+        )
+
+
+def _size(obj: Any) -> int:
+    return len(json.dumps(obj).encode("utf-8"))
@@ -0,0 +1,69 @@
+from typing import Iterator, List
+
+from src.data.slack_message import SlackMessage
+
+# leaves room for the heading, title and envelope within slack's 40,000 character message limit
+MAX_TEXT_BYTES = 30_000
+CODE_FENCE = "```"
+
+
+class SlackTextChunker:
+    def __init__(self, max_text_bytes: int = MAX_TEXT_BYTES):
+        # a chunk may need to close a code block and the next one to reopen it
+        self._budget = max_text_bytes - 2 * len(CODE_FENCE)
+        self._max_text_bytes = max_text_bytes
+        self.chunks = 0
+
+    def split(self, messages: List[SlackMessage]) -> List[SlackMessage]:
+        return [chunk for message in messages for chunk in self._split_message(message)]
+
+    def _split_message(self, message: SlackMessage) -> List[SlackMessage]:
+        if len(message.text.encode("utf-8")) <= self._max_text_bytes:
+            return [message]
+        texts = self._split_text(message.text)
+        self.chunks += len(texts)
+        return [
+            SlackMessage(
+                channels=message.channels,
+                heading=message.heading,
+                title=f"{message.title} ({index}/{len(texts)})",
+                text=text,
+                color=message.color,
+                emoji=message.emoji,
+                source=message.source,
+            )
+            for index, text in enumerate(texts, start=1)
+        ]
+
+    def _split_text(self, text: str) -> List[str]:
+        texts: List[str] = []
+        lines: List[str] = []
+        size, in_code, opened_in_code = 0, False, False
+        for line in self._lines(text):
+            line_size = len(line.encode("utf-8")) + 1
+            if lines and size + line_size > self._budget:
+                texts.append(_join(lines, opened_in_code, in_code))
+                lines, size, opened_in_code = [], 0, in_code
+            lines.append(line)
+            size += line_size
+            if line.count(CODE_FENCE) % 2:
+                in_code = not in_code
+        texts.append(_join(lines, opened_in_code, in_code))
+        return texts
+
+    def _lines(self, text: str) -> Iterator[str]:
+        for line in text.split("\n"):
+            data = line.encode("utf-8")
+            while len(data) > self._budget:
+                cut = self._budget
+                # never cut a multi-byte character in half
+                while data[cut] & 0xC0 == 0x80:
+                    cut -= 1
+                yield data[:cut].decode("utf-8")
+                data = data[cut:]
+            yield data.decode("utf-8")
+
+
+def _join(lines: List[str], opened_in_code: bool, in_code: bool) -> str:
+    text = "\n".join(lines)
+    return f"{CODE_FENCE if opened_in_code else ''}{text}{CODE_FENCE if in_code else ''}"
@@ -0,0 +1,63 @@
+"""Compares CompiledFilter with testing every glob and regex filter against every item.
+
+Run with: python -m tests.benchmarks.benchmark_compiled_filter [items] [patterns]
+"""
+
+import random
+import re
+import sys
+from fnmatch import fnmatchcase
+from time import perf_counter
+from typing import List, Optional, Pattern, Set, Tuple
+
+from src.compiled_filter import CompiledFilter
+from src.config.notification_filter_config import NotificationFilterConfig
+
+
+def linear_suppresses(item: str, filters: List[Tuple[NotificationFilterConfig, Optional[Pattern[str]]]]) -> bool:
+    return any(
+        item == f.item
+        or (f.item_glob is not None and fnmatchcase(item, f.item_glob))
+        or (regex is not None and regex.fullmatch(item) is not None)
+        for f, regex in filters
+    )
+
+
+def build_filters(count: int) -> Set[NotificationFilterConfig]:
+    return (
+        {NotificationFilterConfig(item=f"bucket-{index}", reason="exact") for index in range(count)}
+        | {NotificationFilterConfig(item_glob=f"team-{index}-*-logs", reason="glob") for index in range(count)}
+        | {NotificationFilterConfig(item_regex=f"tmp-{index}-[0-9]+", reason="regex") for index in range(count)}
+    )
+
+
+def build_items(count: int, patterns: int, rng: random.Random) -> List[str]:
+    templates = ["bucket-{}", "team-{}-bucket-logs", "tmp-{}-123", "other-{}"]
+    return [rng.choice(templates).format(rng.randrange(2 * patterns)) for _ in range(count)]
+
+
+def main(item_count: int = 10_000, pattern_count: int = 1_000) -> None:
+    rng = random.Random(0)
+    filters = build_filters(pattern_count)
+    items = build_items(item_count, pattern_count, rng)
+    sample = items[: max(1, item_count // 100)]
+
+    start = perf_counter()
+    precompiled = [(f, re.compile(f.item_regex) if f.item_regex else None) for f in filters]
+    linear = [linear_suppresses(item, precompiled) for item in sample]
+    linear_seconds = (perf_counter() - start) * item_count / len(sample)
+
+    start = perf_counter()
+    compiled_filter = CompiledFilter(filters)
+    build_seconds = perf_counter() - start
+    compiled = [compiled_filter.match(item) is not None for item in items]
+    compiled_seconds = perf_counter() - start
+
+    assert linear == compiled[: len(sample)], "compiled filter and linear scan disagree"
+    print(f"{item_count} items x {len(filters)} filters")
+    print(f"linear scan:     {linear_seconds * 1000:.1f}ms (extrapolated from {len(sample)} items)")
+    print(f"compiled filter: {compiled_seconds * 1000:.1f}ms (compiled in {build_seconds * 1000:.1f}ms)")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
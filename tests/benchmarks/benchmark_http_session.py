@@ -0,0 +1,64 @@
+"""Compares posting each message with requests.post against a pooled session, using a local stub http server.
+
+Run with: python -m tests.benchmarks.benchmark_http_session [messages] [latency-ms]
+
+The stub server sleeps for latency-ms before accepting each new connection to stand in for the tcp and tls
+handshakes paid to the slack proxy or the PagerDuty events api; requests on an open connection are answered at once.
+"""
+
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+from time import perf_counter
+from typing import Any, Callable
+
+import requests
+
+from src.clients.http_session import get_session
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    handshake_seconds = 0.0
+
+    def setup(self) -> None:
+        time.sleep(self.handshake_seconds)
+        super().setup()
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers["Content-Length"]))
+        body = b'{"errors": [], "exclusions": []}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+def measure(name: str, post: Callable[..., requests.Response], url: str, count: int) -> None:
+    start = perf_counter()
+    for index in range(count):
+        post(url=url, json={"text": f"message {index}"}, timeout=10).raise_for_status()
+    elapsed = perf_counter() - start
+    print(f"{name}: {elapsed * 1000 / count:.2f}ms per message ({count} messages in {elapsed * 1000:.0f}ms)")
+
+
+def main(message_count: int = 200, latency_ms: float = 20) -> None:
+    StubHandler.handshake_seconds = latency_ms / 1000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+    try:
+        measure("requests.post", requests.post, url, message_count)
+        measure("pooled session", get_session("benchmark").post, url, message_count)
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:3]])
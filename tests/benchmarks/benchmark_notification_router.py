@@ -0,0 +1,78 @@
+"""Compares NotificationRouter with a linear scan of every mapping for every finding.
+
+Run with: python -m tests.benchmarks.benchmark_notification_router [findings] [mappings]
+"""
+
+import random
+import sys
+from time import perf_counter
+from typing import List, Set
+
+from src.config.notification_mapping_config import NotificationMappingConfig
+from src.data.account import Account
+from src.data.finding import Finding
+from src.notification_router import NotificationRouter
+
+
+def linear_find_channels(notification: Finding, mappings: List[NotificationMappingConfig]) -> Set[str]:
+    return {
+        mapping.channel
+        for mapping in mappings
+        if (not mapping.items or notification.item in mapping.items)
+        and (not mapping.accounts or (notification.account and notification.account.identifier in mapping.accounts))
+        and (not mapping.compliance_item_types or notification.compliance_item_type in mapping.compliance_item_types)
+    }
+
+
+def build_mappings(count: int, rng: random.Random) -> List[NotificationMappingConfig]:
+    # mostly team mappings scoped to a few accounts, some item and type mappings and a couple of catch-all channels
+    mappings = [NotificationMappingConfig(channel="central"), NotificationMappingConfig(channel="audit")]
+    for index in range(count - len(mappings)):
+        kind = rng.random()
+        mappings.append(
+            NotificationMappingConfig(
+                channel=f"team-{index}",
+                accounts=[f"{rng.randrange(2000):012}" for _ in range(rng.randint(1, 5))] if kind < 0.8 else None,
+                items=[f"bucket-{rng.randrange(20000)}" for _ in range(rng.randint(1, 3))] if kind >= 0.9 else None,
+                compliance_item_types=[rng.choice(["s3_bucket", "iam_access_key", "vpc"])] if 0.8 <= kind else None,
+            )
+        )
+    return mappings
+
+
+def build_findings(count: int, rng: random.Random) -> List[Finding]:
+    return [
+        Finding(
+            compliance_item_type=rng.choice(["s3_bucket", "iam_access_key", "vpc"]),
+            item=f"bucket-{rng.randrange(20000)}",
+            account=Account(identifier=f"{rng.randrange(2000):012}"),
+            findings={"a finding"},
+        )
+        for _ in range(count)
+    ]
+
+
+def main(finding_count: int = 10_000, mapping_count: int = 500) -> None:
+    rng = random.Random(0)
+    mappings = build_mappings(mapping_count, rng)
+    findings = build_findings(finding_count, rng)
+
+    start = perf_counter()
+    linear = [linear_find_channels(finding, mappings) for finding in findings]
+    linear_seconds = perf_counter() - start
+
+    start = perf_counter()
+    router = NotificationRouter(mappings)
+    build_seconds = perf_counter() - start
+    routed = [router.find_channels(finding) for finding in findings]
+    routed_seconds = perf_counter() - start
+
+    assert linear == routed, "router and linear scan disagree"
+    print(f"{finding_count} findings x {mapping_count} mappings")
+    print(f"linear scan: {linear_seconds * 1000:.1f}ms")
+    print(f"router:      {routed_seconds * 1000:.1f}ms (index built in {build_seconds * 1000:.1f}ms)")
+    print(f"speedup:     {linear_seconds / routed_seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
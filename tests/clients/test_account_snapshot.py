@@ -0,0 +1,82 @@
+import json
+import os
+from datetime import datetime, timezone
+from typing import Any
+
+import boto3
+from moto import mock_aws
+
+from src.clients.account_snapshot import AccountSnapshotEntry, FileAccountSnapshotStore, S3AccountSnapshotStore
+from src.clients.aws_s3_client import AwsS3Client
+from src.data.account import Account
+
+FETCHED_AT = datetime(2024, 1, 1, 12, 30, tzinfo=timezone.utc)
+ENTRIES = {
+    "111": AccountSnapshotEntry(Account("111", "account-a", "@team-a"), FETCHED_AT),
+    "222": AccountSnapshotEntry(Account("222", "account-b", "owning-team-not-found"), FETCHED_AT),
+}
+
+
+def test_save_and_load(tmp_path: Any) -> None:
+    store = FileAccountSnapshotStore(str(tmp_path / "accounts.json"))
+    store.save(ENTRIES)
+
+    loaded = store.load()
+
+    assert ENTRIES == loaded
+    assert ["account-a", "account-b"] == [entry.account.name for entry in loaded.values()]
+    assert ["@team-a", "owning-team-not-found"] == [entry.account.slack_handle for entry in loaded.values()]
+    assert [] == [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+
+def test_load_missing_snapshot(tmp_path: Any, caplog: Any) -> None:
+    assert {} == FileAccountSnapshotStore(str(tmp_path / "missing.json")).load()
+    assert "" == caplog.text
+
+
+def test_load_snapshot_with_other_version(tmp_path: Any) -> None:
+    path = tmp_path / "accounts.json"
+    path.write_text(json.dumps({"version": 0, "accounts": {"111": {"name": "a"}}}))
+
+    assert {} == FileAccountSnapshotStore(str(path)).load()
+
+
+def test_load_corrupt_snapshot(tmp_path: Any, caplog: Any) -> None:
+    path = tmp_path / "accounts.json"
+    path.write_text('{"version": 1, "accounts": {"111": ')
+
+    assert {} == FileAccountSnapshotStore(str(path)).load()
+    assert "unable to load account snapshot" in caplog.text
+
+
+def test_save_failure_is_logged(tmp_path: Any, caplog: Any) -> None:
+    FileAccountSnapshotStore(str(tmp_path / "not-a-directory" / "accounts.json")).save(ENTRIES)
+
+    assert "unable to save account snapshot" in caplog.text
+
+
+@mock_aws
+def test_save_and_load_from_s3(caplog: Any) -> None:
+    boto_s3 = boto3.client("s3", region_name="us-east-1")
+    boto_s3.create_bucket(Bucket="config-bucket")
+    store = S3AccountSnapshotStore(AwsS3Client(boto_s3), "config-bucket", "snapshots/accounts.json")
+
+    assert {} == store.load()
+    assert "" == caplog.text
+
+    store.save(ENTRIES)
+
+    assert ENTRIES == store.load()
+
+
+@mock_aws
+def test_s3_failures_are_logged(caplog: Any) -> None:
+    store = S3AccountSnapshotStore(
+        AwsS3Client(boto3.client("s3", region_name="us-east-1")), "missing-bucket", "accounts.json"
+    )
+
+    assert {} == store.load()
+    store.save(ENTRIES)
+
+    assert "unable to load account snapshot 's3://missing-bucket/accounts.json'" in caplog.text
+    assert "unable to save account snapshot 's3://missing-bucket/accounts.json'" in caplog.text
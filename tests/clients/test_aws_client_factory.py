@@ -1,3 +1,7 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from threading import Event
+from typing import Any, Dict
 from unittest import TestCase
 from unittest.mock import Mock, call, patch
 
@@ -38,6 +42,32 @@ class TestAwsClientFactory(TestCase):
         with patch.object(AwsClientFactory, "_get_client", side_effect=_get_client):
             self.assertEqual(boto, AwsClientFactory().get_org_client("org-acc", "org-role")._org)
 
+    def test_lazy_clients_are_built_on_first_use(self) -> None:
+        boto_client = Mock(get_parameter=Mock(return_value={"Parameter": {"Value": "the-value"}}))
+        factory = AwsClientFactory(lazy=True)
+
+        with patch.object(AwsClientFactory, "_get_client", return_value=boto_client) as get_client:
+            s3_client = factory.get_s3_client("an-account", "s3-role")
+            ssm_client = factory.get_ssm_client("an-account", "ssm-role")
+            factory.get_org_client("org-account", "org-role")
+            get_client.assert_not_called()
+
+            self.assertEqual("the-value", ssm_client.get_parameter("a-parameter"))
+            get_client.assert_called_once_with("ssm", "an-account", "ssm-role")
+            self.assertFalse(s3_client._s3.built)
+
+        self.assertEqual(["ssm:ssm-role"], [name for name, _ in factory.startup_costs])
+
+    def test_startup_costs_are_recorded(self) -> None:
+        factory = AwsClientFactory()
+
+        with patch.object(AwsClientFactory, "_get_client", return_value=Mock()):
+            factory.get_s3_client("an-account", "s3-role")
+            factory.get_org_client("org-account", "org-role")
+
+        self.assertEqual(["s3:s3-role", "organizations:org-role"], [name for name, _ in factory.startup_costs])
+        self.assertTrue(all(seconds >= 0 for _, seconds in factory.startup_costs))
+
     def test_get_client(self) -> None:
         boto_credentials = {
             "Credentials": {
@@ -75,3 +105,109 @@ class TestAwsClientFactory(TestCase):
         with patch.object(aws_client_factory, "boto3", Mock(client=Mock(side_effect=client_error()))):
             with self.assertRaisesRegex(ClientFactoryException, "AccessDenied"):
                 AwsClientFactory()._get_client("service", "account", "role")
+
+    def test_credentials_are_cached_per_account_and_role(self) -> None:
+        mock_sts_client = Mock(assume_role=Mock(side_effect=lambda **kwargs: _sts_credentials(kwargs["RoleArn"])))
+        mock_boto3 = Mock(client=Mock(side_effect=lambda service_name, **kwargs: mock_sts_client))
+        factory = AwsClientFactory()
+
+        with patch.object(aws_client_factory, "boto3", mock_boto3):
+            factory._get_client("s3", "account-1", "role-a")
+            factory._get_client("s3", "account-1", "role-a")
+            factory._get_client("ssm", "account-1", "role-a")
+            factory._get_client("s3", "account-1", "role-b")
+            factory._get_client("organizations", "account-2", "role-a")
+
+        self.assertEqual(3, factory.sts_calls)
+        self.assertEqual(3, mock_sts_client.assume_role.call_count)
+
+    def test_credentials_are_refreshed_before_they_expire(self) -> None:
+        now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        mock_sts_client = Mock(
+            assume_role=Mock(return_value=_sts_credentials("some-role", expiration=now + timedelta(minutes=15)))
+        )
+        mock_boto3 = Mock(client=Mock(return_value=mock_sts_client))
+        clock = Mock(return_value=now)
+        factory = AwsClientFactory(clock=clock)
+
+        with patch.object(aws_client_factory, "boto3", mock_boto3):
+            factory._get_client("s3", "account", "role")
+            clock.return_value = now + timedelta(minutes=9, seconds=59)
+            factory._get_client("s3", "account", "role")
+            self.assertEqual(1, factory.sts_calls)
+
+            clock.return_value = now + timedelta(minutes=10)
+            factory._get_client("s3", "account", "role")
+            self.assertEqual(2, factory.sts_calls)
+
+    def test_lazy_clients_are_rebuilt_with_fresh_credentials(self) -> None:
+        now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        clock = Mock(return_value=now)
+        mock_sts_client = Mock(
+            assume_role=Mock(
+                side_effect=lambda **kwargs: _sts_credentials(
+                    kwargs["RoleArn"], expiration=clock() + timedelta(minutes=15)
+                )
+            )
+        )
+        mock_boto3 = Mock(
+            client=Mock(side_effect=lambda service_name, **kwargs: mock_sts_client if service_name == "sts" else Mock())
+        )
+        factory = AwsClientFactory(lazy=True, clock=clock)
+
+        with patch.object(aws_client_factory, "boto3", mock_boto3):
+            org_client = factory.get_org_client("org-account", "org-role")
+            ssm_client = factory.get_ssm_client("org-account", "org-role")
+            boto_org = org_client._org._get()
+            boto_ssm = ssm_client._ssm._get()
+            clock.return_value = now + timedelta(minutes=9, seconds=59)
+            self.assertIs(boto_org, org_client._org._get())
+
+            clock.return_value = now + timedelta(minutes=10)
+            self.assertIsNot(boto_org, org_client._org._get())
+            self.assertEqual(2, factory.sts_calls)
+            # the credentials were already renewed for the org client, but the ssm client still holds the old ones
+            self.assertIsNot(boto_ssm, ssm_client._ssm._get())
+            self.assertEqual(2, factory.sts_calls)
+
+    def test_concurrent_callers_share_one_sts_call(self) -> None:
+        sts_call_started = Event()
+        release_sts_call = Event()
+
+        def assume_role(**kwargs: Any) -> Dict[str, Any]:
+            sts_call_started.set()
+            release_sts_call.wait(timeout=5)
+            return _sts_credentials(kwargs["RoleArn"])
+
+        mock_sts_client = Mock(assume_role=Mock(side_effect=assume_role))
+        mock_boto3 = Mock(client=Mock(return_value=mock_sts_client))
+        factory = AwsClientFactory()
+
+        with patch.object(aws_client_factory, "boto3", mock_boto3), ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(factory._get_credentials, "account", "role") for _ in range(4)]
+            sts_call_started.wait(timeout=5)
+            release_sts_call.set()
+            credentials = {future.result() for future in futures}
+
+        self.assertEqual(1, len(credentials))
+        self.assertEqual(1, factory.sts_calls)
+
+    def test_failed_sts_call_is_not_cached(self) -> None:
+        factory = AwsClientFactory()
+        with patch.object(aws_client_factory, "boto3", Mock(client=Mock(side_effect=client_error()))):
+            for _ in range(2):
+                with self.assertRaisesRegex(ClientFactoryException, "AccessDenied"):
+                    factory._get_client("service", "account", "role")
+
+        self.assertEqual(2, factory.sts_calls)
+
+
+def _sts_credentials(role_arn: str, expiration: datetime = datetime(2999, 1, 1, tzinfo=timezone.utc)) -> Dict[str, Any]:
+    return {
+        "Credentials": {
+            "AccessKeyId": f"{role_arn}-access-key",
+            "SecretAccessKey": f"{role_arn}-secret-access-key",
+            "SessionToken": f"{role_arn}-session-token",
+            "Expiration": expiration,
+        }
+    }
@@ -1,6 +1,13 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, List
+from unittest.mock import Mock, call
+
+from botocore.client import BaseClient
 from moto import mock_aws
 
+from src.clients.account_snapshot import AccountSnapshotEntry, AccountSnapshotStore, FileAccountSnapshotStore
 from src.clients.aws_org_client import AwsOrgClient
+from src.data.account import Account
 
 import boto3
 
@@ -73,3 +80,167 @@ def test_get_account_details_fails() -> None:
     assert result.name == "account not found"
     assert result.slack_handle == "owning-team-not-found"
     assert result.identifier == "49857"
+
+
+def _create_accounts(client: BaseClient, count: int) -> List[str]:
+    client.create_organization(FeatureSet="ALL")
+    account_ids = []
+    for index in range(count):
+        account_id = client.create_account(AccountName=f"account-{index}", Email="example@example.com")[
+            "CreateAccountStatus"
+        ]["AccountId"]
+        client.tag_resource(ResourceId=account_id, Tags=[{"Key": "team_slack_handle", "Value": f"@team-{index}"}])
+        account_ids.append(account_id)
+    return account_ids
+
+
+@mock_aws
+def test_get_account_answers_from_directory() -> None:
+    client = Mock(wraps=boto3.client("organizations"))
+    account_ids = _create_accounts(client, 3)
+
+    org_client = AwsOrgClient(client)
+    for _ in range(5):
+        for index, account_id in enumerate(account_ids):
+            account = org_client.get_account(account_id=account_id)
+            assert account.name == f"account-{index}"
+            assert account.slack_handle == f"@team-{index}"
+
+    client.describe_account.assert_not_called()
+    assert [call("list_accounts")] + [call("list_tags_for_resource")] * 3 == client.get_paginator.call_args_list
+
+
+@mock_aws
+def test_preload_lists_accounts_once() -> None:
+    client = Mock(wraps=boto3.client("organizations"))
+    account_ids = _create_accounts(client, 2)
+
+    org_client = AwsOrgClient(client)
+    org_client.preload()
+    org_client.preload()
+
+    assert [call("list_accounts")] == client.get_paginator.call_args_list
+    assert org_client.get_account(account_id=account_ids[1]).name == "account-1"
+
+
+@mock_aws
+def test_account_directory_expires() -> None:
+    client = Mock(wraps=boto3.client("organizations"))
+    account_id = _create_accounts(client, 1)[0]
+    now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    clock = Mock(return_value=now)
+
+    org_client = AwsOrgClient(client, directory_ttl=timedelta(minutes=10), clock=clock)
+    org_client.get_account(account_id=account_id)
+    clock.return_value = now + timedelta(minutes=9)
+    org_client.get_account(account_id=account_id)
+    assert 2 == client.get_paginator.call_count
+
+    clock.return_value = now + timedelta(minutes=10)
+    client.tag_resource(ResourceId=account_id, Tags=[{"Key": "team_slack_handle", "Value": "@new-team"}])
+    assert org_client.get_account(account_id=account_id).slack_handle == "@new-team"
+    assert 4 == client.get_paginator.call_count
+    assert 2 == org_client.account_fetches
+
+
+@mock_aws
+def test_get_account_not_in_directory_falls_back_to_describe_account() -> None:
+    client = Mock(wraps=boto3.client("organizations"))
+    account_id = _create_accounts(client, 1)[0]
+    client.get_paginator.side_effect = lambda name: (
+        Mock(paginate=Mock(return_value=[{"Accounts": []}]))
+        if name == "list_accounts"
+        else boto3.client("organizations").get_paginator(name)
+    )
+
+    assert AwsOrgClient(client).get_account(account_id=account_id).name == "account-0"
+    client.describe_account.assert_called_once_with(AccountId=account_id)
+
+
+@mock_aws
+def test_failed_account_lookups_are_not_cached() -> None:
+    client = Mock(wraps=boto3.client("organizations"))
+    org_client = AwsOrgClient(client)
+
+    assert org_client.get_account(account_id="49857").name == "account not found"
+    assert org_client.get_account(account_id="49857").name == "account not found"
+    assert 2 == client.describe_account.call_count
+
+
+@mock_aws
+def test_get_account_answers_from_snapshot(tmp_path: Any) -> None:
+    client = Mock(wraps=boto3.client("organizations"))
+    account_ids = _create_accounts(client, 2)
+    store = FileAccountSnapshotStore(str(tmp_path / "accounts.json"))
+
+    cold_client = AwsOrgClient(client, snapshot_store=store)
+    for account_id in account_ids:
+        cold_client.get_account(account_id=account_id)
+    cold_client.save_snapshot()
+    client.reset_mock()
+
+    warm_client = AwsOrgClient(client, snapshot_store=store)
+    assert ["account-0", "account-1"] == [warm_client.get_account(account_id=id).name for id in account_ids]
+    assert ["@team-0", "@team-1"] == [warm_client.get_account(account_id=id).slack_handle for id in account_ids]
+    client.get_paginator.assert_not_called()
+    client.describe_account.assert_not_called()
+
+
+@mock_aws
+def test_only_stale_snapshot_entries_are_refreshed(tmp_path: Any) -> None:
+    client = Mock(wraps=boto3.client("organizations"))
+    fresh_id, stale_id = _create_accounts(client, 2)
+    now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    store = FileAccountSnapshotStore(str(tmp_path / "accounts.json"))
+    store.save(
+        {
+            fresh_id: AccountSnapshotEntry(Account(fresh_id, "cached-name", "@cached"), now - timedelta(minutes=5)),
+            stale_id: AccountSnapshotEntry(Account(stale_id, "cached-name", "@cached"), now - timedelta(hours=2)),
+        }
+    )
+
+    org_client = AwsOrgClient(client, directory_ttl=timedelta(hours=1), snapshot_store=store, clock=lambda: now)
+
+    assert "@cached" == org_client.get_account(account_id=fresh_id).slack_handle
+    assert "@team-1" == org_client.get_account(account_id=stale_id).slack_handle
+    assert [call("list_accounts"), call("list_tags_for_resource")] == client.get_paginator.call_args_list
+
+    org_client.save_snapshot()
+    assert "@team-1" == store.load()[stale_id].account.slack_handle
+    assert now == store.load()[stale_id].fetched_at
+
+
+@mock_aws
+def test_stale_snapshot_entry_is_used_when_refresh_fails(tmp_path: Any) -> None:
+    now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    store = FileAccountSnapshotStore(str(tmp_path / "accounts.json"))
+    store.save({"49857": AccountSnapshotEntry(Account("49857", "cached-name", "@cached"), now - timedelta(days=2))})
+
+    account = AwsOrgClient(boto3.client("organizations"), snapshot_store=store, clock=lambda: now).get_account("49857")
+
+    assert Account("49857", "cached-name", "@cached") == account
+    assert "cached-name" == account.name
+
+
+def test_snapshot_is_only_saved_when_changed() -> None:
+    store = Mock(spec=AccountSnapshotStore, load=Mock(return_value={}))
+    org_client = AwsOrgClient(Mock(), snapshot_store=store)
+
+    org_client.save_snapshot()
+
+    store.save.assert_not_called()
+
+
+@mock_aws
+def test_get_account_when_listing_accounts_fails(caplog: Any) -> None:
+    client = Mock(wraps=boto3.client("organizations"))
+    account_id = _create_accounts(client, 1)[0]
+    client.get_paginator.side_effect = lambda name: (
+        Mock(paginate=Mock(side_effect=ValueError("boom")))
+        if name == "list_accounts"
+        else boto3.client("organizations").get_paginator(name)
+    )
+
+    assert AwsOrgClient(client).get_account(account_id=account_id).name == "account-0"
+    client.describe_account.assert_called_once_with(AccountId=account_id)
+    assert "unable to list organization accounts: boom" in caplog.text
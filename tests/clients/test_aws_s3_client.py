@@ -1,5 +1,7 @@
+import gzip
 from unittest import TestCase
 from moto import mock_aws
+from zstandard import ZstdCompressor
 
 import boto3
 
@@ -35,6 +37,51 @@ class TestAwsS3Client(TestCase):
         with self.assertRaisesRegex(AwsClientException, "invalid-json"):
             self.client.read_object(bucket, "invalid-json")
 
+    def test_read_json_object(self) -> None:
+        self.client._s3.put_object(Bucket=bucket, Key="bundle.json", Body='{"version": 1}')
+
+        self.assertEqual({"version": 1}, self.client.read_json_object(bucket, "bundle.json"))
+
+    def test_read_json_object_failure(self) -> None:
+        with self.assertRaisesRegex(AwsClientException, "unexpected-key"):
+            self.client.read_json_object(bucket, "unexpected-key")
+
+    def test_stream_object(self) -> None:
+        self.assertEqual([{"key": "val1"}, {"key": "val2"}], list(self.client.stream_object(bucket, keys[0])))
+
+    def test_stream_compressed_object(self) -> None:
+        self.client._s3.put_object(Bucket=bucket, Key="report.json.gz", Body=gzip.compress(obj.encode()))
+        self.client._s3.put_object(
+            Bucket=bucket, Key="report", Body=gzip.compress(obj.encode()), ContentEncoding="gzip"
+        )
+
+        for key in ["report.json.gz", "report"]:
+            self.assertEqual([{"key": "val1"}, {"key": "val2"}], list(self.client.stream_object(bucket, key)))
+
+    def test_stream_zstd_compressed_object(self) -> None:
+        self.client._s3.put_object(Bucket=bucket, Key="report.zst", Body=ZstdCompressor().compress(obj.encode()))
+
+        self.assertEqual([{"key": "val1"}, {"key": "val2"}], list(self.client.stream_object(bucket, "report.zst")))
+
+    def test_stream_corrupt_compressed_object(self) -> None:
+        self.client._s3.put_object(Bucket=bucket, Key="corrupt.gz", Body=gzip.compress(obj.encode())[:-8])
+
+        with self.assertRaisesRegex(AwsClientException, "corrupt.gz.*gzip stream is truncated"):
+            list(self.client.stream_object(bucket, "corrupt.gz"))
+
+    def test_stream_object_failure(self) -> None:
+        with self.assertRaisesRegex(AwsClientException, "unexpected-bucket"):
+            list(self.client.stream_object("unexpected-bucket", keys[0]))
+
+        with self.assertRaisesRegex(AwsClientException, "unexpected-key"):
+            list(self.client.stream_object(bucket, "unexpected-key"))
+
+    def test_stream_invalid_object(self) -> None:
+        self.client._s3.put_object(Bucket=bucket, Key="invalid-json", Body='[{"key": "value"}, {"key": "value"')
+
+        with self.assertRaisesRegex(AwsClientException, "invalid-json"):
+            list(self.client.stream_object(bucket, "invalid-json"))
+
     def test_list_objects(self) -> None:
         self.assertEqual(keys, self.client.list_objects(bucket, max_keys=5))
 
@@ -42,9 +89,37 @@ class TestAwsS3Client(TestCase):
         self.assertEqual([], self.client.list_objects(bucket, prefix="unexpected-prefix"))
         self.assertEqual(["key_4"], self.client.list_objects(bucket, prefix="key_4"))
 
+    def test_list_object_etags(self) -> None:
+        etag = self.client._s3.head_object(Bucket=bucket, Key=keys[0])["ETag"]
+
+        self.assertEqual({key: etag for key in keys}, self.client.list_object_etags(bucket, max_keys=5))
+        self.assertEqual({"key_4": etag}, self.client.list_object_etags(bucket, prefix="key_4"))
+
+    def test_list_object_etags_failure(self) -> None:
+        with self.assertRaisesRegex(AwsClientException, "not-a-bucket"):
+            self.client.list_object_etags("not-a-bucket")
+
     def test_list_objects_failure(self) -> None:
         with self.assertRaisesRegex(AwsClientException, "not-a-bucket"):
             self.client.list_objects("not-a-bucket")
 
         with self.assertRaisesRegex(AwsClientException, "unexpected-prefix"):
             self.client.list_objects("not-a-bucket", prefix="unexpected-prefix")
+
+    def test_write_json_object(self) -> None:
+        self.client.write_json_object(bucket, "outbox/entry.json", {"version": 1})
+
+        self.assertEqual({"version": 1}, self.client.read_json_object(bucket, "outbox/entry.json"))
+
+    def test_write_json_object_failure(self) -> None:
+        with self.assertRaisesRegex(AwsClientException, "failed to write object 'entry.json' to bucket 'not-a-bucket'"):
+            self.client.write_json_object("not-a-bucket", "entry.json", {})
+
+    def test_delete_object(self) -> None:
+        self.client.delete_object(bucket, keys[0])
+
+        self.assertEqual(keys[1:], self.client.list_objects(bucket))
+
+    def test_delete_object_failure(self) -> None:
+        with self.assertRaisesRegex(AwsClientException, "failed to delete object 'key_0' from bucket 'not-a-bucket'"):
+            self.client.delete_object("not-a-bucket", keys[0])
@@ -1,4 +1,7 @@
+from datetime import datetime, timedelta, timezone
+from typing import List
 from unittest import TestCase
+from unittest.mock import Mock
 from moto import mock_aws
 
 import boto3
@@ -10,7 +13,13 @@ from src.data.exceptions import AwsClientException
 @mock_aws
 class TestAwsSsmClient(TestCase):
     def setUp(self) -> None:
-        self.client = AwsSsmClient(boto3.client("ssm", region_name="us-east-1"))
+        self.now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        self.boto_ssm = Mock(wraps=boto3.client("ssm", region_name="us-east-1"))
+        self.client = AwsSsmClient(self.boto_ssm, parameter_ttl=timedelta(minutes=5), clock=lambda: self.now)
+
+    def _put_parameters(self, *names: str) -> None:
+        for name in names:
+            self.client._ssm.put_parameter(Name=name, Value=f"{name}-value", Type="SecureString")
 
     def test_get_parameter(self) -> None:
         self.client._ssm.put_parameter(
@@ -21,3 +30,48 @@ class TestAwsSsmClient(TestCase):
     def test_get_parameter_missing_parameter(self) -> None:
         with self.assertRaisesRegex(AwsClientException, "ParameterNotFound"):
             self.client.get_parameter("missing_parameter")
+
+    def test_get_parameter_is_cached_until_it_expires(self) -> None:
+        self._put_parameters("test_parameter")
+
+        self.assertEqual("test_parameter-value", self.client.get_parameter("test_parameter"))
+        self.now += timedelta(minutes=4)
+        self.assertEqual("test_parameter-value", self.client.get_parameter("test_parameter"))
+        self.assertEqual(1, self.boto_ssm.get_parameter.call_count)
+
+        self.now += timedelta(minutes=1)
+        self.assertEqual("test_parameter-value", self.client.get_parameter("test_parameter"))
+        self.assertEqual(2, self.boto_ssm.get_parameter.call_count)
+
+    def test_get_parameters_in_batches(self) -> None:
+        names = [f"parameter_{index:02}" for index in range(23)]
+        self._put_parameters(*names)
+
+        self.assertEqual({name: f"{name}-value" for name in names}, self.client.get_parameters(names + names[:5]))
+        batches: List[List[str]] = [c.kwargs["Names"] for c in self.boto_ssm.get_parameters.call_args_list]
+        self.assertEqual([names[:10], names[10:20], names[20:]], batches)
+
+    def test_get_parameters_only_fetches_uncached_parameters(self) -> None:
+        self._put_parameters("parameter_a", "parameter_b")
+        self.client.get_parameter("parameter_a")
+
+        self.assertEqual(
+            {"parameter_a": "parameter_a-value", "parameter_b": "parameter_b-value"},
+            self.client.get_parameters(["parameter_a", "parameter_b"]),
+        )
+        self.boto_ssm.get_parameters.assert_called_once_with(Names=["parameter_b"], WithDecryption=True)
+
+        self.assertEqual("parameter_b-value", self.client.get_parameter("parameter_b"))
+        self.boto_ssm.get_parameter.assert_called_once()
+
+    def test_get_parameters_missing_parameter(self) -> None:
+        self._put_parameters("parameter_a")
+
+        with self.assertRaisesRegex(AwsClientException, "missing_parameter.*ParameterNotFound"):
+            self.client.get_parameters(["parameter_a", "missing_parameter"])
+
+    def test_get_parameters_failure(self) -> None:
+        self.boto_ssm.get_parameters = Mock(side_effect=ValueError("boom"))
+
+        with self.assertRaisesRegex(AwsClientException, "failed to get parameters.*parameter_a.*boom"):
+            self.client.get_parameters(["parameter_a"])
@@ -0,0 +1,67 @@
+import gzip
+from typing import Iterator, List, Optional
+
+import pytest
+import zstandard
+
+from src.clients.decompression import GZIP, ZSTD, decompress_chunks, detect_encoding
+
+DATA = b'[{"account": {"identifier": "111222333444"}}]' * 100
+
+
+def _chunked(data: bytes, size: int = 7) -> Iterator[bytes]:
+    return (data[i : i + size] for i in range(0, len(data), size))
+
+
+@pytest.mark.parametrize(
+    "key,content_encoding,expected",
+    [
+        ("s3_audit", None, None),
+        ("s3_audit.json", None, None),
+        ("s3_audit.json.gz", None, GZIP),
+        ("s3_audit.GZ", None, GZIP),
+        ("s3_audit.json.zst", None, ZSTD),
+        ("s3_audit.zstd", None, ZSTD),
+        ("s3_audit", "gzip", GZIP),
+        ("s3_audit", " ZSTD ", ZSTD),
+        ("s3_audit.gz", "identity", GZIP),
+    ],
+)
+def test_detect_encoding(key: str, content_encoding: Optional[str], expected: Optional[str]) -> None:
+    assert expected == detect_encoding(key, content_encoding)
+
+
+def test_decompress_uncompressed_chunks() -> None:
+    assert DATA == b"".join(decompress_chunks(_chunked(DATA), None))
+
+
+@pytest.mark.parametrize(
+    "encoding,members",
+    [
+        (GZIP, [gzip.compress(DATA)]),
+        (GZIP, [gzip.compress(DATA), gzip.compress(DATA)]),
+        (ZSTD, [zstandard.ZstdCompressor().compress(DATA)]),
+        (ZSTD, [zstandard.ZstdCompressor().compress(DATA), zstandard.ZstdCompressor().compress(DATA)]),
+    ],
+)
+def test_decompress_chunks(encoding: str, members: List[bytes]) -> None:
+    assert DATA * len(members) == b"".join(decompress_chunks(_chunked(b"".join(members)), encoding))
+
+
+@pytest.mark.parametrize(
+    "encoding,compressed", [(GZIP, gzip.compress(DATA)), (ZSTD, zstandard.ZstdCompressor().compress(DATA))]
+)
+def test_decompress_truncated_chunks(encoding: str, compressed: bytes) -> None:
+    with pytest.raises(ValueError, match=f"{encoding} stream is truncated"):
+        list(decompress_chunks(_chunked(compressed[:-4]), encoding))
+
+
+@pytest.mark.parametrize("encoding", [GZIP, ZSTD])
+def test_decompress_invalid_chunks(encoding: str) -> None:
+    with pytest.raises(ValueError, match=f"unable to decompress {encoding} stream"):
+        list(decompress_chunks(_chunked(b"definitely not compressed"), encoding))
+
+
+def test_decompress_unsupported_encoding() -> None:
+    with pytest.raises(ValueError, match="unsupported content encoding 'br'"):
+        list(decompress_chunks(_chunked(DATA), "br"))
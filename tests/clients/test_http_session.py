@@ -0,0 +1,25 @@
+from typing import Any
+
+from requests.adapters import HTTPAdapter
+
+from src.clients import http_session
+from src.clients.http_session import get_session
+
+
+def test_sessions_are_reused(monkeypatch: Any) -> None:
+    monkeypatch.setattr(http_session, "_sessions", {})
+
+    assert get_session("slack") is get_session("slack")
+    assert get_session("slack") is not get_session("pagerduty")
+    assert get_session("slack") is not get_session("slack", pool_size=20)
+
+
+def test_session_pool_size(monkeypatch: Any) -> None:
+    monkeypatch.setattr(http_session, "_sessions", {})
+
+    session = get_session("slack", pool_size=20)
+
+    for prefix in ["https://", "http://"]:
+        adapter = session.get_adapter(f"{prefix}slack.example.com")
+        assert isinstance(adapter, HTTPAdapter)
+        assert 20 == adapter._pool_maxsize
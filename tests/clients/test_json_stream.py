@@ -0,0 +1,54 @@
+from json import JSONDecodeError, dumps
+from typing import Any, Iterator, List
+
+import pytest
+
+from src.clients.json_stream import iter_json_array
+
+
+def _chunked(text: str, size: int) -> Iterator[bytes]:
+    data = text.encode("utf-8")
+    return (data[i : i + size] for i in range(0, len(data), size))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, 4096])
+def test_iter_json_array(chunk_size: int) -> None:
+    report: List[Any] = [
+        {"account": {"identifier": "111222333444", "name": "ünïcödé"}, "results": {"buckets": []}},
+        {"nested": [1, 2.5, -3e2, True, False, None, 'a "quoted" [string], with {braces}']},
+        12345,
+        -1.5e-07,
+        0.125,
+        "text",
+        None,
+    ]
+    assert report == list(iter_json_array(_chunked(dumps(report, indent=2), chunk_size)))
+
+
+@pytest.mark.parametrize("split", range(1, 21))
+def test_iter_json_array_with_numbers_split_across_chunks(split: int) -> None:
+    data = b"[1.5, -1.5e-07, 2E+3]"
+    assert [1.5, -1.5e-07, 2000.0] == list(iter_json_array([data[:split], data[split:]]))
+
+
+def test_iter_json_array_is_lazy() -> None:
+    chunks = iter([b'[{"a": 1}, ', b'{"b": 2}, ', b"not json"])
+    elements = iter_json_array(chunks)
+
+    assert {"a": 1} == next(elements)
+    assert {"b": 2} == next(elements)
+    assert b"not json" == next(chunks)
+
+
+@pytest.mark.parametrize("text", ["[]", "  [ ] ", "\n[\n]\n"])
+def test_iter_empty_json_array(text: str) -> None:
+    assert [] == list(iter_json_array(_chunked(text, 1)))
+
+
+@pytest.mark.parametrize(
+    "text",
+    ['{"key": "value"}', '[{"key": "value"}', '[{"key": "value"} {"key": "value"}]', "[1,]", "[1] [2]", "", "[12"],
+)
+def test_iter_invalid_json_array(text: str) -> None:
+    with pytest.raises(JSONDecodeError):
+        list(iter_json_array(_chunked(text, 3)))
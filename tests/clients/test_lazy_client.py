@@ -0,0 +1,46 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+
+from src.clients.lazy_client import LazyClient
+
+
+def test_client_is_built_on_first_use() -> None:
+    client = Mock(list_objects_v2=Mock(return_value={"Contents": []}))
+    build = Mock(return_value=client)
+    lazy_client = LazyClient("s3:a-role", build)
+
+    assert not lazy_client.built
+    build.assert_not_called()
+
+    assert {"Contents": []} == lazy_client.list_objects_v2(Bucket="bucket")
+    assert {"Contents": []} == lazy_client.list_objects_v2(Bucket="bucket")
+
+    assert lazy_client.built
+    build.assert_called_once()
+    assert 2 == client.list_objects_v2.call_count
+
+
+def test_client_is_built_once_by_concurrent_callers() -> None:
+    build = Mock(side_effect=lambda: Mock())
+    lazy_client = LazyClient("ssm:a-role", build)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda _: lazy_client.get_parameter(Name="param"), range(32)))
+
+    build.assert_called_once()
+
+
+def test_stale_client_is_rebuilt() -> None:
+    clients = [Mock(), Mock()]
+    build = Mock(side_effect=clients)
+    is_stale = Mock(return_value=False)
+    lazy_client = LazyClient("organizations:a-role", build, is_stale=is_stale)
+
+    lazy_client.describe_account(AccountId="111")
+    lazy_client.describe_account(AccountId="222")
+    is_stale.return_value = True
+    lazy_client.describe_account(AccountId="333")
+
+    assert 2 == build.call_count
+    assert 2 == clients[0].describe_account.call_count
+    clients[1].describe_account.assert_called_once_with(AccountId="333")
@@ -85,3 +85,13 @@ def test_check() -> None:
         ),
     }
     assert notifications == expected_findings
+
+
+def test_webhook_findings_are_not_shared_between_analysers() -> None:
+    GithubWebhookCompliance(logger=getLogger(), config=get_config()).analyse(
+        Audit(type="github_webhook", report=github_webhook_report)
+    )
+
+    assert set() == GithubWebhookCompliance(logger=getLogger(), config=get_config()).analyse(
+        Audit(type="github_webhook", report=[])
+    )
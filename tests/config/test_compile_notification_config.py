@@ -0,0 +1,53 @@
+import json
+import runpy
+import sys
+from typing import Any
+
+import pytest
+
+from src.config.compile_notification_config import main
+from src.config.notification_config_bundle import NotificationConfigBundle
+from src.config.notification_mapping_config import NotificationMappingConfig
+
+
+def test_compile_config_directory(tmp_path: Any, capsys: Any) -> None:
+    (tmp_path / "filters").mkdir()
+    (tmp_path / "filters" / "a.json").write_text(json.dumps([{"item": "bucket-a", "reason": "a reason"}]))
+    (tmp_path / "mappings").mkdir()
+    (tmp_path / "mappings" / "central.json").write_text(json.dumps([{"channel": "central"}]))
+
+    assert 0 == main([str(tmp_path), str(tmp_path / "bundle.json")])
+
+    bundle = NotificationConfigBundle.from_dict(json.loads((tmp_path / "bundle.json").read_text()))
+    assert (NotificationMappingConfig(channel="central"),) == bundle.mappings
+    assert f"compiled 1 filters and 1 mappings ({bundle.version_hash})" in capsys.readouterr().out
+
+
+def test_compile_directory_without_config(tmp_path: Any) -> None:
+    assert 0 == main([str(tmp_path), str(tmp_path / "bundle.json")])
+
+    bundle = NotificationConfigBundle.from_dict(json.loads((tmp_path / "bundle.json").read_text()))
+    assert (set(), ()) == (bundle.filters, bundle.mappings)
+
+
+def test_compile_invalid_config(tmp_path: Any, capsys: Any) -> None:
+    (tmp_path / "mappings").mkdir()
+    (tmp_path / "mappings" / "broken.json").write_text('[{"channel": ')
+
+    assert 1 == main([str(tmp_path), str(tmp_path / "bundle.json")])
+
+    assert (
+        "unable to compile notification config: invalid config file 'mappings/broken.json'" in capsys.readouterr().err
+    )
+    assert not (tmp_path / "bundle.json").exists()
+
+
+def test_run_as_module(tmp_path: Any, monkeypatch: Any) -> None:
+    monkeypatch.delitem(sys.modules, "src.config.compile_notification_config")
+    monkeypatch.setattr(sys, "argv", ["compile_notification_config", str(tmp_path), str(tmp_path / "bundle.json")])
+
+    with pytest.raises(SystemExit) as exit_info:
+        runpy.run_module("src.config.compile_notification_config", run_name="__main__")
+
+    assert 0 == exit_info.value.code
+    assert (tmp_path / "bundle.json").exists()
@@ -1,7 +1,9 @@
 import logging
 import re
+from datetime import timedelta
 from collections import namedtuple
-from typing import Any, Dict
+from threading import Barrier
+from typing import Any, Dict, List, NoReturn
 from unittest.mock import Mock, patch, call
 
 import pytest
@@ -9,12 +11,18 @@ import pytest
 from src.clients.aws_org_client import AwsOrgClient
 from src.clients.aws_s3_client import AwsS3Client
 from src.config.config import Config
+from src.config.config_file_cache import ConfigFileCache
+from src.config.notification_config_bundle import NotificationConfigBundle
 from src.config.notification_filter_config import NotificationFilterConfig
 from src.config.notification_mapping_config import NotificationMappingConfig
 from src.config.slack_notifier_config import SlackNotifierConfig
 from src.data.exceptions import AwsClientException, MissingConfigException, InvalidConfigException
 
 
+def _raise(err: Exception) -> NoReturn:
+    raise err
+
+
 MOCK_CLIENTS: Dict[str, Any] = {
     "config_s3_client": Mock(),
     "report_s3_client": Mock(),
@@ -97,6 +105,169 @@ def feature_switch_can_be_enabled(monkeypatch: Any) -> None:
     assert Config(**MOCK_CLIENTS).get_enable_wiki_checking() is True
 
 
+def test_stream_audit_reports_feature_switch(monkeypatch: Any) -> None:
+    monkeypatch.delenv("STREAM_AUDIT_REPORTS", raising=False)
+    assert Config(**MOCK_CLIENTS).get_stream_audit_reports() is False
+
+    monkeypatch.setenv("STREAM_AUDIT_REPORTS", " True ")
+    assert Config(**MOCK_CLIENTS).get_stream_audit_reports() is True
+
+
+def test_process_all_s3_records_feature_switch(monkeypatch: Any) -> None:
+    monkeypatch.delenv("PROCESS_ALL_S3_RECORDS", raising=False)
+    assert Config(**MOCK_CLIENTS).get_process_all_s3_records() is False
+
+    monkeypatch.setenv("PROCESS_ALL_S3_RECORDS", "TRUE")
+    assert Config(**MOCK_CLIENTS).get_process_all_s3_records() is True
+
+
+def test_coalesce_slack_messages_feature_switch(monkeypatch: Any) -> None:
+    monkeypatch.delenv("COALESCE_SLACK_MESSAGES", raising=False)
+    assert Config.get_coalesce_slack_messages() is False
+
+    monkeypatch.setenv("COALESCE_SLACK_MESSAGES", "true")
+    assert Config.get_coalesce_slack_messages() is True
+
+
+def test_get_s3_record_concurrency(monkeypatch: Any) -> None:
+    monkeypatch.delenv("S3_RECORD_CONCURRENCY", raising=False)
+    assert Config.get_s3_record_concurrency() == 4
+
+    monkeypatch.setenv("S3_RECORD_CONCURRENCY", "12")
+    assert Config.get_s3_record_concurrency() == 12
+
+
+def test_get_config_load_concurrency(monkeypatch: Any) -> None:
+    monkeypatch.delenv("CONFIG_LOAD_CONCURRENCY", raising=False)
+    assert Config.get_config_load_concurrency() == 8
+
+    monkeypatch.setenv("CONFIG_LOAD_CONCURRENCY", "32")
+    assert Config.get_config_load_concurrency() == 32
+
+
+def test_get_slack_delivery_concurrency(monkeypatch: Any) -> None:
+    monkeypatch.delenv("SLACK_DELIVERY_CONCURRENCY", raising=False)
+    assert Config.get_slack_delivery_concurrency() == 1
+
+    monkeypatch.setenv("SLACK_DELIVERY_CONCURRENCY", "16")
+    assert Config.get_slack_delivery_concurrency() == 16
+
+
+def test_get_slack_rate_limits(monkeypatch: Any) -> None:
+    monkeypatch.delenv("SLACK_MESSAGES_PER_MINUTE", raising=False)
+    monkeypatch.setenv("SLACK_CHANNEL_MESSAGES_PER_MINUTE", "")
+    assert Config.get_slack_messages_per_minute() is None
+    assert Config.get_slack_channel_messages_per_minute() is None
+
+    monkeypatch.setenv("SLACK_MESSAGES_PER_MINUTE", "600")
+    monkeypatch.setenv("SLACK_CHANNEL_MESSAGES_PER_MINUTE", "60")
+    assert Config.get_slack_messages_per_minute() == 600
+    assert Config.get_slack_channel_messages_per_minute() == 60
+
+
+def test_get_invalid_slack_rate_limit(monkeypatch: Any) -> None:
+    monkeypatch.setenv("SLACK_MESSAGES_PER_MINUTE", "0")
+
+    with pytest.raises(InvalidConfigException, match="invalid SLACK_MESSAGES_PER_MINUTE: 0"):
+        Config.get_slack_messages_per_minute()
+
+
+def test_get_slack_retry_budget(monkeypatch: Any) -> None:
+    monkeypatch.delenv("SLACK_RETRY_BUDGET_SECONDS", raising=False)
+    assert Config.get_slack_retry_budget() == timedelta(seconds=120)
+
+    monkeypatch.setenv("SLACK_RETRY_BUDGET_SECONDS", "30")
+    assert Config.get_slack_retry_budget() == timedelta(seconds=30)
+
+
+def test_get_notifier_resilience_settings(monkeypatch: Any) -> None:
+    for key in ["NOTIFIER_MAX_ATTEMPTS", "NOTIFIER_CIRCUIT_ERROR_PERCENT", "NOTIFIER_CIRCUIT_OPEN_SECONDS"]:
+        monkeypatch.delenv(key, raising=False)
+    assert Config.get_notifier_max_attempts() == 3
+    assert Config.get_notifier_circuit_error_percent() == 50
+    assert Config.get_notifier_circuit_open_seconds() == 30
+
+    monkeypatch.setenv("NOTIFIER_MAX_ATTEMPTS", "5")
+    monkeypatch.setenv("NOTIFIER_CIRCUIT_ERROR_PERCENT", "80")
+    monkeypatch.setenv("NOTIFIER_CIRCUIT_OPEN_SECONDS", "10")
+    assert Config.get_notifier_max_attempts() == 5
+    assert Config.get_notifier_circuit_error_percent() == 80
+    assert Config.get_notifier_circuit_open_seconds() == 10
+
+
+def test_get_http_pool_size(monkeypatch: Any) -> None:
+    monkeypatch.delenv("HTTP_POOL_SIZE", raising=False)
+    assert Config.get_http_pool_size() == 10
+
+    monkeypatch.setenv("HTTP_POOL_SIZE", "25")
+    assert Config.get_http_pool_size() == 25
+
+
+@pytest.mark.parametrize("value", ["banana", "0", "-3"])
+def test_get_invalid_s3_record_concurrency(value: str, monkeypatch: Any) -> None:
+    monkeypatch.setenv("S3_RECORD_CONCURRENCY", value)
+
+    with pytest.raises(InvalidConfigException, match=f"invalid S3_RECORD_CONCURRENCY: {value}"):
+        Config.get_s3_record_concurrency()
+
+
+def test_get_account_directory_ttl(monkeypatch: Any) -> None:
+    monkeypatch.delenv("ACCOUNT_DIRECTORY_TTL_SECONDS", raising=False)
+    assert Config.get_account_directory_ttl() == timedelta(minutes=30)
+
+    monkeypatch.setenv("ACCOUNT_DIRECTORY_TTL_SECONDS", "86400")
+    assert Config.get_account_directory_ttl() == timedelta(days=1)
+
+
+def test_get_ssm_parameter_cache_ttl(monkeypatch: Any) -> None:
+    monkeypatch.delenv("SSM_PARAMETER_CACHE_TTL_SECONDS", raising=False)
+    assert Config.get_ssm_parameter_cache_ttl() == timedelta(minutes=5)
+
+    monkeypatch.setenv("SSM_PARAMETER_CACHE_TTL_SECONDS", "60")
+    assert Config.get_ssm_parameter_cache_ttl() == timedelta(minutes=1)
+
+
+def test_get_account_snapshot_key(monkeypatch: Any) -> None:
+    monkeypatch.delenv("ACCOUNT_SNAPSHOT_KEY", raising=False)
+    assert Config.get_account_snapshot_key() is None
+
+    monkeypatch.setenv("ACCOUNT_SNAPSHOT_KEY", "snapshots/account_directory.json")
+    monkeypatch.setenv("ACCOUNT_SNAPSHOT_WRITE_ROLE", "snapshot-role")
+    assert Config.get_account_snapshot_key() == "snapshots/account_directory.json"
+    assert Config.get_account_snapshot_write_role() == "snapshot-role"
+
+
+def test_get_account_snapshot_path(monkeypatch: Any) -> None:
+    monkeypatch.delenv("ACCOUNT_SNAPSHOT_PATH", raising=False)
+    assert Config.get_account_snapshot_path() is None
+
+    monkeypatch.setenv("ACCOUNT_SNAPSHOT_PATH", "/tmp/somewhere-else.json")
+    assert Config.get_account_snapshot_path() == "/tmp/somewhere-else.json"
+
+    monkeypatch.setenv("ACCOUNT_SNAPSHOT_PATH", "")
+    assert Config.get_account_snapshot_path() is None
+
+
+def test_get_outbox_config(monkeypatch: Any) -> None:
+    for key in ["OUTBOX_PATH", "OUTBOX_BUCKET", "OUTBOX_PREFIX", "OUTBOX_REPLAY_CONCURRENCY"]:
+        monkeypatch.delenv(key, raising=False)
+    assert Config.get_outbox_path() is None
+    assert Config.get_outbox_bucket() is None
+    assert Config.get_outbox_prefix() == "outbox/"
+    assert Config.get_outbox_replay_concurrency() == 8
+
+    monkeypatch.setenv("OUTBOX_PATH", "/mnt/outbox")
+    monkeypatch.setenv("OUTBOX_BUCKET", "outbox-bucket")
+    monkeypatch.setenv("OUTBOX_PREFIX", "undelivered/")
+    monkeypatch.setenv("OUTBOX_WRITE_ROLE", "outbox-role")
+    monkeypatch.setenv("OUTBOX_REPLAY_CONCURRENCY", "2")
+    assert Config.get_outbox_path() == "/mnt/outbox"
+    assert Config.get_outbox_bucket() == "outbox-bucket"
+    assert Config.get_outbox_prefix() == "undelivered/"
+    assert Config.get_outbox_write_role() == "outbox-role"
+    assert Config.get_outbox_replay_concurrency() == 2
+
+
 def test_get_configured_log_level(monkeypatch: Any) -> None:
     monkeypatch.setenv("LOG_LEVEL", "debug")
 
@@ -137,25 +308,104 @@ def test_get_slack_notifier_config(monkeypatch: Any) -> None:
 
 
 @patch("src.config.config.Config._fetch_config_files")
-def test_get_notification_filters(fetch_config_files: Any) -> None:
+def test_get_notification_filters(fetch_config_files: Any, monkeypatch: Any) -> None:
+    monkeypatch.setenv("NOTIFICATION_CONFIG_BUNDLE_KEY", "")
     Config(**MOCK_CLIENTS).get_notification_filters()
 
     fetch_config_files.assert_called_once_with("filters/", NotificationFilterConfig.from_dict)
 
 
 @patch("src.config.config.Config._fetch_config_files")
-def test_get_notification_mappings(fetch_config_files: Any) -> None:
+def test_get_notification_mappings(fetch_config_files: Any, monkeypatch: Any) -> None:
+    monkeypatch.setenv("NOTIFICATION_CONFIG_BUNDLE_KEY", "")
     Config(**MOCK_CLIENTS).get_notification_mappings()
 
     fetch_config_files.assert_called_once_with("mappings/", NotificationMappingConfig.from_dict)
 
 
+def _bundle_s3_client(bundle: Any, etag: str = "etag-1") -> Mock:
+    return Mock(
+        list_object_etags=Mock(return_value={"bundle/notification_config.json": etag}),
+        read_json_object=Mock(return_value=bundle),
+    )
+
+
+def test_get_notification_config_from_bundle(monkeypatch: Any, caplog: Any) -> None:
+    monkeypatch.setenv("CONFIG_BUCKET", "buck")
+    monkeypatch.delenv("NOTIFICATION_CONFIG_BUNDLE_KEY", raising=False)
+    bundle = NotificationConfigBundle.compile(
+        {"filters/a.json": [{"item": "bucket-a", "reason": "a reason"}]}, {"mappings/a.json": [{"channel": "a"}]}
+    )
+    s3_client = _bundle_s3_client(bundle.to_dict())
+    config = Config(**{**MOCK_CLIENTS, "config_s3_client": s3_client})
+
+    with caplog.at_level(logging.INFO):
+        assert {NotificationFilterConfig(item="bucket-a", reason="a reason")} == config.get_notification_filters()
+        assert {NotificationMappingConfig(channel="a")} == config.get_notification_mappings()
+
+    s3_client.read_json_object.assert_called_once_with("buck", "bundle/notification_config.json")
+    s3_client.read_object.assert_not_called()
+    assert f"loaded notification config bundle {bundle.version_hash}" in caplog.text
+
+
+def test_get_notification_config_bundle_is_reloaded_when_changed(monkeypatch: Any) -> None:
+    monkeypatch.setenv("CONFIG_BUCKET", "buck")
+    monkeypatch.delenv("NOTIFICATION_CONFIG_BUNDLE_KEY", raising=False)
+    old = NotificationConfigBundle.compile({}, {"mappings/a.json": [{"channel": "a"}]})
+    new = NotificationConfigBundle.compile({}, {"mappings/a.json": [{"channel": "b"}]})
+    cache = ConfigFileCache()
+
+    old_config = Config(
+        **{**MOCK_CLIENTS, "config_s3_client": _bundle_s3_client(old.to_dict())}, config_file_cache=cache
+    )
+    new_config = Config(
+        **{**MOCK_CLIENTS, "config_s3_client": _bundle_s3_client(new.to_dict(), "etag-2")}, config_file_cache=cache
+    )
+
+    assert {NotificationMappingConfig(channel="a")} == old_config.get_notification_mappings()
+    assert {NotificationMappingConfig(channel="a")} == old_config.get_notification_mappings()
+    assert {NotificationMappingConfig(channel="b")} == new_config.get_notification_mappings()
+    assert (1, 2) == (cache.hits, cache.misses)
+
+
+def test_get_notification_config_without_bundle(monkeypatch: Any) -> None:
+    monkeypatch.setenv("CONFIG_BUCKET", "buck")
+    monkeypatch.setenv("NOTIFICATION_CONFIG_BUNDLE_KEY", "bundle.json")
+    s3_client = Mock(list_object_etags=Mock(return_value={"bundle.json.old": "etag"}))
+
+    assert Config(**{**MOCK_CLIENTS, "config_s3_client": s3_client}).get_notification_config_bundle() is None
+    s3_client.list_object_etags.assert_called_once_with("buck", "bundle.json")
+    s3_client.read_json_object.assert_not_called()
+
+
+def test_get_notification_config_with_bundle_disabled(monkeypatch: Any) -> None:
+    monkeypatch.setenv("NOTIFICATION_CONFIG_BUNDLE_KEY", "")
+    s3_client = Mock()
+
+    assert Config(**{**MOCK_CLIENTS, "config_s3_client": s3_client}).get_notification_config_bundle() is None
+    s3_client.list_object_etags.assert_not_called()
+
+
+def test_get_notification_config_with_invalid_bundle(monkeypatch: Any, caplog: Any) -> None:
+    monkeypatch.setenv("CONFIG_BUCKET", "buck")
+    monkeypatch.delenv("NOTIFICATION_CONFIG_BUNDLE_KEY", raising=False)
+    config = Config(**{**MOCK_CLIENTS, "config_s3_client": _bundle_s3_client({"version": 0})})
+
+    assert config.get_notification_config_bundle() is None
+    assert (
+        "unable to load notification config bundle 'bundle/notification_config.json': "
+        "unsupported notification config bundle version 0"
+    ) in caplog.text
+
+
 def test_fetch_config_files(monkeypatch: Any, caplog: Any) -> None:
     bucket = "buck"
     monkeypatch.setenv("CONFIG_BUCKET", bucket)
     s3_client = Mock().return_value
-    s3_client.list_objects.return_value = ["1", "2"]
-    s3_client.read_object.side_effect = [[{"item": "1"}, {"item": "2"}], AwsClientException("boom")]
+    s3_client.list_object_etags.return_value = {"1": "etag-1", "2": "etag-2"}
+    s3_client.read_object.side_effect = lambda bucket, key: (
+        {"1": [{"item": "1"}, {"item": "2"}]}.get(key) or _raise(AwsClientException("boom"))
+    )
     MOCK_CLIENTS["config_s3_client"] = s3_client
 
     with caplog.at_level(logging.INFO):
@@ -164,7 +414,7 @@ def test_fetch_config_files(monkeypatch: Any, caplog: Any) -> None:
     Obj = namedtuple("Obj", "item")
     assert {Obj(item="1"), Obj(item="2")} == filters
     print(s3_client.mock_calls)
-    assert call.list_objects(bucket, "a-prefix") in s3_client.mock_calls
+    assert call.list_object_etags(bucket, "a-prefix") in s3_client.mock_calls
     assert call.read_object(bucket, "1") in s3_client.mock_calls
     assert call.read_object(bucket, "2") in s3_client.mock_calls
     assert len(caplog.records) == 1
@@ -172,6 +422,67 @@ def test_fetch_config_files(monkeypatch: Any, caplog: Any) -> None:
     assert "unable to load config file '2': boom" in caplog.text
 
 
+def test_fetch_config_files_only_reads_changed_files(monkeypatch: Any) -> None:
+    monkeypatch.setenv("CONFIG_BUCKET", "buck")
+    s3_client = Mock()
+    s3_client.list_object_etags.return_value = {"a-prefix/1": "etag-1", "a-prefix/2": "etag-2"}
+    s3_client.read_object.side_effect = lambda bucket, key: [{"item": f"{key}@{len(s3_client.read_object.mock_calls)}"}]
+    monkeypatch.setenv("CONFIG_LOAD_CONCURRENCY", "1")
+    cache = ConfigFileCache()
+    clients = {**MOCK_CLIENTS, "config_s3_client": s3_client}
+    Obj = namedtuple("Obj", "item")
+
+    Config(**clients, config_file_cache=cache)._fetch_config_files("a-prefix", lambda d: Obj(**d))
+    s3_client.list_object_etags.return_value = {"a-prefix/1": "etag-1", "a-prefix/2": "etag-2-changed"}
+    filters = Config(**clients, config_file_cache=cache)._fetch_config_files("a-prefix", lambda d: Obj(**d))
+
+    assert {Obj(item="a-prefix/1@1"), Obj(item="a-prefix/2@3")} == filters
+    assert [call("buck", "a-prefix/1"), call("buck", "a-prefix/2"), call("buck", "a-prefix/2")] == (
+        s3_client.read_object.call_args_list
+    )
+    assert (1, 3) == (cache.hits, cache.misses)
+
+
+def test_fetch_config_files_without_files(monkeypatch: Any) -> None:
+    monkeypatch.setenv("CONFIG_BUCKET", "buck")
+    s3_client = Mock(list_object_etags=Mock(return_value={}))
+
+    assert set() == Config(**{**MOCK_CLIENTS, "config_s3_client": s3_client})._fetch_config_files("a-prefix", str)
+    s3_client.read_object.assert_not_called()
+
+
+def test_fetch_config_files_in_parallel(monkeypatch: Any) -> None:
+    monkeypatch.setenv("CONFIG_BUCKET", "buck")
+    monkeypatch.setenv("CONFIG_LOAD_CONCURRENCY", "4")
+    barrier = Barrier(4, timeout=5)
+
+    def read_object(bucket: str, key: str) -> List[Dict[str, str]]:
+        # only returns once four files are being read at the same time
+        barrier.wait()
+        return [{"item": key}]
+
+    s3_client = Mock()
+    s3_client.list_object_etags.return_value = {f"a-prefix/{index}": f"etag-{index}" for index in range(8)}
+    s3_client.read_object.side_effect = read_object
+    config = Config(**{**MOCK_CLIENTS, "config_s3_client": s3_client})
+
+    items = config._fetch_config_files("a-prefix", lambda d: d["item"])
+
+    assert {f"a-prefix/{index}" for index in range(8)} == items
+
+
+def test_fetch_config_files_retries_files_that_failed_to_load(monkeypatch: Any) -> None:
+    monkeypatch.setenv("CONFIG_BUCKET", "buck")
+    s3_client = Mock()
+    s3_client.list_object_etags.return_value = {"a-prefix/1": "etag-1"}
+    s3_client.read_object.side_effect = [AwsClientException("boom"), [{"item": "1"}]]
+    config = Config(**{**MOCK_CLIENTS, "config_s3_client": s3_client})
+    Obj = namedtuple("Obj", "item")
+
+    assert set() == config._fetch_config_files("a-prefix", lambda d: Obj(**d))
+    assert {Obj(item="1")} == config._fetch_config_files("a-prefix", lambda d: Obj(**d))
+
+
 def test_get_report_s3_client() -> None:
     s3_client = AwsS3Client(Mock())
     MOCK_CLIENTS["report_s3_client"] = s3_client
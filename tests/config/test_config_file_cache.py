@@ -0,0 +1,26 @@
+from src.config.config_file_cache import ConfigFileCache
+
+
+def test_get_and_put() -> None:
+    cache = ConfigFileCache()
+
+    assert cache.get("mappings/a.json", "etag-1") is None
+    cache.put("mappings/a.json", "etag-1", {"a"})
+    assert {"a"} == cache.get("mappings/a.json", "etag-1")
+    assert cache.get("mappings/a.json", "etag-2") is None
+
+    assert 1 == cache.hits
+    assert 2 == cache.misses
+
+
+def test_retain() -> None:
+    cache = ConfigFileCache()
+    cache.put("mappings/a.json", "etag", {"a"})
+    cache.put("mappings/b.json", "etag", {"b"})
+    cache.put("filters/a.json", "etag", {"c"})
+
+    cache.retain("mappings/", {"mappings/b.json"})
+
+    assert cache.get("mappings/a.json", "etag") is None
+    assert {"b"} == cache.get("mappings/b.json", "etag")
+    assert {"c"} == cache.get("filters/a.json", "etag")
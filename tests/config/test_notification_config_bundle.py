@@ -0,0 +1,131 @@
+from typing import Any, Dict, List
+
+import pytest
+
+from src.config.notification_config_bundle import MappingIndex, NotificationConfigBundle
+from src.config.notification_filter_config import NotificationFilterConfig
+from src.config.notification_mapping_config import NotificationMappingConfig
+from src.data.exceptions import InvalidConfigException
+
+FILTER_FILES: Dict[str, List[Dict[str, Any]]] = {
+    "filters/a.json": [{"item": "bucket-a", "reason": "a reason"}],
+    "filters/b.json": [{"item": "bucket-b", "reason": "b reason"}, {"item": "bucket-a", "reason": "a reason"}],
+    "filters/c.json": [{"item_glob": "logs-*", "reason": "c reason", "accounts": ["111"]}],
+}
+MAPPING_FILES: Dict[str, List[Dict[str, Any]]] = {
+    "mappings/central.json": [{"channel": "central"}],
+    "mappings/team.json": [
+        {"channel": "team", "accounts": ["111", "222"], "compliance_item_types": ["s3_bucket"]},
+        {"channel": "team-items", "pagerduty_service": "service", "items": ["bucket-a"]},
+    ],
+}
+
+
+def test_compile() -> None:
+    bundle = NotificationConfigBundle.compile(FILTER_FILES, MAPPING_FILES)
+
+    assert {
+        NotificationFilterConfig(item="bucket-a", reason="a reason"),
+        NotificationFilterConfig(item="bucket-b", reason="b reason"),
+        NotificationFilterConfig(item_glob="logs-*", reason="c reason", accounts=["111"]),
+    } == bundle.filters
+    assert {
+        NotificationMappingConfig(channel="central"),
+        NotificationMappingConfig(channel="team", accounts=["111", "222"], compliance_item_types=["s3_bucket"]),
+        NotificationMappingConfig(channel="team-items", pagerduty_service="service", items=["bucket-a"]),
+    } == set(bundle.mappings)
+    assert 64 == len(bundle.version_hash)
+
+
+def test_version_hash_only_depends_on_the_config() -> None:
+    bundle = NotificationConfigBundle.compile(FILTER_FILES, MAPPING_FILES)
+    reordered = NotificationConfigBundle.compile(
+        {
+            "filters/all.json": FILTER_FILES["filters/c.json"]
+            + list(reversed(FILTER_FILES["filters/b.json"]))
+            + FILTER_FILES["filters/a.json"]
+        },
+        {"mappings/all.json": list(reversed(MAPPING_FILES["mappings/team.json"])) + [{"channel": "central"}]},
+    )
+    changed = NotificationConfigBundle.compile(FILTER_FILES, {"mappings/central.json": [{"channel": "other"}]})
+
+    assert bundle.version_hash == reordered.version_hash
+    assert bundle.mappings == reordered.mappings
+    assert bundle.version_hash != changed.version_hash
+
+
+def test_mapping_index() -> None:
+    mappings = NotificationConfigBundle.compile({}, MAPPING_FILES).mappings
+    index = MappingIndex.build(mappings)
+    position = {mapping.channel: position for position, mapping in enumerate(mappings)}
+
+    assert {"bucket-a": frozenset({position["team-items"]})} == index.values["items"]
+    assert {"111": frozenset({position["team"]}), "222": frozenset({position["team"]})} == index.values["accounts"]
+    assert frozenset({position["central"], position["team"]}) == index.wildcards["items"]
+    assert frozenset({position["central"], position["team-items"]}) == index.wildcards["compliance_item_types"]
+
+
+def test_round_trip() -> None:
+    bundle = NotificationConfigBundle.compile(FILTER_FILES, MAPPING_FILES)
+
+    loaded = NotificationConfigBundle.from_dict(bundle.to_dict())
+
+    assert bundle.version_hash == loaded.version_hash
+    assert bundle.filters == loaded.filters
+    assert bundle.mappings == loaded.mappings
+    assert bundle.mapping_index == loaded.mapping_index
+
+
+@pytest.mark.parametrize(
+    "filter_files,mapping_files,error",
+    [
+        ({"filters/a.json": [{"item": "a"}]}, {}, "invalid config file 'filters/a.json'.*reason"),
+        ({}, {"mappings/a.json": [{"channel": "a", "teams": ["a"]}]}, "invalid config file 'mappings/a.json'.*teams"),
+        ({}, {"mappings/a.json": {"channel": "a"}}, "invalid config file 'mappings/a.json': expected a list"),
+    ],
+)
+def test_compile_invalid_config(filter_files: Any, mapping_files: Any, error: str) -> None:
+    with pytest.raises(InvalidConfigException, match=error):
+        NotificationConfigBundle.compile(filter_files, mapping_files)
+
+
+@pytest.mark.parametrize(
+    "change,error",
+    [
+        ({"version": 1}, "unsupported notification config bundle version 1"),
+        ({"filters": []}, "notification config bundle hash mismatch"),
+        ({"indexes": {}}, "notification config bundle hash mismatch"),
+        ({"hash": None}, "notification config bundle hash mismatch"),
+    ],
+)
+def test_from_invalid_dict(change: Dict[str, Any], error: str) -> None:
+    bundle = {**NotificationConfigBundle.compile(FILTER_FILES, MAPPING_FILES).to_dict(), **change}
+
+    with pytest.raises(InvalidConfigException, match=error):
+        NotificationConfigBundle.from_dict(bundle)
+
+
+def test_from_dict_without_indexes() -> None:
+    bundle = NotificationConfigBundle.compile(FILTER_FILES, MAPPING_FILES).to_dict()
+    del bundle["indexes"]
+
+    with pytest.raises(InvalidConfigException, match="invalid notification config bundle: KeyError"):
+        NotificationConfigBundle.from_dict(bundle)
+
+
+def test_from_dict_with_a_stale_index() -> None:
+    bundle = NotificationConfigBundle.compile(FILTER_FILES, MAPPING_FILES).to_dict()
+    stale = NotificationConfigBundle.compile(FILTER_FILES, {"mappings/a.json": [{"channel": "other"}]}).to_dict()
+
+    with pytest.raises(InvalidConfigException, match="notification config bundle hash mismatch"):
+        NotificationConfigBundle.from_dict({**bundle, "indexes": stale["indexes"]})
+
+
+def test_unset_filter_fields_are_left_out() -> None:
+    bundle = NotificationConfigBundle.compile(FILTER_FILES, {})
+
+    assert [
+        {"item": "bucket-a", "reason": "a reason"},
+        {"item": "bucket-b", "reason": "b reason"},
+        {"accounts": ["111"], "item_glob": "logs-*", "reason": "c reason"},
+    ] == sorted(bundle.to_dict()["filters"], key=lambda f: f["reason"])
@@ -0,0 +1,78 @@
+from typing import Any
+from unittest.mock import Mock, call
+
+from src.config.config import Config
+from src.config.notification_config_bundle import NotificationConfigBundle
+from src.config.notification_config_snapshot import NotificationConfigSnapshot
+from src.config.notification_filter_config import NotificationFilterConfig
+from src.config.notification_mapping_config import NotificationMappingConfig
+from tests.test_types_generator import finding
+
+FILTERS = {NotificationFilterConfig(item="item-a", reason="a reason"), NotificationFilterConfig(item="b", reason="b")}
+MAPPINGS = {NotificationMappingConfig(channel="central")}
+
+
+def test_load() -> None:
+    config = Mock(
+        get_notification_config_bundle=Mock(return_value=None),
+        get_notification_filter_files=Mock(return_value=FILTERS),
+        get_notification_mapping_files=Mock(return_value=MAPPINGS),
+    )
+
+    snapshot = NotificationConfigSnapshot.load(config)
+
+    assert FILTERS == snapshot.filters
+    assert MAPPINGS == snapshot.mappings
+    assert 2 == snapshot.filter_count
+    assert 1 == snapshot.mapping_count
+    assert snapshot.load_seconds >= 0
+    assert snapshot.bundle is None
+    config.get_notification_filter_files.assert_called_once_with()
+    config.get_notification_mapping_files.assert_called_once_with()
+
+
+def test_load_without_a_bundle_looks_it_up_once(monkeypatch: Any) -> None:
+    monkeypatch.setenv("CONFIG_BUCKET", "buck")
+    monkeypatch.delenv("NOTIFICATION_CONFIG_BUNDLE_KEY", raising=False)
+    s3_client = Mock(list_object_etags=Mock(return_value={}))
+
+    NotificationConfigSnapshot.load(
+        Config(config_s3_client=s3_client, report_s3_client=Mock(), ssm_client=Mock(), org_client=Mock())
+    )
+
+    assert [
+        call("buck", "bundle/notification_config.json"),
+        call("buck", "filters/"),
+        call("buck", "mappings/"),
+    ] == s3_client.list_object_etags.call_args_list
+
+
+def test_load_from_bundle() -> None:
+    bundle = NotificationConfigBundle.compile(
+        {"filters/a.json": [{"item": "item-a", "reason": "a reason"}]}, {"mappings/a.json": [{"channel": "central"}]}
+    )
+    config = Mock(get_notification_config_bundle=Mock(return_value=bundle))
+
+    snapshot = NotificationConfigSnapshot.load(config)
+
+    assert {NotificationFilterConfig(item="item-a", reason="a reason")} == snapshot.filters
+    assert MAPPINGS == snapshot.mappings
+    assert bundle is snapshot.bundle
+    config.get_notification_filter_files.assert_not_called()
+    config.get_notification_mapping_files.assert_not_called()
+
+
+def test_router() -> None:
+    bundle = NotificationConfigBundle.compile({}, {"mappings/a.json": [{"channel": "central"}]})
+    item_finding = finding(item="item-a")
+
+    assert {"central"} == NotificationConfigSnapshot(set(), MAPPINGS).router.find_channels(item_finding)
+    assert {"central"} == NotificationConfigSnapshot(set(), MAPPINGS, bundle=bundle).router.find_channels(item_finding)
+
+
+def test_compiled_filter() -> None:
+    snapshot = NotificationConfigSnapshot(FILTERS, MAPPINGS)
+
+    assert snapshot.compiled_filter is snapshot.compiled_filter
+    assert snapshot.compiled_filter.suppresses("item-a")
+    assert not snapshot.compiled_filter.suppresses("item-c")
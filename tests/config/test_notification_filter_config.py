@@ -1,3 +1,4 @@
+from dataclasses import FrozenInstanceError
 from unittest import TestCase
 
 from src.config.notification_filter_config import NotificationFilterConfig
@@ -20,3 +21,39 @@ class TestNotificationFilterConfig(TestCase):
 
         with self.assertRaisesRegex(FilterConfigException, "reason"):
             NotificationFilterConfig.from_dict({"item": "an-item"})
+
+    def test_init_with_item_patterns_and_scope(self) -> None:
+        filter_config = NotificationFilterConfig.from_dict(
+            {
+                "item_glob": "team-a-*",
+                "reason": "a-reason",
+                "accounts": ["111", "222"],
+                "compliance_item_types": ["s3_bucket"],
+            }
+        )
+        self.assertEqual("team-a-*", filter_config.pattern)
+        self.assertEqual(frozenset({"111", "222"}), filter_config.accounts)
+        self.assertTrue(filter_config.is_scoped)
+        self.assertTrue(filter_config.in_scope("111", "s3_bucket"))
+        self.assertFalse(filter_config.in_scope("333", "s3_bucket"))
+        self.assertFalse(filter_config.in_scope("111", "iam_access_key"))
+        self.assertFalse(filter_config.in_scope(None, "s3_bucket"))
+
+        regex_config = NotificationFilterConfig.from_dict({"item_regex": "^tmp-[0-9]+$", "reason": "a-reason"})
+        self.assertEqual("^tmp-[0-9]+$", regex_config.pattern)
+        self.assertFalse(regex_config.is_scoped)
+        self.assertTrue(regex_config.in_scope(None, None))
+
+    def test_init_with_several_items(self) -> None:
+        with self.assertRaisesRegex(FilterConfigException, "exactly one of item, item_glob or item_regex"):
+            NotificationFilterConfig.from_dict({"item": "an-item", "item_glob": "an-*", "reason": "a-reason"})
+
+    def test_init_with_invalid_regex(self) -> None:
+        with self.assertRaisesRegex(FilterConfigException, "invalid item_regex 'tmp-\\[': unterminated"):
+            NotificationFilterConfig.from_dict({"item_regex": "tmp-[", "reason": "a-reason"})
+
+    def test_is_immutable(self) -> None:
+        filter_config = NotificationFilterConfig(item="an-item", reason="a-reason")
+        self.assertEqual(hash(filter_config), hash(NotificationFilterConfig(item="an-item", reason="a-reason")))
+        with self.assertRaises(FrozenInstanceError):
+            filter_config.item = "another-item"  # type: ignore
@@ -0,0 +1,83 @@
+import logging
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import boto3
+import pytest
+from moto import mock_aws
+
+from src.clients.aws_s3_client import AwsS3Client
+from src.notifiers.outbox import DirectoryOutbox, OutboxEntry, S3Outbox
+
+FAILED_AT = datetime(2024, 3, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+PAYLOAD = {"channelLookup": {"slackChannels": ["channel-a"]}, "text": "a-text"}
+
+
+def _clock() -> datetime:
+    return FAILED_AT
+
+
+def test_directory_outbox_round_trip(tmp_path: Path) -> None:
+    outbox = DirectoryOutbox(str(tmp_path), clock=_clock)
+
+    outbox.put("slack", "['channel-a']", PAYLOAD, "503 Service Unavailable")
+    outbox.put("pagerduty", "pd-service", {"routing_key": "key"}, "timed out")
+
+    keys = outbox.keys()
+    assert [key.split("/")[0] for key in keys] == ["pagerduty", "slack"]
+    assert keys[1].startswith("slack/20240301T123015123456-")
+    assert outbox.read(keys[1]) == OutboxEntry(
+        notifier="slack",
+        target="['channel-a']",
+        payload=PAYLOAD,
+        error="503 Service Unavailable",
+        failed_at="2024-03-01T12:30:15.123456+00:00",
+    )
+    assert not list(tmp_path.rglob("*.tmp"))
+
+    outbox.delete(keys[1])
+    assert outbox.keys() == keys[:1]
+
+
+def test_directory_outbox_put_failure_is_logged(tmp_path: Path, caplog: Any) -> None:
+    not_a_directory = tmp_path / "outbox"
+    not_a_directory.write_text("")
+
+    with caplog.at_level(logging.ERROR):
+        DirectoryOutbox(str(not_a_directory)).put("slack", "['channel-a']", PAYLOAD, "boom")
+
+    assert "unable to save slack notification for ['channel-a'] to the outbox" in caplog.text
+
+
+@mock_aws
+def test_s3_outbox_round_trip() -> None:
+    boto_s3 = boto3.client("s3", region_name="us-east-1")
+    boto_s3.create_bucket(Bucket="outbox-bucket")
+    boto_s3.put_object(Bucket="outbox-bucket", Key="unrelated.json", Body="{}")
+    outbox = S3Outbox(AwsS3Client(boto_s3), "outbox-bucket", "outbox/", clock=_clock)
+
+    outbox.put("slack", "['channel-a']", PAYLOAD, "503 Service Unavailable")
+
+    [key] = outbox.keys()
+    assert key.startswith("slack/20240301T123015123456-")
+    assert outbox.read(key).payload == PAYLOAD
+
+    outbox.delete(key)
+    assert outbox.keys() == []
+
+
+@mock_aws
+def test_s3_outbox_put_failure_is_logged(caplog: Any) -> None:
+    outbox = S3Outbox(AwsS3Client(boto3.client("s3", region_name="us-east-1")), "missing-bucket", "outbox/")
+
+    with caplog.at_level(logging.ERROR):
+        outbox.put("pagerduty", "pd-service", {}, "boom")
+
+    assert "unable to save pagerduty notification for pd-service to the outbox" in caplog.text
+    assert "missing-bucket" in caplog.text
+
+
+def test_outbox_entry_requires_all_fields() -> None:
+    with pytest.raises(KeyError):
+        OutboxEntry.from_dict({"notifier": "slack"})
@@ -5,9 +5,11 @@ from unittest.mock import Mock
 
 import httpretty
 import pytest
+from src.config.notification_config_snapshot import NotificationConfigSnapshot
 from src.config.notification_filter_config import NotificationFilterConfig
 from src.config.notification_mapping_config import NotificationMappingConfig
 from src.data.exceptions import PagerDutyNotifierException
+from src.notifiers.outbox import Outbox, OutboxEntry
 from src.notifiers.pagerduty_notifier import PagerDutyNotifier
 from tests.test_types_generator import _pagerduty_payload, _pagerduty_event
 
@@ -16,6 +18,10 @@ API_URL = "https://pagerduty/api"
 ROUTING_KEY = "pagerduty-routing-key"
 
 
+def _mock_config(**kwargs: Any) -> Mock:
+    return Mock(get_notification_config_bundle=Mock(return_value=None), **kwargs)
+
+
 def _register_pagerduty_api_success() -> None:
     httpretty.register_uri(
         httpretty.POST,
@@ -49,7 +55,7 @@ def __assert_payload_correct(source: str, component: str, routing_key: str) -> N
 
 def test_apply_filters() -> None:
     filters = {NotificationFilterConfig(item="dynamodb-resource-id", reason="good reason")}
-    mock_config = Mock(get_notification_filters=Mock(return_value=filters))
+    mock_config = _mock_config(get_notification_filter_files=Mock(return_value=filters))
 
     payload_1 = _pagerduty_payload(source="111122223333", component="mysql-resource-id")
     payload_2 = _pagerduty_payload(source="444455556666", component="dynamodb-resource-id")
@@ -62,9 +68,11 @@ def test_apply_filters() -> None:
 
 def test_apply_mappings() -> None:
     mappings = {NotificationMappingConfig(channel="central", pagerduty_service="service-0")}
-    mock_config = Mock(
-        get_notification_mappings=Mock(return_value=mappings),
-        ssm_client=Mock(get_parameter=Mock(return_value="service-0-routing-key")),
+    mock_config = _mock_config(
+        get_notification_mapping_files=Mock(return_value=mappings),
+        ssm_client=Mock(
+            get_parameters=Mock(return_value={"/service_accounts/pagerduty/service-0": "service-0-routing-key"})
+        ),
     )
 
     payload_1 = _pagerduty_payload(source="111122223333", component="mysql-resource-id")
@@ -79,6 +87,27 @@ def test_apply_mappings() -> None:
     assert expected == actual
 
 
+def test_uses_shared_notification_config() -> None:
+    filters = {NotificationFilterConfig(item="dynamodb-resource-id", reason="good reason")}
+    mappings = {NotificationMappingConfig(channel="central", pagerduty_service="service-0")}
+    mock_config = _mock_config(
+        ssm_client=Mock(
+            get_parameters=Mock(return_value={"/service_accounts/pagerduty/service-0": "service-0-routing-key"})
+        ),
+    )
+
+    payload_1 = _pagerduty_payload(source="111122223333", component="mysql-resource-id")
+    payload_2 = _pagerduty_payload(source="444455556666", component="dynamodb-resource-id")
+
+    notifier = PagerDutyNotifier(mock_config, NotificationConfigSnapshot(filters=filters, mappings=mappings))
+
+    assert [_pagerduty_event(payload=payload_1, service="service-0")] == notifier.apply_mappings(
+        notifier.apply_filters(payloads={payload_1, payload_2})
+    )
+    mock_config.get_notification_filter_files.assert_not_called()
+    mock_config.get_notification_mapping_files.assert_not_called()
+
+
 @httpretty.activate  # type: ignore
 def test_send_pagerduty_event_success(caplog: Any) -> None:
     _register_pagerduty_api_success()
@@ -86,7 +115,7 @@ def test_send_pagerduty_event_success(caplog: Any) -> None:
     pagerduty_event = _pagerduty_event(
         payload=_pagerduty_payload(source="111122223333", component="mysql-resource-id"), service="pd-service"
     )
-    mock_config = Mock(get_pagerduty_api_url=Mock(return_value=API_URL))
+    mock_config = _mock_config(get_pagerduty_api_url=Mock(return_value=API_URL))
     PagerDutyNotifier(mock_config).send_pagerduty_event(pagerduty_event=pagerduty_event)
 
     __assert_payload_correct(source="111122223333", component="mysql-resource-id", routing_key="pd-service-routing-key")
@@ -99,7 +128,7 @@ def test_send_pagerduty_event_failure() -> None:
     pagerduty_event = _pagerduty_event(
         payload=_pagerduty_payload(source="111122223333", component="mysql-resource-id"), service="pd-service"
     )
-    mock_config = Mock(get_pagerduty_api_url=Mock(return_value=API_URL))
+    mock_config = _mock_config(get_pagerduty_api_url=Mock(return_value=API_URL))
 
     with pytest.raises(PagerDutyNotifierException):
         PagerDutyNotifier(mock_config).send_pagerduty_event(pagerduty_event=pagerduty_event)
@@ -108,11 +137,11 @@ def test_send_pagerduty_event_failure() -> None:
 def test_handle_response() -> None:
     response = {"errors": ["error-1", "error-2"]}
     with pytest.raises(PagerDutyNotifierException):
-        PagerDutyNotifier(Mock())._handle_response(response=response, service="the-service")
+        PagerDutyNotifier(_mock_config())._handle_response(response=response, service="the-service")
 
     response = {"exclusions": ["exclusion-1", "exclusion-2"]}
     with pytest.raises(PagerDutyNotifierException):
-        PagerDutyNotifier(Mock())._handle_response(response=response, service="the-service")
+        PagerDutyNotifier(_mock_config())._handle_response(response=response, service="the-service")
 
 
 @httpretty.activate  # type: ignore
@@ -128,7 +157,7 @@ def test_send_multiple_pagerduty_event_success() -> None:
         ),
     ]
 
-    mock_config = Mock(get_pagerduty_api_url=Mock(return_value=API_URL))
+    mock_config = _mock_config(get_pagerduty_api_url=Mock(return_value=API_URL))
     PagerDutyNotifier(mock_config).send(pagerduty_events=pagerduty_events)
 
     __assert_payload_correct(source="111122223333", component="mysql-resource-id", routing_key="pd-service-routing-key")
@@ -149,7 +178,7 @@ def test_send_multiple_pagerduty_event_failure(caplog: Any) -> None:
             payload=_pagerduty_payload(source="111122223333", component="dynamodb-resource-id"), service="pd-service"
         ),
     ]
-    mock_config = Mock(get_pagerduty_api_url=Mock(return_value=API_URL))
+    mock_config = _mock_config(get_pagerduty_api_url=Mock(return_value=API_URL))
 
     with caplog.at_level(logging.ERROR):
         PagerDutyNotifier(mock_config).send(pagerduty_events=pagerduty_events)
@@ -157,3 +186,53 @@ def test_send_multiple_pagerduty_event_failure(caplog: Any) -> None:
     assert len(caplog.records) == 2
     assert caplog.records[0].levelname == "ERROR"
     assert "unable to event to pagerduty service pd-service" in caplog.text
+
+
+@httpretty.activate  # type: ignore
+def test_failed_events_are_saved_to_the_outbox() -> None:
+    _register_slack_api_failure(400)
+    pagerduty_event = _pagerduty_event(
+        payload=_pagerduty_payload(source="111122223333", component="mysql-resource-id"), service="pd-service"
+    )
+    outbox = Mock(spec=Outbox)
+
+    PagerDutyNotifier(_mock_config(get_pagerduty_api_url=Mock(return_value=API_URL)), outbox=outbox).send(
+        [pagerduty_event]
+    )
+
+    outbox.put.assert_called_once()
+    notifier, target, payload, error = outbox.put.call_args.args
+    assert (notifier, target) == ("pagerduty", "pd-service")
+    assert "routing_key" not in payload
+    assert payload == {key: value for key, value in pagerduty_event.to_dict().items() if key != "routing_key"}
+    assert "400" in error
+
+
+@httpretty.activate  # type: ignore
+def test_replay() -> None:
+    _register_pagerduty_api_success()
+    pagerduty_event = _pagerduty_event(
+        payload=_pagerduty_payload(source="111122223333", component="mysql-resource-id"), service="pd-service"
+    )
+    payload = pagerduty_event.to_dict()
+    del payload["routing_key"]
+    entry = OutboxEntry(
+        notifier="pagerduty",
+        target="pd-service",
+        payload=payload,
+        error="timed out",
+        failed_at="2024-03-01T12:30:15+00:00",
+    )
+    ssm_client = Mock(
+        get_parameters=Mock(return_value={"/service_accounts/pagerduty/pd-service": "fetched-routing-key"})
+    )
+
+    PagerDutyNotifier(_mock_config(get_pagerduty_api_url=Mock(return_value=API_URL), ssm_client=ssm_client)).replay(
+        entry
+    )
+
+    __assert_payload_correct(source="111122223333", component="mysql-resource-id", routing_key="fetched-routing-key")
+    ssm_client.get_parameters.assert_called_once()
+    assert ["/service_accounts/pagerduty/pd-service"] == list(
+        ssm_client.get_parameters.call_args.kwargs["parameter_names"]
+    )
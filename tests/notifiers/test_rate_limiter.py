@@ -0,0 +1,76 @@
+from typing import List
+
+from src.notifiers.rate_limiter import RateLimiter
+
+
+class FakeTime:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: List[float] = []
+
+    def clock(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(round(seconds, 3))
+        self.now += seconds
+
+
+def test_unlimited_by_default() -> None:
+    time = FakeTime()
+    limiter = RateLimiter(clock=time.clock, sleep=time.sleep)
+
+    for _ in range(100):
+        limiter.acquire(["channel"])
+
+    assert [] == time.sleeps
+
+
+def test_global_rate_allows_a_burst_then_paces() -> None:
+    time = FakeTime()
+    limiter = RateLimiter(per_minute=120, clock=time.clock, sleep=time.sleep)
+
+    for channel in ["a", "b", "c", "d"]:
+        limiter.acquire([channel])
+
+    assert [0.5, 0.5] == time.sleeps
+
+
+def test_channel_rate_only_paces_that_channel() -> None:
+    time = FakeTime()
+    limiter = RateLimiter(channel_per_minute=60, clock=time.clock, sleep=time.sleep)
+
+    limiter.acquire(["a"])
+    limiter.acquire(["b"])
+    assert [] == time.sleeps
+
+    limiter.acquire(["a", "b"])
+    assert [1.0] == time.sleeps
+
+    time.now += 5
+    limiter.acquire(["a"])
+    assert [1.0] == time.sleeps
+
+
+def test_pause_delays_every_channel() -> None:
+    time = FakeTime()
+    limiter = RateLimiter(clock=time.clock, sleep=time.sleep)
+
+    limiter.pause(3)
+    limiter.pause(1)
+    limiter.acquire(["a"])
+    limiter.acquire(["b"])
+
+    assert [3.0] == time.sleeps
+
+
+def test_acquire_past_the_deadline_neither_waits_nor_uses_a_token() -> None:
+    time = FakeTime()
+    limiter = RateLimiter(per_minute=6, clock=time.clock, sleep=time.sleep)
+
+    assert limiter.acquire(["a"], deadline=5)
+    assert not limiter.acquire(["a"], deadline=5)
+    assert [] == time.sleeps
+
+    assert limiter.acquire(["a"], deadline=10)
+    assert [10.0] == time.sleeps
@@ -0,0 +1,231 @@
+import logging
+from typing import Any, Callable, List, Optional
+from unittest.mock import Mock
+
+import pytest
+import requests
+
+from src.data.exceptions import CircuitOpenException
+from src.notifiers.resilience import CircuitBreaker, Resilience, build_resilience, is_retryable
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _http_error(status: int) -> requests.HTTPError:
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(f"{status} error", response=response)
+
+
+def _calls(*outcomes: Any) -> Callable[[], str]:
+    remaining = list(outcomes)
+
+    def call() -> str:
+        outcome = remaining.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return str(outcome)
+
+    return call
+
+
+def _resilience(breaker: CircuitBreaker, max_attempts: int = 3, sleeps: Optional[List[float]] = None) -> Resilience:
+    return Resilience(
+        "test",
+        breaker=breaker,
+        max_attempts=max_attempts,
+        uniform=lambda low, high: high,
+        sleep=(sleeps if sleeps is not None else []).append,
+    )
+
+
+@pytest.mark.parametrize(
+    "err,expected",
+    [
+        (requests.ConnectionError("refused"), True),
+        (requests.ConnectTimeout("slow"), True),
+        (requests.ReadTimeout("slow"), False),
+        (requests.Timeout("slow"), False),
+        (_http_error(503), True),
+        (_http_error(404), False),
+        (requests.HTTPError("no response"), False),
+        (ValueError("boom"), False),
+    ],
+)
+def test_is_retryable(err: Exception, expected: bool) -> None:
+    assert expected == is_retryable(err)
+
+
+def test_retries_with_decorrelated_jitter_up_to_a_cap() -> None:
+    sleeps: List[float] = []
+    resilience = _resilience(CircuitBreaker(error_rate=1, open_seconds=30), max_attempts=5, sleeps=sleeps)
+    errors = [requests.ConnectionError("refused")] * 4
+
+    assert "ok" == resilience.call(_calls(*errors, "ok"))
+    assert [0.6, 1.8, 2.0, 2.0] == [round(delay, 3) for delay in sleeps]
+    assert 4 == resilience.retries
+
+
+def test_gives_up_after_max_attempts() -> None:
+    resilience = _resilience(CircuitBreaker(error_rate=1, open_seconds=30), sleeps=None)
+
+    with pytest.raises(requests.ConnectionError):
+        resilience.call(_calls(*[requests.ConnectionError("refused")] * 3))
+
+    assert 2 == resilience.retries
+
+
+def test_does_not_retry_other_errors() -> None:
+    resilience = _resilience(CircuitBreaker(error_rate=1, open_seconds=30))
+
+    with pytest.raises(requests.HTTPError):
+        resilience.call(_calls(_http_error(400), "ok"))
+
+    assert 0 == resilience.retries
+
+
+def test_read_timeouts_are_not_retried_but_count_as_failures() -> None:
+    breaker = CircuitBreaker(error_rate=1, open_seconds=30, window=1)
+    resilience = _resilience(breaker)
+
+    with pytest.raises(requests.ReadTimeout):
+        resilience.call(_calls(requests.ReadTimeout("slow"), "ok"))
+
+    assert 0 == resilience.retries
+    assert breaker.is_open
+
+
+def test_circuit_opens_once_the_error_rate_is_reached_and_fails_fast() -> None:
+    clock = FakeClock()
+    breaker = CircuitBreaker(error_rate=0.5, open_seconds=30, window=4, clock=clock)
+    resilience = _resilience(breaker, max_attempts=1)
+
+    for outcome in ["ok", "ok", requests.ConnectionError("refused")]:
+        try:
+            resilience.call(_calls(outcome))
+        except requests.ConnectionError:
+            pass
+    assert not breaker.is_open
+
+    with pytest.raises(requests.ConnectionError):
+        resilience.call(_calls(requests.ConnectionError("refused")))
+    assert breaker.is_open
+
+    unexpected_call = Mock()
+    with pytest.raises(CircuitOpenException):
+        resilience.call(unexpected_call)
+    unexpected_call.assert_not_called()
+    assert 1 == breaker.rejected
+
+
+def test_open_circuit_stops_retrying() -> None:
+    breaker = CircuitBreaker(error_rate=1, open_seconds=30, window=2)
+    resilience = _resilience(breaker, max_attempts=5, sleeps=None)
+
+    with pytest.raises(requests.ConnectionError):
+        resilience.call(_calls(*[requests.ConnectionError("refused")] * 5))
+
+    assert 1 == resilience.retries
+
+
+def test_a_trial_call_closes_or_reopens_the_circuit() -> None:
+    clock = FakeClock()
+    breaker = CircuitBreaker(error_rate=1, open_seconds=30, window=1, clock=clock)
+    resilience = _resilience(breaker, max_attempts=1)
+
+    with pytest.raises(requests.ConnectionError):
+        resilience.call(_calls(requests.ConnectionError("refused")))
+    clock.now = 30
+    with pytest.raises(requests.ConnectionError):
+        resilience.call(_calls(requests.ConnectionError("still refused")))
+    assert breaker.is_open
+    assert 30 == breaker.open_seconds
+
+    clock.now = 45
+    with pytest.raises(CircuitOpenException):
+        resilience.call(_calls("ok"))
+    clock.now = 60
+    assert "ok" == resilience.call(_calls("ok"))
+    assert not breaker.is_open
+    assert 60 == breaker.open_seconds
+
+
+def test_a_trial_call_failing_with_another_error_is_released() -> None:
+    clock = FakeClock()
+    breaker = CircuitBreaker(error_rate=1, open_seconds=30, window=1, clock=clock)
+    resilience = _resilience(breaker, max_attempts=1)
+    breaker.record(success=False)
+
+    clock.now = 30
+    with pytest.raises(ValueError):
+        resilience.call(_calls(ValueError("not json")))
+    assert breaker.is_open
+
+    clock.now = 1000
+    assert "ok" == resilience.call(_calls("ok"))
+    assert not breaker.is_open
+
+
+def test_a_trial_call_answered_with_a_client_error_closes_the_circuit() -> None:
+    clock = FakeClock()
+    breaker = CircuitBreaker(error_rate=1, open_seconds=30, window=1, clock=clock)
+    breaker.record(success=False)
+
+    clock.now = 30
+    with pytest.raises(requests.HTTPError):
+        _resilience(breaker, max_attempts=1).call(_calls(_http_error(429)))
+    assert not breaker.is_open
+
+
+def test_only_one_trial_call_at_a_time() -> None:
+    clock = FakeClock()
+    breaker = CircuitBreaker(error_rate=1, open_seconds=30, window=1, clock=clock)
+    breaker.record(success=False)
+    clock.now = 30
+
+    breaker.before_call()
+    with pytest.raises(CircuitOpenException):
+        breaker.before_call()
+    breaker.record(success=True)
+    breaker.before_call()
+
+
+def test_late_outcomes_do_not_close_an_open_circuit() -> None:
+    breaker = CircuitBreaker(error_rate=1, open_seconds=30, window=1)
+    breaker.record(success=False)
+    breaker.record(success=True)
+
+    assert breaker.is_open
+
+
+def test_log_metrics(caplog: Any) -> None:
+    clock = FakeClock()
+    breaker = CircuitBreaker(error_rate=1, open_seconds=30, window=1, clock=clock)
+    resilience = _resilience(breaker, max_attempts=2, sleeps=None)
+
+    with caplog.at_level(logging.INFO):
+        resilience.log_metrics()
+        assert "" == caplog.text
+
+        with pytest.raises(requests.ConnectionError):
+            resilience.call(_calls(requests.ConnectionError("refused")))
+        with pytest.raises(CircuitOpenException):
+            resilience.call(_calls("ok"))
+        clock.now = 12.5
+        resilience.log_metrics()
+
+    assert "test calls retried 0 times, 1 failed fast while the circuit was open, circuit open for 12.5s" in caplog.text
+
+
+def test_build_resilience(monkeypatch: Any) -> None:
+    monkeypatch.setenv("NOTIFIER_MAX_ATTEMPTS", "1")
+    resilience = build_resilience("slack")
+
+    with pytest.raises(requests.ConnectionError):
+        resilience.call(_calls(requests.ConnectionError("refused"), "ok"))
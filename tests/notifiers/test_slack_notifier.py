@@ -1,15 +1,24 @@
+import asyncio
 import logging
-from typing import Any, Dict
-from unittest.mock import Mock
+import time
+from threading import Barrier, Lock
+from typing import Any, Dict, Optional, Tuple
+from unittest.mock import Mock, patch
 
 import httpretty
 import json
 import pytest
+from src.config.notification_config_snapshot import NotificationConfigSnapshot
 from src.config.slack_notifier_config import SlackNotifierConfig
 from src.data.exceptions import SlackNotifierException
 
 from src.data.slack_message import SlackMessage
+from src.notification_mapper import NotificationMapper
+from src.notifiers.outbox import Outbox, OutboxEntry
+from src.notifiers.rate_limiter import RateLimiter
+from src.notifiers.resilience import CircuitBreaker, Resilience
 from src.notifiers.slack_notifier import SlackNotifier
+from tests.stub_http_server import stub_http_server
 
 
 TEST_COLOUR = "some-colour"
@@ -28,14 +37,20 @@ SLACK_EMOJI = ":test-emoji:"
 SERVICE_NAME = "test-service"
 
 
-def _create_slack_notifier() -> SlackNotifier:
+def _create_slack_notifier(api_url: str = TEST_SLACK_API_URL, outbox: Optional[Outbox] = None) -> SlackNotifier:
     slack_notifier_config = SlackNotifierConfig(
         API_V2_KEY,
-        TEST_SLACK_API_URL,
+        api_url,
         SLACK_EMOJI,
         SERVICE_NAME,
     )
-    return SlackNotifier(Mock(get_slack_notifier_config=Mock(return_value=slack_notifier_config)))
+    return SlackNotifier(
+        Mock(
+            get_slack_notifier_config=Mock(return_value=slack_notifier_config),
+            get_notification_config_bundle=Mock(return_value=None),
+        ),
+        outbox=outbox,
+    )
 
 
 def _register_slack_api_success() -> None:
@@ -107,7 +122,7 @@ def test_send_message_with_no_channel() -> None:
 @httpretty.activate  # type: ignore
 def test_send_messages(caplog: Any) -> None:
     _register_slack_api_success()
-    _register_slack_api_failure(500)
+    _register_slack_api_failure(400)
     _register_slack_api_success()
     messages = [
         SlackMessage(["channel"], "success-heading-1", "title", "a-text", TEST_COLOUR, ":test-emoji:", "test-service"),
@@ -131,11 +146,198 @@ def test_send_messages(caplog: Any) -> None:
         [{"text": {"text": "Unknown Service", "type": "mrkdwn"}, "type": "section"}, {"type": "divider"}]
     )
     assert "failure-heading" in caplog.text
-    assert "500" in caplog.text
+    assert "400" in caplog.text
     assert "success-heading-1" not in caplog.text
     assert "success-heading-2" not in caplog.text
 
 
+def test_send_messages_concurrently(caplog: Any, monkeypatch: Any) -> None:
+    monkeypatch.setenv("SLACK_DELIVERY_CONCURRENCY", "4")
+    barrier = Barrier(4, timeout=5)
+    received = []
+
+    def respond(path: str, body: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        barrier.wait()
+        received.append(body["blocks"][0]["text"]["text"])
+        return (400, {}) if received[-1].startswith("failure") else (200, {})
+
+    headings = ["failure-heading-1", "success-heading-1", "failure-heading-2", "success-heading-2"]
+    messages = [
+        SlackMessage(["channel"], h, "title", "a-text", TEST_COLOUR, ":test-emoji:", "test-service") for h in headings
+    ]
+
+    with stub_http_server(respond) as url, caplog.at_level(logging.INFO):
+        _create_slack_notifier(api_url=url).send_messages(messages)
+
+    assert sorted(headings) == sorted(received)
+    assert ["failure-heading-1", "failure-heading-2"] == [
+        heading for record in caplog.records for heading in headings if f"'{heading}'" in record.getMessage()
+    ]
+
+
+def test_send_async_bounds_concurrency(caplog: Any, monkeypatch: Any) -> None:
+    monkeypatch.setenv("SLACK_DELIVERY_CONCURRENCY", "2")
+    lock, in_flight, most_in_flight = Lock(), [0], [0]
+
+    def respond(path: str, body: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        with lock:
+            in_flight[0] += 1
+            most_in_flight[0] = max(most_in_flight[0], in_flight[0])
+        time.sleep(0.05)
+        with lock:
+            in_flight[0] -= 1
+        return (400, {}) if body["blocks"][0]["text"]["text"].startswith("failure") else (200, {})
+
+    headings = ["success-heading-1", "failure-heading-1", "success-heading-2", "failure-heading-2"]
+    messages = [
+        SlackMessage(["channel"], h, "title", "a-text", TEST_COLOUR, ":test-emoji:", "test-service") for h in headings
+    ]
+
+    with stub_http_server(respond) as url, caplog.at_level(logging.INFO):
+        asyncio.run(_create_slack_notifier(api_url=url).send_async(messages))
+
+    assert 2 == most_in_flight[0]
+    assert ["failure-heading-1", "failure-heading-2"] == [
+        heading for record in caplog.records for heading in headings if f"'{heading}'" in record.getMessage()
+    ]
+
+
+@httpretty.activate  # type: ignore
+def test_rate_limited_messages_are_retried(caplog: Any) -> None:
+    httpretty.register_uri(
+        httpretty.POST,
+        TEST_SLACK_API_URL,
+        responses=[
+            httpretty.Response(body="{}", status=429, adding_headers={"Retry-After": "0"}),
+            httpretty.Response(body="{}", status=429),
+            httpretty.Response(body="{}", status=200),
+        ],
+    )
+    notifier = _create_slack_notifier()
+    notifier._rate_limiter = RateLimiter(sleep=Mock())
+
+    with caplog.at_level(logging.INFO):
+        notifier.send_messages([SLACK_MESSAGE])
+
+    assert "unable to send message" not in caplog.text
+    assert "rate limited by slack, retrying in 0.0s: ['channel-a', 'channel-b']" in caplog.text
+    assert "rate limited by slack, retrying in 1.0s: ['channel-a', 'channel-b']" in caplog.text
+
+
+@httpretty.activate  # type: ignore
+def test_rate_limited_messages_are_dropped_after_the_retry_budget(caplog: Any, monkeypatch: Any) -> None:
+    monkeypatch.setenv("SLACK_RETRY_BUDGET_SECONDS", "10")
+    httpretty.register_uri(
+        httpretty.POST, TEST_SLACK_API_URL, body="{}", status=429, adding_headers={"Retry-After": "30"}
+    )
+
+    with caplog.at_level(logging.INFO):
+        _create_slack_notifier().send_messages([SLACK_MESSAGE])
+
+    assert "rate limited by slack, retrying" not in caplog.text
+    assert "unable to send message to channels ['channel-a', 'channel-b']: rate limited" in caplog.text
+
+
+@httpretty.activate  # type: ignore
+def test_messages_throttled_past_the_retry_budget_are_saved_to_the_outbox(monkeypatch: Any) -> None:
+    monkeypatch.setenv("SLACK_RETRY_BUDGET_SECONDS", "15")
+    monkeypatch.setenv("SLACK_DELIVERY_CONCURRENCY", "1")
+    _register_slack_api_success()
+    outbox = Mock(spec=Outbox)
+    sleep = Mock()
+    notifier = _create_slack_notifier(outbox=outbox)
+    notifier._rate_limiter = RateLimiter(per_minute=6, sleep=sleep)
+    messages = [SlackMessage(["channel-a"], "a-heading", f"title-{i}", "a-text", "#c1e7c6", "", "") for i in range(3)]
+
+    notifier.send_messages(messages)
+
+    assert "title-1" in httpretty.last_request().body.decode()
+    sleep.assert_called_once()
+    outbox.put.assert_called_once()
+    _, target, payload, error = outbox.put.call_args.args
+    assert (target, payload) == ("['channel-a']", messages[2].to_dict())
+    assert "throttled past the retry budget" in error
+
+
+@httpretty.activate  # type: ignore
+def test_retry_budget_starts_when_sending_starts(caplog: Any) -> None:
+    httpretty.register_uri(
+        httpretty.POST,
+        TEST_SLACK_API_URL,
+        responses=[
+            httpretty.Response(body="{}", status=429, adding_headers={"Retry-After": "30"}),
+            httpretty.Response(body="{}", status=200),
+        ],
+    )
+    with patch("src.notifiers.slack_notifier.monotonic", return_value=0.0) as monotonic:
+        notifier = _create_slack_notifier()
+        notifier._rate_limiter = RateLimiter(clock=monotonic, sleep=Mock())
+        monotonic.return_value = 100.0
+
+        with caplog.at_level(logging.INFO):
+            notifier.send_messages([SLACK_MESSAGE])
+
+    assert "rate limited by slack, retrying in 30.0s" in caplog.text
+    assert "unable to send message" not in caplog.text
+
+
+@httpretty.activate  # type: ignore
+def test_retry_budget_is_capped_by_the_lambda_remaining_time(caplog: Any) -> None:
+    httpretty.register_uri(
+        httpretty.POST, TEST_SLACK_API_URL, body="{}", status=429, adding_headers={"Retry-After": "10"}
+    )
+    notifier = SlackNotifier(
+        Mock(
+            get_slack_notifier_config=Mock(
+                return_value=SlackNotifierConfig(API_V2_KEY, TEST_SLACK_API_URL, SLACK_EMOJI, SERVICE_NAME)
+            ),
+            get_notification_config_bundle=Mock(return_value=None),
+        ),
+        remaining_millis=lambda: 20_000,
+    )
+
+    with caplog.at_level(logging.INFO):
+        notifier.send_messages([SLACK_MESSAGE])
+
+    assert "rate limited by slack, retrying" not in caplog.text
+    assert "unable to send message to channels ['channel-a', 'channel-b']: rate limited" in caplog.text
+
+
+@httpretty.activate  # type: ignore
+def test_server_errors_are_retried(caplog: Any) -> None:
+    httpretty.register_uri(
+        httpretty.POST,
+        TEST_SLACK_API_URL,
+        responses=[httpretty.Response(body="{}", status=503), httpretty.Response(body="{}", status=200)],
+    )
+    notifier = _create_slack_notifier()
+    notifier._resilience = Resilience("slack", breaker=CircuitBreaker(error_rate=1, open_seconds=30), sleep=Mock())
+
+    with caplog.at_level(logging.INFO):
+        notifier.send_messages([SLACK_MESSAGE])
+
+    assert "unable to send message" not in caplog.text
+    assert "slack calls retried 1 times, 0 failed fast while the circuit was open" in caplog.text
+
+
+def test_open_circuit_fails_fast(caplog: Any) -> None:
+    notifier = _create_slack_notifier()
+    breaker = CircuitBreaker(error_rate=1, open_seconds=30, window=1)
+    breaker.record(success=False)
+    notifier._resilience = Resilience("slack", breaker=breaker)
+
+    with caplog.at_level(logging.INFO):
+        notifier.send_messages([SLACK_MESSAGE])
+
+    assert "unable to send message to channels ['channel-a', 'channel-b']: circuit open" in caplog.text
+    assert "1 failed fast while the circuit was open" in caplog.text
+
+
+@pytest.mark.parametrize("header,expected", [(None, 1.0), ("2", 2.0), ("0.5", 0.5), ("-1", 0.0), ("soon", 1.0)])
+def test_retry_after(header: Optional[str], expected: float) -> None:
+    assert expected == SlackNotifier._retry_after(header)
+
+
 @httpretty.activate  # type: ignore
 def test_request_failure() -> None:
     _register_slack_api_failure(403)
@@ -154,3 +356,78 @@ def test_slack_failure() -> None:
         _create_slack_notifier().send_message(SLACK_MESSAGE)
 
     assert sne.match("'channel-a', 'channel-b'")
+
+
+@httpretty.activate  # type: ignore
+def test_failed_messages_are_saved_to_the_outbox() -> None:
+    _register_slack_api_failure(400)
+    outbox = Mock(spec=Outbox)
+
+    _create_slack_notifier(outbox=outbox).send_messages([SLACK_MESSAGE])
+
+    outbox.put.assert_called_once()
+    notifier, target, payload, error = outbox.put.call_args.args
+    assert (notifier, target, payload) == ("slack", "['channel-a', 'channel-b']", SLACK_MESSAGE.to_dict())
+    assert "400" in error
+
+
+def _outbox_entry() -> OutboxEntry:
+    return OutboxEntry(
+        notifier="slack",
+        target="['channel-a', 'channel-b']",
+        payload=SLACK_MESSAGE.to_dict(),
+        error="400 Client Error",
+        failed_at="2024-03-01T12:30:15+00:00",
+    )
+
+
+@httpretty.activate  # type: ignore
+def test_replay() -> None:
+    _register_slack_api_success()
+    _create_slack_notifier().replay(_outbox_entry())
+    _assert_headers_correct()
+    _assert_payload_correct()
+
+
+@httpretty.activate  # type: ignore
+def test_replay_failure() -> None:
+    _register_slack_api_failure(403)
+
+    with pytest.raises(SlackNotifierException, match="403"):
+        _create_slack_notifier().replay(_outbox_entry())
+
+
+def test_apply_mappings_coalesces_messages_when_enabled(caplog: Any, monkeypatch: Any) -> None:
+    messages = [
+        SlackMessage(["channel"], "heading", f"title-{index}", "text", TEST_COLOUR, SLACK_EMOJI, SERVICE_NAME)
+        for index in range(3)
+    ]
+    notifier = SlackNotifier(
+        Mock(get_slack_notifier_config=Mock(return_value=Mock())),
+        notification_config=NotificationConfigSnapshot(filters=set(), mappings=set()),
+    )
+
+    with patch.object(NotificationMapper, "do_map", return_value=messages):
+        monkeypatch.delenv("COALESCE_SLACK_MESSAGES", raising=False)
+        assert notifier.apply_mappings(set()) == messages
+
+        monkeypatch.setenv("COALESCE_SLACK_MESSAGES", "true")
+        with caplog.at_level(logging.INFO):
+            [coalesced] = notifier.apply_mappings(set())
+
+    assert [attachment["title"] for attachment in coalesced.attachments] == ["title-0", "title-1", "title-2"]
+    assert "coalesced 3 slack messages into 1" in caplog.text
+
+
+def test_apply_mappings_splits_oversized_text(caplog: Any) -> None:
+    message = SlackMessage(["channel"], "heading", "title", "a" * 20_000 + "\n" + "b" * 20_000, TEST_COLOUR, "", "")
+    notifier = SlackNotifier(
+        Mock(get_slack_notifier_config=Mock(return_value=Mock())),
+        notification_config=NotificationConfigSnapshot(filters=set(), mappings=set()),
+    )
+
+    with patch.object(NotificationMapper, "do_map", return_value=[message]), caplog.at_level(logging.INFO):
+        chunks = notifier.apply_mappings(set())
+
+    assert [chunk.title for chunk in chunks] == ["title (1/2)", "title (2/2)"]
+    assert "split oversized slack message text into 2 messages" in caplog.text
@@ -0,0 +1,25 @@
+from unittest.mock import Mock
+
+from src.alerter_context import AlerterContext
+
+
+def test_config_is_reused_between_invocations() -> None:
+    builder = Mock(side_effect=lambda: Mock())
+    context = AlerterContext(builder)
+
+    config = context.get_config()
+
+    assert config is context.get_config()
+    assert config is context.get_config()
+    builder.assert_called_once()
+
+
+def test_reset() -> None:
+    builder = Mock(side_effect=lambda: Mock())
+    context = AlerterContext(builder)
+
+    first = context.get_config()
+    context.reset()
+
+    assert first is not context.get_config()
+    assert 2 == builder.call_count
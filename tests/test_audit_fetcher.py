@@ -13,6 +13,22 @@ class TestAuditFetcher(TestCase):
         event = {"Records": [{"eventVersion": "2.1", "s3": {"bucket": {"name": "buck"}, "object": {"key": "report"}}}]}
         self.assertEqual(Audit(type="report", report=report), AuditFetcher().fetch_audit(s3, event))
 
+    def test_fetch_audit_stream(self) -> None:
+        report = iter([{"some_key": "some value"}])
+        s3 = Mock(stream_object=Mock(side_effect=lambda b, k: report if b == "buck" and k == "report" else None))
+        event = {"Records": [{"eventVersion": "2.1", "s3": {"bucket": {"name": "buck"}, "object": {"key": "report"}}}]}
+        self.assertEqual(Audit(type="report", report=report), AuditFetcher(stream=True).fetch_audit(s3, event))
+        s3.read_object.assert_not_called()
+
+    def test_fetch_compressed_audit_is_streamed(self) -> None:
+        report = iter([{"some_key": "some value"}])
+        s3 = Mock(stream_object=Mock(side_effect=lambda b, k: report if b == "buck" and k == "report.gz" else None))
+        event = {
+            "Records": [{"eventVersion": "2.1", "s3": {"bucket": {"name": "buck"}, "object": {"key": "report.gz"}}}]
+        }
+        self.assertEqual(Audit(type="report.gz", report=report), AuditFetcher().fetch_audit(s3, event))
+        s3.read_object.assert_not_called()
+
     def test_fetch_audit_unsupported_event(self) -> None:
         with self.assertRaisesRegex(UnsupportedEventException, "expected event version >=2 and <3"):
             AuditFetcher().fetch_audit(Mock(), {})
@@ -22,3 +38,22 @@ class TestAuditFetcher(TestCase):
 
         with self.assertRaisesRegex(UnsupportedEventException, "'eventVersion': '3.0'"):
             AuditFetcher().fetch_audit(Mock(), {"Records": [{"eventVersion": "3.0"}]})
+
+    def test_fetch_record_audit(self) -> None:
+        report = [{"some_key": "some value"}]
+        s3 = Mock(read_object=Mock(side_effect=lambda b, k: report if b == "buck" and k == "report" else None))
+        record = {"eventVersion": "2.1", "s3": {"bucket": {"name": "buck"}, "object": {"key": "report"}}}
+        self.assertEqual(Audit(type="report", report=report), AuditFetcher().fetch_record_audit(s3, record))
+
+    def test_fetch_record_audit_unsupported_record(self) -> None:
+        with self.assertRaisesRegex(UnsupportedEventException, "'eventVersion': '1.9'"):
+            AuditFetcher().fetch_record_audit(Mock(), {"eventVersion": "1.9"})
+
+    def test_read_records(self) -> None:
+        records = [{"eventVersion": "2.1", "s3": {"object": {"key": f"report-{i}"}}} for i in range(3)]
+        self.assertEqual(records, AuditFetcher.read_records({"Records": records}))
+        self.assertEqual([{}], AuditFetcher.read_records({}))
+
+    def test_record_key(self) -> None:
+        self.assertEqual("report", AuditFetcher.record_key({"s3": {"object": {"key": "report"}}}))
+        self.assertEqual("unknown", AuditFetcher.record_key({}))
@@ -0,0 +1,123 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.compiled_filter import CompiledFilter, _literal_prefix
+from src.config.notification_filter_config import NotificationFilterConfig
+
+item_filter = NotificationFilterConfig(item="item-a", reason="a reason")
+other_reason_filter = NotificationFilterConfig(item="item-a", reason="another reason")
+other_item_filter = NotificationFilterConfig(item="item-b", reason="b reason")
+
+
+def test_match() -> None:
+    compiled_filter = CompiledFilter({item_filter, other_reason_filter, other_item_filter})
+
+    assert item_filter == compiled_filter.match("item-a")
+    assert other_item_filter == compiled_filter.match("item-b")
+    assert compiled_filter.match("item-c") is None
+    assert {} == compiled_filter.suppressed
+
+
+def test_suppresses_counts_per_filter() -> None:
+    compiled_filter = CompiledFilter({item_filter, other_item_filter})
+
+    assert [True, True, False, True] == [
+        compiled_filter.suppresses(item) for item in ["item-a", "item-a", "item-c", "item-b"]
+    ]
+    assert {"item-a": 2, "item-b": 1} == compiled_filter.suppressed
+
+
+def test_suppresses_from_several_threads() -> None:
+    compiled_filter = CompiledFilter({item_filter})
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(compiled_filter.suppresses, ["item-a"] * 1000))
+
+    assert {"item-a": 1000} == compiled_filter.suppressed
+
+
+def test_exact_items_do_not_need_patterns() -> None:
+    compiled_filter = CompiledFilter({item_filter, other_item_filter})
+
+    assert [] == compiled_filter._pattern_groups
+
+
+def test_match_patterns() -> None:
+    glob_filter = NotificationFilterConfig(item_glob="team-a-*-logs", reason="logs")
+    regex_filter = NotificationFilterConfig(item_regex="tmp-[0-9]+", reason="temporary")
+    compiled_filter = CompiledFilter({item_filter, glob_filter, regex_filter})
+
+    assert item_filter == compiled_filter.match("item-a")
+    assert glob_filter == compiled_filter.match("team-a-eu-west-2-logs")
+    assert compiled_filter.match("team-a-eu-west-2-logs-copy") is None
+    assert regex_filter == compiled_filter.match("tmp-123")
+    assert compiled_filter.match("tmp-123a") is None
+    assert compiled_filter.match("old-tmp-123") is None
+
+
+def test_match_scoped_filters() -> None:
+    account_filter = NotificationFilterConfig(item="item-c", reason="account", accounts=["111"])
+    type_filter = NotificationFilterConfig(item="item-c", reason="type", compliance_item_types=["s3_bucket"])
+    scoped_glob = NotificationFilterConfig(item_glob="public-*", reason="website", accounts=["111"])
+    other_scoped_glob = NotificationFilterConfig(item_glob="public-*", reason="cdn", accounts=["222"])
+    compiled_filter = CompiledFilter({account_filter, type_filter, scoped_glob, other_scoped_glob})
+
+    assert account_filter == compiled_filter.match("item-c", "111", "vpc")
+    assert type_filter == compiled_filter.match("item-c", "333", "s3_bucket")
+    assert compiled_filter.match("item-c", "333", "vpc") is None
+    assert scoped_glob == compiled_filter.match("public-site", "111")
+    assert other_scoped_glob == compiled_filter.match("public-site", "222")
+    assert compiled_filter.match("public-site", "333") is None
+    assert compiled_filter.match("public-site") is None
+
+
+def test_suppressed_counts_per_pattern() -> None:
+    compiled_filter = CompiledFilter({NotificationFilterConfig(item_glob="tmp-*", reason="temporary"), item_filter})
+
+    for item in ["tmp-1", "tmp-2", "item-a", "other"]:
+        compiled_filter.suppresses(item)
+
+    assert {"tmp-*": 2, "item-a": 1} == compiled_filter.suppressed
+
+
+def test_match_many_patterns() -> None:
+    filters = {NotificationFilterConfig(item_glob=f"bucket-{index}-*", reason="many") for index in range(2000)}
+    compiled_filter = CompiledFilter(filters)
+
+    assert 1 == len(compiled_filter._pattern_groups)
+    assert NotificationFilterConfig(item_glob="bucket-1999-*", reason="many") == compiled_filter.match("bucket-1999-x")
+    assert compiled_filter.match("bucket-2000-logs") is None
+
+
+def test_match_patterns_without_literal_prefix() -> None:
+    filters = {
+        NotificationFilterConfig(item_glob="*-logs", reason="logs"),
+        NotificationFilterConfig(item_regex="(dev|test)-.*", reason="environments"),
+        NotificationFilterConfig(item_regex="ab*c", reason="quantified"),
+        NotificationFilterConfig(item_regex="^x{2}y", reason="anchored"),
+    }
+    compiled_filter = CompiledFilter(filters)
+
+    assert ["logs", "environments", "environments", "quantified", "quantified", "anchored"] == [
+        getattr(compiled_filter.match(item), "reason", None)
+        for item in ["team-logs", "dev-bucket", "test-bucket", "ac", "abbbc", "xxy"]
+    ]
+    assert compiled_filter.match("staging-bucket") is None
+
+
+@pytest.mark.parametrize(
+    "regex,prefix",
+    [
+        ("bucket-[0-9]+", "bucket-"),
+        ("^bucket-.*", "bucket-"),
+        ("buckets?-logs", "bucket"),
+        ("bucket+", "bucket"),
+        ("bucket{2}", "bucke"),
+        ("a|b", ""),
+        ("(?i)bucket", ""),
+        ("\\d+", ""),
+    ],
+)
+def test_literal_prefix(regex: str, prefix: str) -> None:
+    assert prefix == _literal_prefix(regex)
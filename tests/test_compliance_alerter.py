@@ -1,9 +1,11 @@
+import logging
 from dataclasses import dataclass
 from unittest.mock import ANY, Mock, patch
 
 import os
 from copy import deepcopy
-from typing import Any, Dict, Iterator, List
+from threading import Barrier
+from typing import Any, Dict, Iterator, List, Tuple
 
 import boto3
 import httpretty
@@ -16,18 +18,28 @@ from moto import mock_aws
 
 from src import compliance_alerter
 from src.compliance_alerter import ComplianceAlerter
+from src.clients.account_snapshot import FileAccountSnapshotStore, S3AccountSnapshotStore
+from src.clients.aws_client_factory import AwsClientFactory, AwsCredentials
 from src.clients.aws_org_client import AwsOrgClient
 from src.clients.aws_s3_client import AwsS3Client
 from src.clients.aws_ssm_client import AwsSsmClient
 from src.config.config import Config
+from src.config.config_file_cache import ConfigFileCache
+from src.config.notification_filter_config import NotificationFilterConfig
 from src.data.account import Account
-from src.data.exceptions import UnsupportedEventException
+from src.config.slack_notifier_config import SlackNotifierConfig
+from src.data.exceptions import SlackNotifierException, UnsupportedEventException
 from src.data.finding import Finding
+from src.data.slack_message import SlackMessage
+from src.notifiers.notifier import Notifier
+from src.notifiers.outbox import DirectoryOutbox, S3Outbox
 from src.notifiers.pagerduty_notifier import PagerDutyNotifier
 from src.notifiers.slack_notifier import SlackNotifier
 from src.pagerduty_notification_mapper import PAGERDUTY_SSM_PARAMETER_STORE_PREFIX
 
 from tests.fixtures.github_compliance import github_report
+from tests.stub_http_server import stub_http_server
+from tests.test_types_generator import _pagerduty_event, _pagerduty_payload
 from tests.fixtures.github_webhook_compliance import github_webhook_report
 from tests.fixtures.s3_compliance_alerter import s3_report
 from tests.fixtures.vpc_compliance import vpc_report
@@ -94,10 +106,33 @@ def test_main_sns_event(
     _mock = mock_compliance_alerter.return_value
     _mock.is_sns_event.return_value = True
     _mock.build_sns_event_findings.return_value = {finding}
-    _mock.send.return_value = Mock()
+    _mock.build_pagerduty_payloads.return_value = set()
     compliance_alerter.main(load_json_resource("codebuild_event.json"))
 
-    _mock.send.assert_any_call(notifier=ANY, payloads={finding})
+    _mock.send_all.assert_called_once_with([(ANY, {finding})])
+    assert isinstance(_mock.send_all.call_args.args[0][0][0], SlackNotifier)
+
+
+@patch("src.compliance_alerter.AwsClientFactory.get_s3_client")
+@patch("src.compliance_alerter.AwsClientFactory.get_ssm_client")
+@patch("src.compliance_alerter.AwsClientFactory.get_org_client")
+@patch("src.compliance_alerter.ComplianceAlerter")
+def test_main_sns_event_sends_slack_and_pagerduty_together(
+    mock_compliance_alerter: Mock, mock_s3_client: Mock, mock_ssm_client: Mock, mock_org_client: Mock
+) -> None:
+    finding = Finding(compliance_item_type="aws_health", item="item", findings={"Words of Advice"})
+    payload = _pagerduty_payload(source="111122223333", component="component")
+    _mock = mock_compliance_alerter.return_value
+    _mock.is_sns_event.return_value = True
+    _mock.is_s3_event.return_value = False
+    _mock.build_sns_event_findings.return_value = {finding}
+    _mock.build_pagerduty_payloads.return_value = {payload}
+    compliance_alerter.main(load_json_resource("health_event_with_target_event_type.json"))
+
+    _mock.send_all.assert_called_once_with([(ANY, {finding}), (ANY, {payload})])
+    [(slack_notifier, _), (pagerduty_notifier, _)] = _mock.send_all.call_args.args[0]
+    assert isinstance(slack_notifier, SlackNotifier)
+    assert isinstance(pagerduty_notifier, PagerDutyNotifier)
 
 
 @patch("src.compliance_alerter.AwsClientFactory.get_s3_client")
@@ -124,6 +159,268 @@ def test_main_s3_event(
     _mock.send.assert_any_call(notifier=ANY, payloads={finding})
 
 
+@patch("src.compliance_alerter.AwsClientFactory.get_s3_client")
+@patch("src.compliance_alerter.AwsClientFactory.get_ssm_client")
+@patch("src.compliance_alerter.AwsClientFactory.get_org_client")
+@patch("src.compliance_alerter.ComplianceAlerter")
+def test_main_s3_event_with_all_records(
+    mock_compliance_alerter: Mock, mock_s3_client: Mock, mock_ssm_client: Mock, mock_org_client: Mock, monkeypatch: Any
+) -> None:
+    monkeypatch.setenv("PROCESS_ALL_S3_RECORDS", "true")
+    finding = Finding(compliance_item_type="compliance-item-type", item="item", findings={"Words of Advice"})
+    _mock = mock_compliance_alerter.return_value
+    _mock.is_sns_event.return_value = False
+    _mock.build_all_audit_report_findings.return_value = {finding}
+    compliance_alerter.main(build_event(S3_KEY, GITHUB_KEY))
+
+    _mock.build_audit_report_findings.assert_not_called()
+    _mock.send.assert_any_call(notifier=ANY, payloads={finding})
+    _mock.config.get_org_client.return_value.save_snapshot.assert_called_once()
+
+
+@patch("src.compliance_alerter.AwsClientFactory.get_s3_client")
+@patch("src.compliance_alerter.AwsClientFactory.get_ssm_client")
+@patch("src.compliance_alerter.AwsClientFactory.get_org_client")
+@patch("src.compliance_alerter.ComplianceAlerter")
+def test_main_reuses_config_between_invocations(
+    mock_compliance_alerter: Mock, mock_org_client: Mock, mock_ssm_client: Mock, mock_s3_client: Mock
+) -> None:
+    mock_compliance_alerter.return_value.is_sns_event.return_value = False
+    compliance_alerter.main(build_event(S3_KEY))
+    compliance_alerter.main(build_event(S3_KEY))
+
+    assert 2 == mock_s3_client.call_count
+    assert 1 == mock_ssm_client.call_count
+    assert 1 == mock_org_client.call_count
+    first_config, second_config = [c.kwargs["config"] for c in mock_compliance_alerter.call_args_list]
+    assert first_config is second_config
+
+
+@patch("src.compliance_alerter.ComplianceAlerter")
+def test_main_assumes_each_role_once(mock_compliance_alerter: Mock, monkeypatch: Any) -> None:
+    monkeypatch.setenv("REPORT_BUCKET_READ_ROLE", "the-config-bucket-read-role")
+    monkeypatch.setattr(compliance_alerter, "client_factory", AwsClientFactory())
+    mock_compliance_alerter.return_value.is_sns_event.return_value = False
+    credentials = AwsCredentials(accessKeyId="key-id", secretAccessKey="secret", sessionToken="token")
+
+    with patch.object(AwsClientFactory, "_assume_role", return_value=credentials) as assume_role:
+        compliance_alerter.main(build_event(S3_KEY))
+
+    assert 3 == compliance_alerter.client_factory.sts_calls
+    assert 3 == assume_role.call_count
+
+
+@patch("src.compliance_alerter.SlackNotifier")
+def test_main_only_builds_the_clients_it_uses(mock_slack_notifier: Mock, monkeypatch: Any, caplog: Any) -> None:
+    monkeypatch.setenv("IGNORABLE_REPORT_KEYS", "ignorable_report")
+    monkeypatch.setattr(compliance_alerter, "client_factory", AwsClientFactory(lazy=True))
+    boto_s3 = Mock(download_fileobj=Mock(side_effect=lambda **kwargs: kwargs["Fileobj"].write(b"[]")))
+
+    with (
+        patch.object(AwsClientFactory, "_get_client", return_value=boto_s3) as get_client,
+        caplog.at_level(logging.INFO),
+    ):
+        compliance_alerter.main(build_event("ignorable_report"))
+
+    get_client.assert_called_once_with("s3", "111222333444", "the-report-bucket-read-role")
+    mock_slack_notifier.assert_not_called()
+    assert "aws client startup costs for aws:s3 event: s3:the-report-bucket-read-role=" in caplog.text
+
+
+def test_notification_config_is_loaded_once(caplog: Any) -> None:
+    config = Mock(
+        config_file_cache=ConfigFileCache(),
+        get_notification_config_bundle=Mock(return_value=None),
+        get_notification_filter_files=Mock(return_value={NotificationFilterConfig(item="item", reason="reason")}),
+        get_notification_mapping_files=Mock(return_value=set()),
+    )
+    ca = compliance_alerter.ComplianceAlerter(config=config)
+
+    with caplog.at_level(logging.INFO):
+        assert ca.get_notification_config() is ca.get_notification_config()
+
+    config.get_notification_filter_files.assert_called_once()
+    config.get_notification_mapping_files.assert_called_once()
+    assert "loaded 1 notification filters and 0 notification mappings in " in caplog.text
+    assert "(0 config file cache hits, 0 misses)" in caplog.text
+
+
+def test_send_all_overlaps_notifiers() -> None:
+    # real sockets are needed to reach the stub, and httpretty does not pass concurrent requests through reliably
+    httpretty.disable()
+    # the stub only answers once both the slack message and the pagerduty event are in flight
+    both_in_flight = Barrier(2, timeout=5)
+    received = []
+
+    def respond(path: str, body: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        both_in_flight.wait()
+        received.append(path)
+        return 200, {}
+
+    with stub_http_server(respond) as url:
+        slack_config = SlackNotifierConfig("api-key", f"{url}/slack", SLACK_EMOJI, SERVICE_NAME)
+        slack_notifier = SlackNotifier(
+            Mock(
+                get_slack_notifier_config=Mock(return_value=slack_config),
+                get_notification_config_bundle=Mock(return_value=None),
+            )
+        )
+        pagerduty_notifier = PagerDutyNotifier(
+            Mock(
+                get_pagerduty_api_url=Mock(return_value=f"{url}/pagerduty"),
+                get_notification_config_bundle=Mock(return_value=None),
+            )
+        )
+        message = SlackMessage(["channel"], "heading", "title", "text", "#ffffff", SLACK_EMOJI, SERVICE_NAME)
+        event = _pagerduty_event(_pagerduty_payload(source="111122223333", component="component"), "service")
+
+        with (
+            patch.object(slack_notifier, "apply_filters", side_effect=lambda payloads: payloads),
+            patch.object(slack_notifier, "apply_mappings", return_value=[message]),
+            patch.object(pagerduty_notifier, "apply_filters", side_effect=lambda payloads: payloads),
+            patch.object(pagerduty_notifier, "apply_mappings", return_value=[event]),
+        ):
+            ComplianceAlerter(Mock()).send_all([(slack_notifier, {"finding"}), (pagerduty_notifier, {"payload"})])
+
+    assert ["/pagerduty", "/slack"] == sorted(received)
+
+
+def test_send_all_raises_after_every_notifier_is_done() -> None:
+    failing, succeeding = Mock(spec=Notifier), Mock(spec=Notifier)
+    failing.send_async.side_effect = SlackNotifierException("boom")
+    for notifier in [failing, succeeding]:
+        notifier.apply_filters.side_effect = lambda payloads: payloads
+        notifier.apply_mappings.side_effect = lambda payloads: sorted(payloads)
+
+    with pytest.raises(SlackNotifierException, match="boom"):
+        ComplianceAlerter(Mock()).send_all([(failing, {"a"}), (succeeding, {"b"})])
+
+    succeeding.send_async.assert_awaited_once_with(["b"])
+
+
+def test_log_org_account_fetches(caplog: Any) -> None:
+    config = Mock(get_org_client=Mock(return_value=Mock(account_fetches=3)))
+    ca = compliance_alerter.ComplianceAlerter(config=config)
+
+    with caplog.at_level(logging.INFO):
+        ca.log_org_account_fetches()
+        assert "fetched" not in caplog.text
+
+        config.get_org_client.return_value.account_fetches = 5
+        ca.log_org_account_fetches()
+
+    assert "2 accounts fetched from the organization" in caplog.text
+
+
+def test_build_account_snapshot_store(tmp_path: Any, monkeypatch: Any) -> None:
+    monkeypatch.delenv("ACCOUNT_SNAPSHOT_KEY", raising=False)
+    monkeypatch.delenv("ACCOUNT_SNAPSHOT_PATH", raising=False)
+    assert compliance_alerter.build_account_snapshot_store() is None
+
+    monkeypatch.setenv("ACCOUNT_SNAPSHOT_PATH", str(tmp_path / "accounts.json"))
+    assert isinstance(compliance_alerter.build_account_snapshot_store(), FileAccountSnapshotStore)
+
+    monkeypatch.setenv("ACCOUNT_SNAPSHOT_KEY", "snapshots/accounts.json")
+    monkeypatch.setenv("ACCOUNT_SNAPSHOT_WRITE_ROLE", "the-snapshot-write-role")
+    with patch("src.compliance_alerter.AwsClientFactory.get_s3_client") as get_s3_client:
+        store = compliance_alerter.build_account_snapshot_store()
+    assert isinstance(store, S3AccountSnapshotStore)
+    assert store.location == f"s3://{CONFIG_BUCKET}/snapshots/accounts.json"
+    get_s3_client.assert_called_once_with("111222333444", "the-snapshot-write-role")
+
+
+def test_build_outbox(tmp_path: Any, monkeypatch: Any) -> None:
+    monkeypatch.delenv("OUTBOX_PATH", raising=False)
+    monkeypatch.delenv("OUTBOX_BUCKET", raising=False)
+    assert compliance_alerter.build_outbox() is None
+
+    monkeypatch.setenv("OUTBOX_BUCKET", "the-outbox-bucket")
+    monkeypatch.setenv("OUTBOX_WRITE_ROLE", "the-outbox-write-role")
+    with patch("src.compliance_alerter.AwsClientFactory.get_s3_client") as get_s3_client:
+        assert isinstance(compliance_alerter.build_outbox(), S3Outbox)
+    get_s3_client.assert_called_once_with("111222333444", "the-outbox-write-role")
+
+    monkeypatch.setenv("OUTBOX_PATH", str(tmp_path))
+    assert isinstance(compliance_alerter.build_outbox(), DirectoryOutbox)
+
+
+@patch("src.compliance_alerter.AwsClientFactory.get_s3_client")
+@patch("src.compliance_alerter.AwsClientFactory.get_ssm_client")
+@patch("src.compliance_alerter.AwsClientFactory.get_org_client")
+def test_replay_outbox_without_an_outbox(
+    mock_s3_client: Mock, mock_ssm_client: Mock, mock_org_client: Mock, caplog: Any
+) -> None:
+    with caplog.at_level(logging.WARNING):
+        compliance_alerter.replay_outbox()
+
+    assert "no outbox is configured, nothing to replay" in caplog.text
+
+
+def _config_with_outbox(helper_test_config: Any, outbox: DirectoryOutbox) -> Config:
+    return Config(
+        config_s3_client=helper_test_config.config_s3_client,
+        report_s3_client=helper_test_config.report_s3_client,
+        ssm_client=helper_test_config.ssm_client,
+        org_client=helper_test_config.org_client,
+        outbox=outbox,
+    )
+
+
+def test_replay_empty_outbox(helper_test_config: Any, tmp_path: Any, caplog: Any) -> None:
+    ca = ComplianceAlerter(_config_with_outbox(helper_test_config, DirectoryOutbox(str(tmp_path))))
+
+    with caplog.at_level(logging.INFO):
+        ca.replay_outbox()
+
+    assert "outbox is empty, nothing to replay" in caplog.text
+    _assert_no_slack_message_sent()
+
+
+def test_replay_outbox(helper_test_config: Any, tmp_path: Any, caplog: Any, monkeypatch: Any) -> None:
+    monkeypatch.setenv("OUTBOX_REPLAY_CONCURRENCY", "1")
+    outbox = DirectoryOutbox(str(tmp_path))
+    message = SlackMessage([CHANNEL], "replayed-heading", "title", "text", "#c1e7c6", SLACK_EMOJI, SERVICE_NAME)
+    outbox.put("slack", str([CHANNEL]), message.to_dict(), "503 Service Unavailable")
+    outbox.put("slack", str([CHANNEL]), {"not": "a slack message"}, "400 Bad Request")
+    outbox.put("teams", "a-team", {}, "timed out")
+    (tmp_path / "slack" / "corrupt.json").write_text("{")
+
+    with caplog.at_level(logging.INFO):
+        ComplianceAlerter(_config_with_outbox(helper_test_config, outbox)).replay_outbox()
+
+    _assert_slack_message_sent("replayed-heading")
+    assert "replayed 1 of 4 outbox notifications" in caplog.text
+    assert "unable to replay outbox notification 'slack/corrupt.json'" in caplog.text
+    assert "unable to replay outbox notification 'teams/" in caplog.text
+    assert len(outbox.keys()) == 3
+
+
+def test_log_filter_suppressions(caplog: Any) -> None:
+    config = Mock(
+        config_file_cache=ConfigFileCache(),
+        get_notification_config_bundle=Mock(return_value=None),
+        get_notification_filter_files=Mock(
+            return_value={
+                NotificationFilterConfig(item="item-a", reason="reason"),
+                NotificationFilterConfig(item="item-b", reason="reason"),
+            }
+        ),
+        get_notification_mapping_files=Mock(return_value=set()),
+    )
+    ca = compliance_alerter.ComplianceAlerter(config=config)
+
+    with caplog.at_level(logging.INFO):
+        ca.log_filter_suppressions()
+        assert "suppressed" not in caplog.text
+
+        for item in ["item-b", "item-a", "item-b", "item-c"]:
+            ca.get_notification_config().compiled_filter.suppresses(item)
+        ca.log_filter_suppressions()
+
+    assert "notification filters suppressed item-a=1, item-b=2" in caplog.text
+    config.get_notification_filter_files.assert_called_once()
+
+
 def test_send(helper_test_config: Any) -> None:
     ca = compliance_alerter.ComplianceAlerter(
         config=Config(
@@ -162,6 +459,56 @@ def test_compliance_alerter_main_s3_audit(helper_test_config: Any) -> None:
     _assert_slack_message_sent("some-team-name")
 
 
+def test_compliance_alerter_main_s3_audit_streamed(helper_test_config: Any, monkeypatch: Any) -> None:
+    monkeypatch.setenv("STREAM_AUDIT_REPORTS", "true")
+    ca = compliance_alerter.ComplianceAlerter(
+        config=Config(
+            config_s3_client=helper_test_config.config_s3_client,
+            report_s3_client=helper_test_config.report_s3_client,
+            ssm_client=helper_test_config.ssm_client,
+            org_client=helper_test_config.org_client,
+        )
+    )
+    findings = ca.build_audit_report_findings(build_event(S3_KEY))
+    ca.send(notifier=SlackNotifier(config=ca.config), payloads=findings)
+    _assert_slack_message_sent_to_channel("the-alerting-channel")
+    _assert_slack_message_sent("has S3 buckets that do not comply with the policy")
+    _assert_slack_message_sent("some-team-name")
+
+
+def test_build_all_audit_report_findings(helper_test_config: Any, caplog: Any) -> None:
+    ca = compliance_alerter.ComplianceAlerter(
+        config=Config(
+            config_s3_client=helper_test_config.config_s3_client,
+            report_s3_client=helper_test_config.report_s3_client,
+            ssm_client=helper_test_config.ssm_client,
+            org_client=helper_test_config.org_client,
+        )
+    )
+    with caplog.at_level(logging.ERROR):
+        findings = ca.build_all_audit_report_findings(build_event(S3_KEY, "missing_report", GITHUB_KEY))
+
+    assert (
+        ca.build_audit_report_findings(build_event(S3_KEY)) | ca.build_audit_report_findings(build_event(GITHUB_KEY))
+        == findings
+    )
+    assert len(caplog.records) == 1
+    assert "unable to process audit report 'missing_report'" in caplog.text
+
+
+def test_build_all_audit_report_findings_all_failed(helper_test_config: Any) -> None:
+    ca = compliance_alerter.ComplianceAlerter(
+        config=Config(
+            config_s3_client=helper_test_config.config_s3_client,
+            report_s3_client=helper_test_config.report_s3_client,
+            ssm_client=helper_test_config.ssm_client,
+            org_client=helper_test_config.org_client,
+        )
+    )
+    with pytest.raises(UnsupportedEventException, match="a_value"):
+        ca.build_all_audit_report_findings({"Records": [{"a_key": "a_value"}]})
+
+
 def test_compliance_alerter_main_github_audit(helper_test_config: Any) -> None:
     ca = compliance_alerter.ComplianceAlerter(
         config=Config(
@@ -486,6 +833,13 @@ def helper_test_config(
     yield htc
 
 
+@pytest.fixture(autouse=True)
+def _reset_alerter_context() -> Iterator[None]:
+    compliance_alerter.alerter_context.reset()
+    yield
+    compliance_alerter.alerter_context.reset()
+
+
 @pytest.fixture(autouse=True)
 def _setup_environment(monkeypatch: Any) -> None:
     env_vars = {
@@ -733,7 +1087,7 @@ def set_affected_account_id(account_id: str, test_event: Dict[str, Any]) -> Dict
     return test_event
 
 
-def build_event(report_key: str) -> Dict[str, Any]:
+def build_event(*report_keys: str) -> Dict[str, Any]:
     return {
         "Records": [
             {
@@ -741,6 +1095,7 @@ def build_event(report_key: str) -> Dict[str, Any]:
                 "eventSource": "aws:s3",
                 "s3": {"bucket": {"name": REPORT_BUCKET}, "object": {"key": report_key}},
             }
+            for report_key in report_keys
         ]
     }
 
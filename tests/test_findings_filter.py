@@ -1,9 +1,10 @@
 from unittest import TestCase
 
+from src.compiled_filter import CompiledFilter
 from src.config.notification_filter_config import NotificationFilterConfig
 from src.findings_filter import FindingsFilter
 
-from tests.test_types_generator import finding
+from tests.test_types_generator import account, finding
 
 item_1 = finding(item="item_1", findings={"finding 1"})
 item_2 = finding(item="item_2", findings={"finding 2"})
@@ -27,3 +28,21 @@ class TestFindingsFilter(TestCase):
     def test_empty_notifications(self) -> None:
         filters = {item_2_filter, item_4_filter}
         self.assertEqual(set(), FindingsFilter().do_filter(findings=set(), filters=filters))
+
+    def test_filter_with_compiled_filter(self) -> None:
+        compiled_filter = CompiledFilter({item_2_filter, item_4_filter})
+
+        self.assertEqual({item_1}, FindingsFilter().do_filter({item_1, item_2, item_4}, set(), compiled_filter))
+        self.assertEqual({item_1}, FindingsFilter().do_filter({item_1, item_4}, set(), compiled_filter))
+        self.assertEqual({"item_2": 1, "item_4": 2}, compiled_filter.suppressed)
+
+    def test_filter_scoped_patterns(self) -> None:
+        scoped_filter = NotificationFilterConfig(item_glob="item_*", reason="a reason", accounts=["1111"])
+        in_scope = finding(item="item_5", account=account("1111"), findings={"finding 5"})
+        out_of_scope = finding(item="item_6", account=account("2222"), findings={"finding 6"})
+        without_account = finding(item="item_7", account=None, findings={"finding 7"})
+
+        self.assertEqual(
+            {out_of_scope, without_account},
+            FindingsFilter().do_filter({in_scope, out_of_scope, without_account}, {scoped_filter}),
+        )
@@ -171,3 +171,29 @@ class TestNotificationMapper(TestCase):
 
         expected_text = f"{description}\n\nfinding-a\nfinding-b"
         self.assertEqual(expected_text, slack_messages[0].text)
+
+    def test_headings_are_looked_up_once_per_account_and_region(self) -> None:
+        acct_a, acct_b = account(name="a", identifier="1"), account(name="b", identifier="2")
+        findings = {finding(item=f"bucket-{index}", account=acct_a) for index in range(5)} | {
+            finding(item="bucket-x", account=acct_a, region_name="eu-west-1"),
+            finding(item="bucket-y", account=acct_b),
+            finding(item="no-account", account=None),
+        }
+
+        mock_client = Mock(spec=AwsOrgClient)
+        mock_client.get_account.side_effect = lambda account_id: Account(
+            name={"1": "aaa", "2": "bbb"}[account_id], identifier=account_id, slack_handle="team"
+        )
+
+        slack_messages = NotificationMapper().do_map(findings, set(), mock_client)
+
+        self.assertEqual(3, mock_client.get_account.call_count)
+        self.assertEqual(
+            {
+                "Unknown Service",
+                "aaa (1) test-region-name team",
+                "aaa (1) eu-west-1 team",
+                "bbb (2) test-region-name team",
+            },
+            {sm.heading for sm in slack_messages},
+        )
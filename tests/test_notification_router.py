@@ -0,0 +1,76 @@
+import random
+from typing import List, Set
+
+from src.config.notification_config_bundle import MappingIndex
+from src.config.notification_mapping_config import NotificationMappingConfig
+from src.data.finding import Finding
+from src.notification_router import NotificationRouter
+from tests.test_types_generator import account, finding
+
+MAPPINGS = [
+    NotificationMappingConfig(channel="central"),
+    NotificationMappingConfig(channel="by-item", items=["item-a", "item-b"]),
+    NotificationMappingConfig(channel="by-account", accounts=["111", "222"]),
+    NotificationMappingConfig(channel="by-type", compliance_item_types=["s3_bucket"]),
+    NotificationMappingConfig(
+        channel="by-all", items=["item-a"], accounts=["111"], compliance_item_types=["s3_bucket"]
+    ),
+]
+
+
+def _linear_find_channels(notification: Finding, mappings: List[NotificationMappingConfig]) -> Set[str]:
+    return {
+        mapping.channel
+        for mapping in mappings
+        if (not mapping.items or notification.item in mapping.items)
+        and (not mapping.accounts or (notification.account and notification.account.identifier in mapping.accounts))
+        and (not mapping.compliance_item_types or notification.compliance_item_type in mapping.compliance_item_types)
+    }
+
+
+def test_find_channels() -> None:
+    router = NotificationRouter(MAPPINGS)
+
+    assert {"central"} == router.find_channels(finding(item="item-c", account=account("333")))
+    assert {"central", "by-item"} == router.find_channels(finding(item="item-b", account=account("333")))
+    assert {"central", "by-item", "by-account"} == router.find_channels(finding(item="item-a", account=account("111")))
+    assert {"central", "by-item", "by-account", "by-type", "by-all"} == router.find_channels(
+        finding(item="item-a", account=account("111"), compliance_item_type="s3_bucket")
+    )
+    assert {"central", "by-type"} == router.find_channels(finding(account=None, compliance_item_type="s3_bucket"))
+
+
+def test_find_channels_without_mappings() -> None:
+    assert set() == NotificationRouter([]).find_channels(finding())
+
+
+def test_find_channels_with_prebuilt_index() -> None:
+    router = NotificationRouter(MAPPINGS, MappingIndex.build(MAPPINGS))
+
+    assert {"central", "by-account"} == router.find_channels(finding(account=account("222")))
+
+
+def test_find_channels_matches_linear_scan() -> None:
+    rng = random.Random(42)
+    values = {field: [f"{field}-{index}" for index in range(6)] for field in ["item", "account", "type"]}
+    mappings = [
+        NotificationMappingConfig(
+            channel=f"channel-{index}",
+            items=rng.sample(values["item"], rng.randint(0, 2)),
+            accounts=rng.sample(values["account"], rng.randint(0, 2)),
+            compliance_item_types=rng.sample(values["type"], rng.randint(0, 2)),
+        )
+        for index in range(40)
+    ]
+    findings = [
+        finding(
+            item=rng.choice(values["item"]),
+            account=rng.choice([None, account(rng.choice(values["account"]))]),
+            compliance_item_type=rng.choice(values["type"]),
+        )
+        for _ in range(200)
+    ]
+    router = NotificationRouter(mappings)
+
+    for notification in findings:
+        assert _linear_find_channels(notification, mappings) == router.find_channels(notification)
@@ -14,6 +14,14 @@ payload_b = _pagerduty_payload(source="2222", component="component-b", complianc
 payload_c = _pagerduty_payload(source="3333", component="component-c", compliance_item_type="type-c")
 
 
+def _mock_ssm_client() -> Mock:
+    mock_client = Mock(spec=AwsSsmClient)
+    mock_client.get_parameters.side_effect = lambda parameter_names: {
+        name: f"{name.split('/')[-1]}-routing-key" for name in parameter_names
+    }
+    return mock_client
+
+
 class TestPagerDutyNotificationMapper(TestCase):
     def test_mapper_with_compliance_item_type_mapping(self) -> None:
         mapping_0 = NotificationMappingConfig(channel="central", pagerduty_service="service-0")
@@ -27,8 +35,7 @@ class TestPagerDutyNotificationMapper(TestCase):
         payloads = {payload_a, payload_b, payload_c}
         mappings = {mapping_0, mapping_1, mapping_2}
 
-        mock_client = Mock(spec=AwsSsmClient)
-        mock_client.get_parameter.side_effect = lambda parameter_name: f"{parameter_name.split('/')[-1]}-routing-key"
+        mock_client = _mock_ssm_client()
 
         pagerduty_events = PagerDutyNotificationMapper(mock_client).do_map(payloads, mappings)
         expected = [
@@ -53,8 +60,7 @@ class TestPagerDutyNotificationMapper(TestCase):
         payloads = {payload_a, payload_b, payload_c}
         mappings = {mapping_0, mapping_1, mapping_2}
 
-        mock_client = Mock(spec=AwsSsmClient)
-        mock_client.get_parameter.side_effect = lambda parameter_name: f"{parameter_name.split('/')[-1]}-routing-key"
+        mock_client = _mock_ssm_client()
 
         pagerduty_events = PagerDutyNotificationMapper(mock_client).do_map(payloads, mappings)
         expected = [
@@ -85,8 +91,7 @@ class TestPagerDutyNotificationMapper(TestCase):
         payloads = {payload_a, payload_b, payload_c}
         mappings = {mapping_1, mapping_2}
 
-        mock_client = Mock(spec=AwsSsmClient)
-        mock_client.get_parameter.side_effect = lambda parameter_name: f"{parameter_name.split('/')[-1]}-routing-key"
+        mock_client = _mock_ssm_client()
 
         pagerduty_events = PagerDutyNotificationMapper(mock_client).do_map(payloads, mappings)
         expected = [
@@ -102,10 +107,33 @@ class TestPagerDutyNotificationMapper(TestCase):
         payloads = {payload_a, payload_b, payload_c}
         mappings = {mapping_0}
 
-        mock_client = Mock(spec=AwsSsmClient)
-        mock_client.get_parameter.side_effect = lambda parameter_name: f"{parameter_name.split('/')[-1]}-routing-key"
+        mock_client = _mock_ssm_client()
 
         pagerduty_events = PagerDutyNotificationMapper(mock_client).do_map(payloads, mappings)
         expected: List[PagerDutyEvent] = []
         assert len(pagerduty_events) == 0
         assert expected == pagerduty_events
+
+    def test_mapper_resolves_each_routing_key_once(self) -> None:
+        mapping_0 = NotificationMappingConfig(channel="central", pagerduty_service="Service 0")
+        mapping_1 = NotificationMappingConfig(channel="channel-1", pagerduty_service="service-1", accounts=["2222"])
+        mapping_2 = NotificationMappingConfig(channel="channel-2", pagerduty_service="service-1", accounts=["3333"])
+
+        mock_client = _mock_ssm_client()
+        PagerDutyNotificationMapper(mock_client).do_map(
+            {payload_a, payload_b, payload_c}, {mapping_0, mapping_1, mapping_2}
+        )
+
+        mock_client.get_parameter.assert_not_called()
+        mock_client.get_parameters.assert_called_once()
+        assert ["/service_accounts/pagerduty/service-1", "/service_accounts/pagerduty/service_0"] == sorted(
+            mock_client.get_parameters.call_args.kwargs["parameter_names"]
+        )
+
+    def test_mapper_without_matching_services_does_not_resolve_routing_keys(self) -> None:
+        mapping = NotificationMappingConfig(channel="channel-1", pagerduty_service="service-1", accounts=["4444"])
+
+        mock_client = _mock_ssm_client()
+
+        assert [] == PagerDutyNotificationMapper(mock_client).do_map({payload_a, payload_b}, {mapping})
+        mock_client.get_parameters.assert_not_called()
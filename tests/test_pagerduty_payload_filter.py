@@ -1,3 +1,4 @@
+from src.compiled_filter import CompiledFilter
 from src.config.notification_filter_config import NotificationFilterConfig
 from src.pagerduty_payload_filter import PagerDutyPayloadFilter
 
@@ -21,3 +22,19 @@ def test_do_filter_empty_filters() -> None:
 
 def test_do_filter_empty_payloads() -> None:
     assert set() == PagerDutyPayloadFilter.do_filter(payloads=set(), filters={payload_filter})
+
+
+def test_do_filter_with_compiled_filter() -> None:
+    compiled_filter = CompiledFilter({payload_filter})
+
+    assert {payload_1} == PagerDutyPayloadFilter.do_filter({payload_1, payload_2}, set(), compiled_filter)
+    assert {"dynamodb-resource-id": 1} == compiled_filter.suppressed
+
+
+def test_do_filter_scoped_patterns() -> None:
+    scoped_filter = NotificationFilterConfig(
+        item_regex=".*-resource-id", reason="good reason", compliance_item_types=["aws_health"]
+    )
+    other_type = _pagerduty_payload(source="111122223333", component="mysql-resource-id", compliance_item_type="other")
+
+    assert {other_type} == PagerDutyPayloadFilter.do_filter({payload_1, payload_2, other_type}, {scoped_filter})
@@ -0,0 +1,58 @@
+import json
+from typing import List, Optional
+
+from src.data.slack_message import SlackMessage
+from src.slack_message_coalescer import SlackMessageCoalescer
+
+
+def _message(
+    title: str, channels: Optional[List[str]] = None, heading: str = "aaa (111) region team-a"
+) -> SlackMessage:
+    return SlackMessage(
+        channels or ["central"], heading, title, f"{title} text", "#ff4d4d", ":test-emoji:", "test-service"
+    )
+
+
+def _titles(message: SlackMessage) -> List[str]:
+    return [attachment["title"] for attachment in message.to_dict()["attachments"]]
+
+
+def test_coalesce_by_channels_and_heading() -> None:
+    messages = [
+        _message("item-a"),
+        _message("item-b", heading="bbb (222) region team-b"),
+        _message("item-c"),
+        _message("item-d", channels=["central", "team-a"]),
+    ]
+
+    coalesced = SlackMessageCoalescer().coalesce(messages)
+
+    assert [(msg.channels, msg.heading, _titles(msg)) for msg in coalesced] == [
+        (["central"], "aaa (111) region team-a", ["item-a", "item-c"]),
+        (["central"], "bbb (222) region team-b", ["item-b"]),
+        (["central", "team-a"], "aaa (111) region team-a", ["item-d"]),
+    ]
+    assert coalesced[1] is messages[1]
+    assert coalesced[0].to_dict()["attachments"][1] == {"color": "#ff4d4d", "title": "item-c", "text": "item-c text"}
+
+
+def test_coalesce_up_to_the_attachment_limit() -> None:
+    messages = [_message(f"item-{index}") for index in range(5)]
+
+    coalesced = SlackMessageCoalescer(max_attachments=2).coalesce(messages)
+
+    assert [_titles(msg) for msg in coalesced] == [["item-0", "item-1"], ["item-2", "item-3"], ["item-4"]]
+
+
+def test_coalesce_up_to_the_payload_size_limit() -> None:
+    messages = [_message(f"item-{index}") for index in range(3)] + [_message("large" * 100)]
+    max_payload_bytes = len(json.dumps(_message("item-0").to_dict())) + 100
+
+    coalesced = SlackMessageCoalescer(max_payload_bytes=max_payload_bytes).coalesce(messages)
+
+    assert [_titles(msg) for msg in coalesced] == [["item-0", "item-1"], ["item-2"], ["large" * 100]]
+    assert all(len(json.dumps(msg.to_dict())) <= max_payload_bytes for msg in coalesced[:2])
+
+
+def test_coalesce_nothing() -> None:
+    assert SlackMessageCoalescer().coalesce([]) == []
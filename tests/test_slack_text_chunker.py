@@ -0,0 +1,44 @@
+from src.data.slack_message import SlackMessage
+from src.slack_text_chunker import SlackTextChunker
+
+
+def _message(text: str) -> SlackMessage:
+    return SlackMessage(["central"], "a-heading", "item-a", text, "#ff4d4d", ":test-emoji:", "test-service")
+
+
+def test_short_text_is_not_split() -> None:
+    message = _message("line-1\nline-2")
+    chunker = SlackTextChunker(max_text_bytes=20)
+
+    assert chunker.split([message]) == [message]
+    assert chunker.chunks == 0
+
+
+def test_long_text_is_split_into_ordered_continuation_messages() -> None:
+    chunker = SlackTextChunker(max_text_bytes=26)
+
+    chunks = chunker.split([_message("\n".join(f"finding-{index}" for index in range(5))), _message("short")])
+
+    assert [(chunk.title, chunk.text) for chunk in chunks] == [
+        ("item-a (1/3)", "finding-0\nfinding-1"),
+        ("item-a (2/3)", "finding-2\nfinding-3"),
+        ("item-a (3/3)", "finding-4"),
+        ("item-a", "short"),
+    ]
+    assert {(chunk.heading, chunk.color, tuple(chunk.channels)) for chunk in chunks} == {
+        ("a-heading", "#ff4d4d", ("central",))
+    }
+    assert chunker.chunks == 3
+
+
+def test_code_blocks_are_closed_and_reopened_across_chunks() -> None:
+    chunks = SlackTextChunker(max_text_bytes=32).split([_message('status\n```{\n    "a": 1,\n    "b": 2\n}```')])
+
+    assert [chunk.text for chunk in chunks] == ['status\n```{\n    "a": 1,```', '```    "b": 2\n}```']
+
+
+def test_long_lines_are_split_between_characters() -> None:
+    chunks = SlackTextChunker(max_text_bytes=17).split([_message("é" * 9)])
+
+    assert [chunk.text for chunk in chunks] == ["é" * 5, "é" * 4]
+    assert all(len(chunk.text.encode("utf-8")) <= 17 for chunk in chunks)